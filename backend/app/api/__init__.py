@@ -2,6 +2,6 @@
 API Module - Contains all API endpoints
 """
 
-from app.api import user
+from app.api import analytics, metrics, user
 
-__all__ = ["user"]
+__all__ = ["analytics", "metrics", "user"]
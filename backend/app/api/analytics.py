@@ -0,0 +1,257 @@
+"""
+Analytics API Router - Listening statistics computed from stored history
+"""
+
+import asyncio
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.api.errors import upstream_error
+from app.api.etag import ETagRoute
+from app.api.user import TIME_RANGES, get_spotify_service
+from app.services import analytics
+from app.services.rollups import artist_play_counts, range_totals, track_play_counts
+from app.services.spotify_async import AsyncSpotifyService
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(route_class=ETagRoute)
+
+
+def _compute_patterns(
+    user_id: str, start: Optional[int], end: Optional[int], tz: str, session_gap: int
+) -> dict:
+    """
+    Load a user's plays and compute their listening patterns
+
+    Runs in a worker thread. The first call also imports numpy and pandas
+    through the lazy analytics package, so none of it blocks the event loop.
+
+    Args:
+        user_id: Spotify user ID
+        start: Unix timestamp in milliseconds
+        end: Unix timestamp in milliseconds
+        tz: Time zone for hour, weekday and month stats
+        session_gap: Minutes of silence that end a session
+
+    Returns:
+        dict: Listening pattern stats
+    """
+    plays = analytics.load_plays(user_id, start, end)
+    return analytics.listening_patterns(plays, tz=tz, session_gap_minutes=session_gap)
+
+
+@router.get("/patterns")
+async def get_listening_patterns(
+    spotify: AsyncSpotifyService = Depends(get_spotify_service),
+    tz: str = Query("UTC", description="IANA time zone, e.g. Europe/London"),
+    start: Optional[int] = Query(None, description="Unix timestamp in ms - include plays from"),
+    end: Optional[int] = Query(None, description="Unix timestamp in ms - include plays before"),
+    session_gap: int = Query(
+        30, ge=1, le=24 * 60, description="Minutes of silence that end a listening session"
+    ),
+):
+    """
+    Get listening patterns from the user's stored history
+
+    Args:
+        tz: Time zone for hour, weekday and month stats
+        start: Unix timestamp in milliseconds
+        end: Unix timestamp in milliseconds
+        session_gap: Minutes of silence that end a session
+
+    Returns:
+        dict: Time of day, day of week, most active month and session stats
+    """
+    try:
+        ZoneInfo(tz)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise HTTPException(status_code=400, detail=f"Unknown time zone: {tz}")
+
+    try:
+        user_id = await spotify.get_user_id()
+        patterns = await asyncio.to_thread(_compute_patterns, user_id, start, end, tz, session_gap)
+
+        return {
+            "success": True,
+            "tz": tz,
+            "data": patterns,
+        }
+
+    except Exception as e:
+        logger.error(f"Error computing listening patterns: {e}")
+        raise upstream_error(e, "Failed to compute listening patterns")
+
+
+@router.get("/totals")
+async def get_totals(
+    spotify: AsyncSpotifyService = Depends(get_spotify_service),
+    start: Optional[date] = Query(None, description="First day included (YYYY-MM-DD, UTC)"),
+    end: Optional[date] = Query(None, description="Last day included (YYYY-MM-DD, UTC)"),
+    limit: int = Query(10, ge=1, le=50, description="Number of top tracks and artists"),
+):
+    """
+    Get listening totals for a date range from the rollup tables
+
+    Cost depends on the size of the range, not on the length of the history.
+    Defaults to the last 30 days.
+
+    Args:
+        start: First day included
+        end: Last day included
+        limit: Number of top tracks and artists to return
+
+    Returns:
+        dict: Totals, per-day series and top tracks and artists
+    """
+    end = end or datetime.now(timezone.utc).date()
+    start = start or end - timedelta(days=29)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+
+    try:
+        user_id = await spotify.get_user_id()
+        totals = await asyncio.to_thread(
+            range_totals, user_id, start, end + timedelta(days=1), limit
+        )
+        totals["end"] = end.isoformat()
+
+        return {
+            "success": True,
+            "data": totals,
+        }
+
+    except Exception as e:
+        logger.error(f"Error computing listening totals: {e}")
+        raise upstream_error(e, "Failed to compute listening totals")
+
+
+@router.get("/genres")
+async def get_top_genres(
+    spotify: AsyncSpotifyService = Depends(get_spotify_service),
+    weighting: str = Query(
+        "rank",
+        description="rank: weight Spotify top artists by rank; plays: weight by stored play count",
+    ),
+    time_range: str = Query("medium_term", description="Time range for rank weighting"),
+    start: Optional[date] = Query(None, description="First day for play weighting (UTC)"),
+    end: Optional[date] = Query(None, description="Last day for play weighting (UTC)"),
+    limit: int = Query(5, ge=1, le=50, description="Number of genres to return"),
+    max_artists: int = Query(200, ge=1, le=1000, description="Artists considered for plays"),
+):
+    """
+    Get the user's top genres
+
+    Rank weighting uses the user's top 50 artists, which already carry genres.
+    Play weighting uses the most played artists from the stored history and
+    looks their genres up in batches of 50 through the catalog cache.
+
+    Args:
+        weighting: rank or plays
+        time_range: Time range for rank weighting
+        start: First day included for play weighting
+        end: Last day included for play weighting
+        limit: Number of genres to return
+        max_artists: Maximum artists considered for play weighting
+
+    Returns:
+        dict: Ranked genres with scores
+    """
+    if weighting not in ("rank", "plays"):
+        raise HTTPException(status_code=400, detail="Invalid weighting. Must be rank or plays")
+    if time_range not in TIME_RANGES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid time_range. Must be one of: {', '.join(TIME_RANGES)}",
+        )
+
+    try:
+        if weighting == "rank":
+            top = await spotify.get_top_artists(time_range=time_range, limit=50)
+            artists = top.get("items", [])
+            weights = analytics.rank_weights(len(artists))
+        else:
+            user_id = await spotify.get_user_id()
+            end = end or datetime.now(timezone.utc).date()
+            start = start or date(1970, 1, 1)
+            counts = await asyncio.to_thread(
+                artist_play_counts, user_id, start, end + timedelta(days=1), max_artists
+            )
+            plays = {row["id"]: row["plays"] for row in counts}
+            artists = await spotify.get_several_artists(list(plays))
+            weights = [float(plays[artist["id"]]) for artist in artists]
+
+        return {
+            "success": True,
+            "weighting": weighting,
+            "artists": len(artists),
+            "data": analytics.top_genres(artists, weights, limit),
+        }
+
+    except Exception as e:
+        logger.error(f"Error computing top genres: {e}")
+        raise upstream_error(e, "Failed to compute top genres")
+
+
+@router.get("/personality")
+async def get_personality(
+    spotify: AsyncSpotifyService = Depends(get_spotify_service),
+    source: str = Query(
+        "top", description="top: the user's top tracks; plays: most played stored tracks"
+    ),
+    time_range: str = Query("medium_term", description="Time range for top tracks"),
+    max_tracks: int = Query(500, ge=1, le=5000, description="Tracks considered for plays"),
+):
+    """
+    Get average audio features and the user's music personality
+
+    Audio features are held in a float32 tracks x features matrix, so averages,
+    quartiles and the nearest-archetype classification are single vectorized
+    operations. With source=plays the averages are weighted by play count.
+
+    Args:
+        source: top or plays
+        time_range: Time range for top tracks
+        max_tracks: Maximum tracks considered for plays
+
+    Returns:
+        dict: Average danceability, energy, valence etc. and a personality label
+    """
+    if source not in ("top", "plays"):
+        raise HTTPException(status_code=400, detail="Invalid source. Must be top or plays")
+    if time_range not in TIME_RANGES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid time_range. Must be one of: {', '.join(TIME_RANGES)}",
+        )
+
+    try:
+        weights = None
+        if source == "top":
+            top = await spotify.get_top_tracks(time_range=time_range, limit=50)
+            features = await spotify.get_audio_features([t["id"] for t in top.get("items", [])])
+        else:
+            user_id = await spotify.get_user_id()
+            tomorrow = datetime.now(timezone.utc).date() + timedelta(days=1)
+            counts = await asyncio.to_thread(
+                track_play_counts, user_id, date(1970, 1, 1), tomorrow, max_tracks
+            )
+            plays = {row["id"]: row["plays"] for row in counts}
+            features = await spotify.get_audio_features(list(plays))
+            weights = [plays[item["id"]] for item in features]
+
+        return {
+            "success": True,
+            "source": source,
+            "data": analytics.audio_profile(
+                analytics.FeatureMatrix.from_features(features), weights
+            ),
+        }
+
+    except Exception as e:
+        logger.error(f"Error computing music personality: {e}")
+        raise upstream_error(e, "Failed to compute music personality")
@@ -0,0 +1,42 @@
+"""
+API Errors - Translate upstream Spotify failures into HTTP errors
+"""
+
+import math
+
+from fastapi import HTTPException
+
+from app.services.spotify_async import SpotifyAPIError
+
+
+def upstream_error(error: Exception, detail: str) -> HTTPException:
+    """
+    Build the HTTPException to raise for a failed Spotify call
+
+    Rate limits become 429 with Retry-After and rejected tokens become 401, so
+    clients can back off or re-authenticate; everything else is a 500.
+
+    Args:
+        error: Exception raised by the Spotify service
+        detail: Message for unexpected failures
+
+    Returns:
+        HTTPException: Exception to raise
+    """
+    if isinstance(error, SpotifyAPIError):
+        if error.status_code == 429:
+            headers = {}
+            if error.retry_after is not None:
+                headers["Retry-After"] = str(math.ceil(error.retry_after))
+            return HTTPException(
+                status_code=429,
+                detail="Spotify rate limit reached. Please retry later.",
+                headers=headers,
+            )
+        if error.status_code == 401:
+            return HTTPException(
+                status_code=401,
+                detail="Spotify session expired. Please refresh your token or login again.",
+            )
+
+    return HTTPException(status_code=500, detail=detail)
@@ -0,0 +1,85 @@
+"""
+ETag Route - Conditional GET support for JSON API routes
+"""
+
+import hashlib
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+
+from app.api.responses import NegotiatedRoute
+from app.middleware.compression import NOT_MODIFIED_BODY_SIZE
+
+
+def compute_etag(body: bytes) -> str:
+    """
+    Compute a strong ETag from a response body
+
+    Args:
+        body: Rendered response body
+
+    Returns:
+        str: Quoted entity tag
+    """
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(etag: str, if_none_match: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag
+
+    If-None-Match uses weak comparison, so W/ prefixes are ignored.
+
+    Args:
+        etag: Current entity tag
+        if_none_match: Raw If-None-Match header value
+
+    Returns:
+        bool: True if the client's copy is current
+    """
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+class ETagRoute(NegotiatedRoute):
+    """
+    Route class that tags successful GET responses and answers 304 when unchanged
+
+    Streaming responses are passed through untouched. The ETag is computed on the
+    negotiated representation, so JSON and MessagePack bodies get distinct tags.
+    A 304 carries the Vary and Cache-Control headers the 200 would have had, and
+    tells the compression middleware the body size so both get the same ETag.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def etag_handler(request: Request) -> Response:
+            response = await handler(request)
+
+            if (
+                request.method != "GET"
+                or response.status_code != 200
+                or isinstance(response, StreamingResponse)
+            ):
+                return response
+
+            etag = compute_etag(response.body)
+            response.headers["ETag"] = etag
+            response.headers.setdefault("Cache-Control", "private, no-cache")
+
+            if_none_match = request.headers.get("if-none-match")
+            if if_none_match and etag_matches(etag, if_none_match):
+                request.scope[NOT_MODIFIED_BODY_SIZE] = len(response.body)
+                headers = {
+                    name: response.headers[name]
+                    for name in ("ETag", "Cache-Control", "Vary")
+                    if name in response.headers
+                }
+                return Response(status_code=304, headers=headers)
+
+            return response
+
+        return etag_handler
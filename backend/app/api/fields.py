@@ -0,0 +1,77 @@
+"""
+Field Selection - ?fields= and ?view= query parameters for API routes
+"""
+
+from typing import Optional
+
+from fastapi import HTTPException, Query
+
+from app.services.projection import (
+    ARTIST_FIELDS,
+    PLAY_FIELDS,
+    PLAYLIST_FIELDS,
+    SAVED_TRACK_FIELDS,
+    TRACK_FIELDS,
+    Fields,
+    parse_fields,
+)
+
+VIEWS = ["compact", "full"]
+
+
+def validate_view(view: str) -> None:
+    """
+    Reject unknown view names
+
+    Args:
+        view: Requested view
+
+    Raises:
+        HTTPException: If the view is not one of VIEWS
+    """
+    if view not in VIEWS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid view. Must be one of: {', '.join(VIEWS)}",
+        )
+
+
+class FieldSelection:
+    """
+    Dependency resolving the requested fields of each returned item
+
+    An explicit fields list wins; otherwise view=compact (the default) keeps
+    what the dashboard renders and view=full returns Spotify's object.
+    """
+
+    def __init__(self, compact_fields: str):
+        """
+        Initialize dependency
+
+        Args:
+            compact_fields: Field list of the compact view
+        """
+        self.compact = parse_fields(compact_fields)
+
+    def __call__(
+        self,
+        fields: Optional[str] = Query(
+            None, description="Comma separated dotted field paths, e.g. id,name,album.name"
+        ),
+        view: str = Query("compact", description="compact or full; ignored when fields is set"),
+    ) -> Optional[Fields]:
+        if fields:
+            try:
+                return parse_fields(fields)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid fields parameter")
+
+        validate_view(view)
+        return self.compact if view == "compact" else None
+
+
+track_fields = FieldSelection(TRACK_FIELDS)
+artist_fields = FieldSelection(ARTIST_FIELDS)
+playlist_fields = FieldSelection(PLAYLIST_FIELDS)
+play_fields = FieldSelection(PLAY_FIELDS)
+saved_track_fields = FieldSelection(SAVED_TRACK_FIELDS)
@@ -0,0 +1,144 @@
+"""
+Metrics API Router - Prometheus scrape endpoint
+
+Request and upstream instruments are recorded as traffic flows; cache,
+scheduler, single-flight and token counters are read from their owners when
+/metrics is scraped.
+"""
+
+from collections.abc import Iterable
+
+from fastapi import APIRouter, Response
+
+from app.auth.tokens import token_manager
+from app.services.cache import CacheBackend, identity_cache, user_cache
+from app.services.catalog import catalog_cache
+from app.services.metrics import CollectedMetric, registry
+from app.services.scheduler import scheduler
+from app.services.singleflight import spotify_flights
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+router = APIRouter()
+
+CACHES: dict[str, CacheBackend] = {
+    "user": user_cache,
+    "identity": identity_cache,
+    "catalog": catalog_cache.cache,
+    "token": token_manager.cache,
+}
+
+
+@registry.add_collector
+def collect_caches() -> Iterable[CollectedMetric]:
+    """Hit, miss and eviction counters of the caches and the catalog database tier"""
+    stats = {name: cache.stats() for name, cache in CACHES.items()}
+    db_lookups = catalog_cache.db_hits + catalog_cache.db_misses
+
+    yield CollectedMetric(
+        "cache_hits_total",
+        "Cache lookups served from the cache",
+        "counter",
+        [("cache_hits_total", {"cache": name}, s["hits"]) for name, s in stats.items()]
+        + [("cache_hits_total", {"cache": "catalog_db"}, catalog_cache.db_hits)],
+    )
+    yield CollectedMetric(
+        "cache_misses_total",
+        "Cache lookups that missed",
+        "counter",
+        [("cache_misses_total", {"cache": name}, s["misses"]) for name, s in stats.items()]
+        + [("cache_misses_total", {"cache": "catalog_db"}, catalog_cache.db_misses)],
+    )
+    yield CollectedMetric(
+        "cache_hit_ratio",
+        "Share of cache lookups served from the cache since startup",
+        "gauge",
+        [("cache_hit_ratio", {"cache": name}, s["hit_ratio"]) for name, s in stats.items()]
+        + [
+            (
+                "cache_hit_ratio",
+                {"cache": "catalog_db"},
+                catalog_cache.db_hits / db_lookups if db_lookups else 0.0,
+            )
+        ],
+    )
+    yield CollectedMetric(
+        "cache_evictions_total",
+        "Entries evicted to stay within the size bound",
+        "counter",
+        [("cache_evictions_total", {"cache": name}, s["evictions"]) for name, s in stats.items()],
+    )
+    yield CollectedMetric(
+        "cache_entries",
+        "Entries currently held by in-process caches",
+        "gauge",
+        [
+            ("cache_entries", {"cache": name}, s["size"])
+            for name, s in stats.items()
+            if s["size"] is not None
+        ],
+    )
+
+
+@registry.add_collector
+def collect_upstream() -> Iterable[CollectedMetric]:
+    """Rate-limit scheduler, request coalescing and token refresh counters"""
+    stats = scheduler.stats()
+    yield CollectedMetric(
+        "spotify_scheduler_waiting",
+        "Requests queued for a rate-limit token",
+        "gauge",
+        [("spotify_scheduler_waiting", {}, stats["waiting"])],
+    )
+    yield CollectedMetric(
+        "spotify_scheduler_paused_seconds",
+        "Remaining time all upstream traffic is paused after a 429",
+        "gauge",
+        [("spotify_scheduler_paused_seconds", {}, stats["paused_for"])],
+    )
+    yield CollectedMetric(
+        "spotify_rate_limited_total",
+        "429 responses received or synthesized while paused",
+        "counter",
+        [("spotify_rate_limited_total", {}, stats["throttled"])],
+    )
+    yield CollectedMetric(
+        "spotify_retries_total",
+        "Upstream requests retried after a 429, 5xx or transport error",
+        "counter",
+        [("spotify_retries_total", {}, stats["retries"])],
+    )
+    yield CollectedMetric(
+        "spotify_queue_delay_seconds_max",
+        "Longest wait for a rate-limit token since startup",
+        "gauge",
+        [
+            ("spotify_queue_delay_seconds_max", {"priority": name}, delay["max_ms"] / 1000)
+            for name, delay in stats["queue_delay"].items()
+        ],
+    )
+
+    flights = spotify_flights.stats()
+    yield CollectedMetric(
+        "spotify_singleflight_calls_total",
+        "Upstream calls started, and identical concurrent calls joined to one in flight",
+        "counter",
+        [
+            ("spotify_singleflight_calls_total", {"outcome": "started"}, flights["calls"]),
+            ("spotify_singleflight_calls_total", {"outcome": "coalesced"}, flights["coalesced"]),
+        ],
+    )
+
+    tokens = token_manager.stats()
+    yield CollectedMetric(
+        "token_refreshes_total",
+        "Access token refreshes sent to Spotify",
+        "counter",
+        [("token_refreshes_total", {}, tokens["refreshes"])],
+    )
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Metrics in the Prometheus text exposition format"""
+    return Response(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
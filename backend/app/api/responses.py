@@ -0,0 +1,174 @@
+"""
+API Responses - Fast JSON rendering with optional MessagePack negotiation
+
+Responses are rendered with orjson when it is installed, falling back to the
+standard library. Clients sending Accept: application/msgpack receive the same
+document as MessagePack when the optional msgpack package is installed.
+"""
+
+import functools
+import inspect
+import json
+import time
+from collections.abc import Callable, Coroutine, Mapping
+from contextvars import ContextVar
+from typing import Any, Optional
+
+from fastapi import Request, Response
+from fastapi.datastructures import Default, DefaultPlaceholder
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from starlette.background import BackgroundTask
+
+from app.middleware.compression import parse_quality_values
+from app.services.timing import current_timings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional representation
+    msgpack = None
+
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+
+# Media type negotiated for the response being rendered
+response_media_type: ContextVar[str] = ContextVar("response_media_type", default="application/json")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Serialize a JSON-compatible value to compact UTF-8 JSON
+
+    Args:
+        content: Value to serialize
+
+    Returns:
+        bytes: Encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def negotiate_media_type(accept: str) -> str:
+    """
+    Pick the response media type for an Accept header
+
+    MessagePack is only chosen when asked for explicitly, msgpack is installed
+    and the client does not weight JSON higher.
+
+    Args:
+        accept: Raw Accept header value
+
+    Returns:
+        str: Media type to render
+    """
+    if msgpack is None:
+        return "application/json"
+
+    accepted = parse_quality_values(accept)
+    media_type = max(MSGPACK_MEDIA_TYPES, key=lambda m: accepted.get(m, 0.0))
+    quality = accepted.get(media_type, 0.0)
+    json_quality = accepted.get(
+        "application/json", accepted.get("application/*", accepted.get("*/*", 0.0))
+    )
+    if quality > 0 and quality >= json_quality:
+        return media_type
+    return "application/json"
+
+
+class APIResponse(JSONResponse):
+    """JSON response rendered with orjson, or MessagePack when negotiated"""
+
+    def __init__(
+        self,
+        content: Any,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+        media_type: Optional[str] = None,
+        background: Optional[BackgroundTask] = None,
+    ):
+        self.media_type = response_media_type.get()
+        super().__init__(content, status_code, headers, media_type, background)
+
+    def render(self, content: Any) -> bytes:
+        if self.media_type in MSGPACK_MEDIA_TYPES:
+            return msgpack.packb(content)
+        return dumps(content)
+
+
+def _timed_endpoint(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Wrap a coroutine endpoint to time it as the "endpoint" span
+
+    The wrapper keeps the endpoint's signature, so FastAPI resolves the same
+    parameters. Sync endpoints run in a threadpool and are returned unchanged, as
+    are endpoints already wrapped when a router is included in another.
+    """
+    if not inspect.iscoroutinefunction(endpoint) or getattr(endpoint, "timed_endpoint", False):
+        return endpoint
+
+    @functools.wraps(endpoint)
+    async def timed(*args, **kwargs):
+        timings = current_timings.get()
+        if timings is None:
+            return await endpoint(*args, **kwargs)
+
+        start = time.perf_counter()
+        try:
+            return await endpoint(*args, **kwargs)
+        finally:
+            timings.endpoint_done = time.perf_counter()
+            timings.add("endpoint", timings.endpoint_done - start)
+
+    timed.timed_endpoint = True
+    return timed
+
+
+class NegotiatedRoute(APIRoute):
+    """
+    Route class that negotiates the response format and serializes quickly
+
+    Routes without a response model get Any, so FastAPI serializes return values
+    with pydantic-core instead of the much slower jsonable_encoder. The endpoint
+    and the serialization after it are timed as request spans.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        endpoint: Callable[..., Any],
+        *,
+        response_model: Any = Default(None),
+        **kwargs,
+    ):
+        if (
+            isinstance(response_model, DefaultPlaceholder)
+            and inspect.signature(endpoint).return_annotation is inspect.Signature.empty
+        ):
+            response_model = Any
+        super().__init__(path, _timed_endpoint(endpoint), response_model=response_model, **kwargs)
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def negotiated_handler(request: Request) -> Response:
+            token = response_media_type.set(negotiate_media_type(request.headers.get("accept", "")))
+            try:
+                response = await handler(request)
+            finally:
+                response_media_type.reset(token)
+
+            timings = current_timings.get()
+            if timings is not None and timings.endpoint_done is not None:
+                timings.add("serialize", time.perf_counter() - timings.endpoint_done)
+
+            if isinstance(response, APIResponse):
+                response.headers.append("Vary", "Accept")
+            return response
+
+        return negotiated_handler
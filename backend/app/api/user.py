@@ -2,53 +2,138 @@
 User API Router - Endpoints for fetching user's Spotify data
 """
 
+import asyncio
 import logging
-from typing import Optional
-
-from fastapi import APIRouter, HTTPException, Query, Request
-
-from app.services.spotify import SpotifyService
+import time
+from collections.abc import AsyncIterator
+from typing import Any, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+
+from app.api.errors import upstream_error
+from app.api.etag import ETagRoute
+from app.api.fields import (
+    artist_fields,
+    play_fields,
+    playlist_fields,
+    saved_track_fields,
+    track_fields,
+    validate_view,
+)
+from app.api.responses import dumps
+from app.auth.session import current_profile, get_session
+from app.auth.tokens import token_manager
+from app.config import settings
+from app.schemas.user import AudioFeaturesRequest
+from app.services import history
+from app.services.projection import (
+    ARTIST_FIELDS,
+    PLAY_FIELDS,
+    TRACK_FIELDS,
+    Fields,
+    parse_fields,
+    project,
+)
+from app.services.spotify_async import AsyncSpotifyService
+from app.services.timing import span
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(route_class=ETagRoute)
 
+TIME_RANGES = ["short_term", "medium_term", "long_term"]
+TIME_RANGE_DESCRIPTION = (
+    "Time range: short_term (4 weeks), medium_term (6 months), long_term (all time)"
+)
 
-def get_spotify_service(request: Request) -> SpotifyService:
+
+async def get_spotify_service(request: Request, response: Response) -> AsyncSpotifyService:
     """
-    Helper function to get Spotify service with access token from cookie
+    Dependency that provides an async Spotify service for the current user
+
+    With a valid session the access token comes from the token manager, which
+    refreshes it ahead of expiry, and the session supplies the user ID so
+    per-user lookups need no Spotify round trip. Sessions without stored tokens
+    fall back to the access token cookie, which must belong to the session's
+    user. Without a session the access token cookie is used as is. The service
+    sends requests over the shared connection pool, so only the bearer token is
+    created per request.
 
     Args:
         request: FastAPI request object
+        response: Response to update the access token cookie on
 
     Returns:
-        SpotifyService: Initialized Spotify service
+        AsyncSpotifyService: Initialized Spotify service
 
     Raises:
         HTTPException: If user is not authenticated
     """
-    access_token = request.cookies.get("spotify_access_token")
+    cookie_token = request.cookies.get("spotify_access_token")
+    with span("auth"):
+        session = get_session(request)
+
+        access_token, expires_at, user_id = cookie_token, None, None
+        if session is not None:
+            try:
+                token = await token_manager.get_token(session.user_id)
+            except Exception as e:
+                logger.error(f"Error refreshing access token: {e}")
+                raise upstream_error(e, "Failed to refresh access token")
+            if token is not None:
+                access_token, expires_at = token.access_token, token.expires_at
+                user_id = session.user_id
+
+        if not access_token:
+            raise HTTPException(
+                status_code=401,
+                detail="Not authenticated. Please login with Spotify.",
+            )
 
-    if not access_token:
-        raise HTTPException(
-            status_code=401,
-            detail="Not authenticated. Please login with Spotify.",
+        if session is not None and user_id is None:
+            # Legacy fallback: the cookie token must belong to the session's user
+            try:
+                user_id = await AsyncSpotifyService(access_token=access_token).get_user_id()
+            except Exception as e:
+                logger.error(f"Error verifying access token cookie: {e}")
+                raise upstream_error(e, "Failed to verify access token")
+            if user_id != session.user_id:
+                logger.info("Access token cookie does not belong to the session user")
+                raise HTTPException(
+                    status_code=401,
+                    detail="Not authenticated. Please login with Spotify.",
+                )
+
+    if access_token != cookie_token and expires_at is not None:
+        response.set_cookie(
+            key="spotify_access_token",
+            value=access_token,
+            httponly=True,
+            max_age=max(expires_at - int(time.time()), 0),
+            samesite="lax",
+            secure=not settings.debug,
         )
 
-    return SpotifyService(access_token=access_token)
+    return AsyncSpotifyService(access_token=access_token, user_id=user_id)
 
 
 @router.get("/profile")
-async def get_user_profile(request: Request):
+async def get_user_profile(
+    request: Request,
+    response: Response,
+    spotify: AsyncSpotifyService = Depends(get_spotify_service),
+):
     """
     Get current user's Spotify profile
 
+    Served from the signed session unless the cached profile is missing or stale.
+
     Returns:
         dict: User profile information
     """
     try:
-        spotify = get_spotify_service(request)
-        profile = spotify.get_current_user()
+        profile = await current_profile(request, response, spotify)
 
         return {
             "success": True,
@@ -59,16 +144,89 @@ async def get_user_profile(request: Request):
         raise
     except Exception as e:
         logger.error(f"Error fetching user profile: {e}")
-        raise HTTPException(status_code=500, detail="Failed to fetch user profile")
+        raise upstream_error(e, "Failed to fetch user profile")
+
+
+@router.get("/summary")
+async def get_summary(
+    request: Request,
+    response: Response,
+    spotify: AsyncSpotifyService = Depends(get_spotify_service),
+    limit: int = Query(10, ge=1, le=50, description="Number of items per list"),
+    view: str = Query("compact", description="compact or full"),
+):
+    """
+    Get everything the dashboard needs in one round trip
+
+    Top tracks and top artists for every time range, and recently played tracks
+    are fetched from Spotify concurrently, along with the profile when the
+    session does not hold a fresh one. A section that fails is returned
+    as null and listed in "errors" instead of failing the whole response.
+
+    Args:
+        limit: Number of items per list (1-50)
+        view: compact keeps only what the dashboard renders; full returns Spotify objects
+
+    Returns:
+        dict: Composite summary document
+    """
+    validate_view(view)
+    compact = view == "compact"
+    selections = {
+        "top_tracks": parse_fields(TRACK_FIELDS) if compact else None,
+        "top_artists": parse_fields(ARTIST_FIELDS) if compact else None,
+        "recently_played": parse_fields(PLAY_FIELDS) if compact else None,
+    }
+
+    sections: dict[str, Any] = {"profile": current_profile(request, response, spotify)}
+    for time_range in TIME_RANGES:
+        sections[f"top_tracks.{time_range}"] = spotify.get_top_tracks(
+            time_range=time_range, limit=limit
+        )
+        sections[f"top_artists.{time_range}"] = spotify.get_top_artists(
+            time_range=time_range, limit=limit
+        )
+    sections["recently_played"] = spotify.get_recently_played(limit=limit)
+
+    results = dict(zip(sections, await asyncio.gather(*sections.values(), return_exceptions=True)))
+
+    failures = {name: result for name, result in results.items() if isinstance(result, Exception)}
+    if len(failures) == len(results):
+        error = next(iter(failures.values()))
+        logger.error(f"Error fetching summary: {error}")
+        raise upstream_error(error, "Failed to fetch summary")
+
+    def section(name: str) -> Any:
+        result = results[name]
+        if isinstance(result, Exception):
+            return None
+        if name == "profile":
+            return result
+        return project(result.get("items", []), selections[name.split(".")[0]])
+
+    errors = {}
+    for name, error in failures.items():
+        logger.error(f"Error fetching summary section {name}: {error}")
+        errors[name] = upstream_error(error, f"Failed to fetch {name}").detail
+
+    return {
+        "success": True,
+        "limit": limit,
+        "data": {
+            "profile": section("profile"),
+            "top_tracks": {tr: section(f"top_tracks.{tr}") for tr in TIME_RANGES},
+            "top_artists": {tr: section(f"top_artists.{tr}") for tr in TIME_RANGES},
+            "recently_played": section("recently_played"),
+        },
+        "errors": errors,
+    }
 
 
 @router.get("/top-tracks")
 async def get_top_tracks(
-    request: Request,
-    time_range: str = Query(
-        "medium_term",
-        description="Time range: short_term (4 weeks), medium_term (6 months), long_term (all time)",
-    ),
+    spotify: AsyncSpotifyService = Depends(get_spotify_service),
+    selection: Optional[Fields] = Depends(track_fields),
+    time_range: str = Query("medium_term", description=TIME_RANGE_DESCRIPTION),
     limit: int = Query(20, ge=1, le=50, description="Number of tracks to return"),
     offset: int = Query(0, ge=0, description="Index of first track to return"),
 ):
@@ -79,21 +237,21 @@ async def get_top_tracks(
         time_range: Time range for top tracks (short_term, medium_term, long_term)
         limit: Number of tracks to return (1-50)
         offset: Offset for pagination
+        fields: Dotted field paths to return for each item
+        view: compact (default) or full, used when fields is not set
 
     Returns:
         dict: Top tracks data
     """
     try:
         # Validate time_range
-        valid_ranges = ["short_term", "medium_term", "long_term"]
-        if time_range not in valid_ranges:
+        if time_range not in TIME_RANGES:
             raise HTTPException(
                 status_code=400,
-                detail=f"Invalid time_range. Must be one of: {', '.join(valid_ranges)}",
+                detail=f"Invalid time_range. Must be one of: {', '.join(TIME_RANGES)}",
             )
 
-        spotify = get_spotify_service(request)
-        tracks = spotify.get_top_tracks(time_range=time_range, limit=limit, offset=offset)
+        tracks = await spotify.get_top_tracks(time_range=time_range, limit=limit, offset=offset)
 
         return {
             "success": True,
@@ -101,23 +259,21 @@ async def get_top_tracks(
             "limit": limit,
             "offset": offset,
             "total": tracks.get("total", 0),
-            "data": tracks.get("items", []),
+            "data": project(tracks.get("items", []), selection),
         }
 
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error fetching top tracks: {e}")
-        raise HTTPException(status_code=500, detail="Failed to fetch top tracks")
+        raise upstream_error(e, "Failed to fetch top tracks")
 
 
 @router.get("/top-artists")
 async def get_top_artists(
-    request: Request,
-    time_range: str = Query(
-        "medium_term",
-        description="Time range: short_term (4 weeks), medium_term (6 months), long_term (all time)",
-    ),
+    spotify: AsyncSpotifyService = Depends(get_spotify_service),
+    selection: Optional[Fields] = Depends(artist_fields),
+    time_range: str = Query("medium_term", description=TIME_RANGE_DESCRIPTION),
     limit: int = Query(20, ge=1, le=50, description="Number of artists to return"),
     offset: int = Query(0, ge=0, description="Index of first artist to return"),
 ):
@@ -128,21 +284,21 @@ async def get_top_artists(
         time_range: Time range for top artists (short_term, medium_term, long_term)
         limit: Number of artists to return (1-50)
         offset: Offset for pagination
+        fields: Dotted field paths to return for each item
+        view: compact (default) or full, used when fields is not set
 
     Returns:
         dict: Top artists data
     """
     try:
         # Validate time_range
-        valid_ranges = ["short_term", "medium_term", "long_term"]
-        if time_range not in valid_ranges:
+        if time_range not in TIME_RANGES:
             raise HTTPException(
                 status_code=400,
-                detail=f"Invalid time_range. Must be one of: {', '.join(valid_ranges)}",
+                detail=f"Invalid time_range. Must be one of: {', '.join(TIME_RANGES)}",
             )
 
-        spotify = get_spotify_service(request)
-        artists = spotify.get_top_artists(time_range=time_range, limit=limit, offset=offset)
+        artists = await spotify.get_top_artists(time_range=time_range, limit=limit, offset=offset)
 
         return {
             "success": True,
@@ -150,19 +306,20 @@ async def get_top_artists(
             "limit": limit,
             "offset": offset,
             "total": artists.get("total", 0),
-            "data": artists.get("items", []),
+            "data": project(artists.get("items", []), selection),
         }
 
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error fetching top artists: {e}")
-        raise HTTPException(status_code=500, detail="Failed to fetch top artists")
+        raise upstream_error(e, "Failed to fetch top artists")
 
 
 @router.get("/recently-played")
 async def get_recently_played(
-    request: Request,
+    spotify: AsyncSpotifyService = Depends(get_spotify_service),
+    selection: Optional[Fields] = Depends(play_fields),
     limit: int = Query(20, ge=1, le=50, description="Number of tracks to return"),
     after: Optional[int] = Query(
         None, description="Unix timestamp in ms - return tracks after this time"
@@ -178,18 +335,19 @@ async def get_recently_played(
         limit: Number of tracks to return (1-50)
         after: Unix timestamp in milliseconds
         before: Unix timestamp in milliseconds
+        fields: Dotted field paths to return for each item
+        view: compact (default) or full, used when fields is not set
 
     Returns:
         dict: Recently played tracks data
     """
     try:
-        spotify = get_spotify_service(request)
-        tracks = spotify.get_recently_played(limit=limit, after=after, before=before)
+        tracks = await spotify.get_recently_played(limit=limit, after=after, before=before)
 
         return {
             "success": True,
             "limit": limit,
-            "data": tracks.get("items", []),
+            "data": project(tracks.get("items", []), selection),
             "cursors": tracks.get("cursors", {}),
         }
 
@@ -197,12 +355,68 @@ async def get_recently_played(
         raise
     except Exception as e:
         logger.error(f"Error fetching recently played tracks: {e}")
-        raise HTTPException(status_code=500, detail="Failed to fetch recently played tracks")
+        raise upstream_error(e, "Failed to fetch recently played tracks")
+
+
+@router.post("/history/sync")
+async def sync_history(spotify: AsyncSpotifyService = Depends(get_spotify_service)):
+    """
+    Store plays made since the last sync in the listening history
+
+    Returns:
+        dict: Number of new plays stored and the new sync cursor
+    """
+    try:
+        result = await history.sync_recently_played(spotify)
+
+        return {
+            "success": True,
+            "data": result,
+        }
+
+    except Exception as e:
+        logger.error(f"Error syncing listening history: {e}")
+        raise upstream_error(e, "Failed to sync listening history")
+
+
+@router.get("/history")
+async def get_history(
+    spotify: AsyncSpotifyService = Depends(get_spotify_service),
+    limit: int = Query(50, ge=1, le=1000, description="Number of plays to return"),
+    before: Optional[int] = Query(
+        None, description="Unix timestamp in ms - return plays before this time"
+    ),
+):
+    """
+    Get the user's stored listening history, newest first
+
+    Args:
+        limit: Number of plays to return (1-1000)
+        before: Unix timestamp in milliseconds
+
+    Returns:
+        dict: Stored plays
+    """
+    try:
+        user_id = await spotify.get_user_id()
+        plays = await asyncio.to_thread(history.get_plays, user_id, limit, before)
+
+        return {
+            "success": True,
+            "limit": limit,
+            "count": len(plays),
+            "data": plays,
+        }
+
+    except Exception as e:
+        logger.error(f"Error fetching listening history: {e}")
+        raise upstream_error(e, "Failed to fetch listening history")
 
 
 @router.get("/saved-tracks")
 async def get_saved_tracks(
-    request: Request,
+    spotify: AsyncSpotifyService = Depends(get_spotify_service),
+    selection: Optional[Fields] = Depends(saved_track_fields),
     limit: int = Query(20, ge=1, le=50, description="Number of tracks to return"),
     offset: int = Query(0, ge=0, description="Index of first track to return"),
 ):
@@ -212,32 +426,34 @@ async def get_saved_tracks(
     Args:
         limit: Number of tracks to return (1-50)
         offset: Offset for pagination
+        fields: Dotted field paths to return for each item
+        view: compact (default) or full, used when fields is not set
 
     Returns:
         dict: Saved tracks data
     """
     try:
-        spotify = get_spotify_service(request)
-        tracks = spotify.get_saved_tracks(limit=limit, offset=offset)
+        tracks = await spotify.get_saved_tracks(limit=limit, offset=offset)
 
         return {
             "success": True,
             "limit": limit,
             "offset": offset,
             "total": tracks.get("total", 0),
-            "data": tracks.get("items", []),
+            "data": project(tracks.get("items", []), selection),
         }
 
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error fetching saved tracks: {e}")
-        raise HTTPException(status_code=500, detail="Failed to fetch saved tracks")
+        raise upstream_error(e, "Failed to fetch saved tracks")
 
 
 @router.get("/playlists")
 async def get_user_playlists(
-    request: Request,
+    spotify: AsyncSpotifyService = Depends(get_spotify_service),
+    selection: Optional[Fields] = Depends(playlist_fields),
     limit: int = Query(20, ge=1, le=50, description="Number of playlists to return"),
     offset: int = Query(0, ge=0, description="Index of first playlist to return"),
 ):
@@ -247,58 +463,130 @@ async def get_user_playlists(
     Args:
         limit: Number of playlists to return (1-50)
         offset: Offset for pagination
+        fields: Dotted field paths to return for each item
+        view: compact (default) or full, used when fields is not set
 
     Returns:
         dict: User playlists data
     """
     try:
-        spotify = get_spotify_service(request)
-        playlists = spotify.get_user_playlists(limit=limit, offset=offset)
+        playlists = await spotify.get_user_playlists(limit=limit, offset=offset)
 
         return {
             "success": True,
             "limit": limit,
             "offset": offset,
             "total": playlists.get("total", 0),
-            "data": playlists.get("items", []),
+            "data": project(playlists.get("items", []), selection),
         }
 
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error fetching user playlists: {e}")
-        raise HTTPException(status_code=500, detail="Failed to fetch user playlists")
+        raise upstream_error(e, "Failed to fetch user playlists")
 
 
-@router.get("/audio-features")
-async def get_audio_features(
-    request: Request,
-    track_ids: str = Query(..., description="Comma-separated list of Spotify track IDs"),
+async def stream_ndjson(items: AsyncIterator[dict[str, Any]], error_detail: str):
+    """
+    Stream items as newline-delimited JSON
+
+    The first item is awaited before the response starts, so authentication and
+    upstream errors on the first page still produce a proper error status.
+    Errors after streaming has begun are reported as a final {"error": ...} line.
+
+    Args:
+        items: Async iterator of items to stream
+        error_detail: Message used if fetching fails
+
+    Returns:
+        StreamingResponse: application/x-ndjson response
+    """
+    iterator = items.__aiter__()
+    try:
+        first = await anext(iterator)
+    except StopAsyncIteration:
+        first = None
+    except Exception as e:
+        logger.error(f"{error_detail}: {e}")
+        raise upstream_error(e, error_detail)
+
+    async def body() -> AsyncIterator[bytes]:
+        if first is None:
+            return
+        yield dumps(first) + b"\n"
+        try:
+            async for item in iterator:
+                yield dumps(item) + b"\n"
+        except Exception as e:
+            logger.error(f"{error_detail}: {e}")
+            yield dumps({"error": error_detail}) + b"\n"
+
+    return StreamingResponse(body(), media_type="application/x-ndjson")
+
+
+@router.get("/saved-tracks/all")
+async def get_all_saved_tracks(
+    spotify: AsyncSpotifyService = Depends(get_spotify_service),
+    selection: Optional[Fields] = Depends(saved_track_fields),
 ):
     """
-    Get audio features for multiple tracks
+    Stream all of the user's saved tracks as NDJSON
+
+    Pages after the first are fetched concurrently and each item is written as
+    soon as its page arrives, so item order is not guaranteed.
+
+    Returns:
+        StreamingResponse: One saved track object per line
+    """
+    items = (project(item, selection) async for item in spotify.iter_saved_tracks())
+    return await stream_ndjson(items, "Failed to fetch saved tracks")
+
+
+@router.get("/playlists/all")
+async def get_all_user_playlists(
+    spotify: AsyncSpotifyService = Depends(get_spotify_service),
+    selection: Optional[Fields] = Depends(playlist_fields),
+):
+    """
+    Stream all of the user's playlists as NDJSON
+
+    Pages after the first are fetched concurrently and each item is written as
+    soon as its page arrives, so item order is not guaranteed.
+
+    Returns:
+        StreamingResponse: One playlist object per line
+    """
+    items = (project(item, selection) async for item in spotify.iter_user_playlists())
+    return await stream_ndjson(items, "Failed to fetch user playlists")
+
+
+async def _audio_features_response(
+    spotify: AsyncSpotifyService, track_ids: list[str]
+) -> dict[str, Any]:
+    """
+    Validate track IDs and build the audio features response
 
     Args:
-        track_ids: Comma-separated track IDs (max 100)
+        spotify: Spotify service for the current user
+        track_ids: Requested track IDs
 
     Returns:
         dict: Audio features for tracks
     """
-    try:
-        # Parse track IDs from comma-separated string
-        track_id_list = [tid.strip() for tid in track_ids.split(",") if tid.strip()]
+    track_ids = [tid.strip() for tid in track_ids if tid.strip()]
 
-        if not track_id_list:
-            raise HTTPException(status_code=400, detail="No track IDs provided")
+    if not track_ids:
+        raise HTTPException(status_code=400, detail="No track IDs provided")
 
-        if len(track_id_list) > 100:
-            raise HTTPException(
-                status_code=400,
-                detail="Maximum 100 track IDs allowed per request",
-            )
+    if len(track_ids) > settings.audio_features_max_ids:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Maximum {settings.audio_features_max_ids} track IDs allowed per request",
+        )
 
-        spotify = get_spotify_service(request)
-        features = spotify.get_audio_features(track_id_list)
+    try:
+        features = await spotify.get_audio_features(track_ids)
 
         return {
             "success": True,
@@ -306,62 +594,106 @@ async def get_audio_features(
             "data": features,
         }
 
-    except HTTPException:
-        raise
     except Exception as e:
         logger.error(f"Error fetching audio features: {e}")
-        raise HTTPException(status_code=500, detail="Failed to fetch audio features")
+        raise upstream_error(e, "Failed to fetch audio features")
+
+
+@router.get("/audio-features")
+async def get_audio_features(
+    spotify: AsyncSpotifyService = Depends(get_spotify_service),
+    track_ids: str = Query(..., description="Comma-separated list of Spotify track IDs"),
+):
+    """
+    Get audio features for multiple tracks
+
+    Args:
+        track_ids: Comma-separated track IDs
+
+    Returns:
+        dict: Audio features for tracks
+    """
+    return await _audio_features_response(spotify, track_ids.split(","))
+
+
+@router.post("/audio-features")
+async def post_audio_features(
+    body: AudioFeaturesRequest,
+    spotify: AsyncSpotifyService = Depends(get_spotify_service),
+):
+    """
+    Get audio features for a large list of tracks sent in the request body
+
+    IDs are de-duplicated and fetched from Spotify in concurrent 100-ID batches.
+
+    Args:
+        body: Track IDs to look up
+
+    Returns:
+        dict: Audio features for tracks, in input order
+    """
+    return await _audio_features_response(spotify, body.track_ids)
 
 
 @router.get("/track/{track_id}")
-async def get_track(request: Request, track_id: str):
+async def get_track(
+    track_id: str,
+    spotify: AsyncSpotifyService = Depends(get_spotify_service),
+    selection: Optional[Fields] = Depends(track_fields),
+):
     """
     Get a specific track by ID
 
     Args:
         track_id: Spotify track ID
+        fields: Dotted field paths to return
+        view: compact (default) or full, used when fields is not set
 
     Returns:
         dict: Track data
     """
     try:
-        spotify = get_spotify_service(request)
-        track = spotify.get_track(track_id)
+        track = await spotify.get_track(track_id)
 
         return {
             "success": True,
-            "data": track,
+            "data": project(track, selection),
         }
 
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error fetching track: {e}")
-        raise HTTPException(status_code=500, detail="Failed to fetch track")
+        raise upstream_error(e, "Failed to fetch track")
 
 
 @router.get("/artist/{artist_id}")
-async def get_artist(request: Request, artist_id: str):
+async def get_artist(
+    artist_id: str,
+    spotify: AsyncSpotifyService = Depends(get_spotify_service),
+    selection: Optional[Fields] = Depends(artist_fields),
+):
     """
     Get a specific artist by ID
 
     Args:
         artist_id: Spotify artist ID
+        fields: Dotted field paths to return
+        view: compact (default) or full, used when fields is not set
 
     Returns:
         dict: Artist data
     """
     try:
-        spotify = get_spotify_service(request)
-        artist = spotify.get_artist(artist_id)
+        artist = await spotify.get_artist(artist_id)
 
         return {
             "success": True,
-            "data": artist,
+            "data": project(artist, selection),
         }
 
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error fetching artist: {e}")
-        raise HTTPException(status_code=500, detail="Failed to fetch artist")
+        raise upstream_error(e, "Failed to fetch artist")
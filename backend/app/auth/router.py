@@ -9,6 +9,10 @@ from typing import Optional
 from fastapi import APIRouter, HTTPException, Query, Request, Response
 from fastapi.responses import JSONResponse, RedirectResponse
 
+from app.api.errors import upstream_error
+from app.api.responses import NegotiatedRoute
+from app.auth.session import SESSION_COOKIE, current_profile, get_session, set_session_cookie
+from app.auth.tokens import token_manager
 from app.config import settings
 from app.schemas.auth import (
     AuthResponse,
@@ -19,10 +23,11 @@ from app.schemas.auth import (
     UserProfile,
 )
 from app.services.spotify import SpotifyService
+from app.services.spotify_async import AsyncSpotifyService
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(route_class=NegotiatedRoute)
 
 
 @router.get("/login")
@@ -95,14 +100,18 @@ async def callback(
 
         # Exchange authorization code for access token
         logger.info("Exchanging authorization code for access token")
-        token_info = SpotifyService.get_access_token(code)
+        token_info = await AsyncSpotifyService.get_access_token(code)
 
         if not token_info or "access_token" not in token_info:
             raise HTTPException(status_code=400, detail="Failed to get access token")
 
         # Get user profile using access token
-        spotify_service = SpotifyService(access_token=token_info["access_token"])
-        user_data = spotify_service.get_current_user()
+        spotify_service = AsyncSpotifyService(access_token=token_info["access_token"])
+        user_data = await spotify_service.get_current_user()
+
+        # Keep the tokens server-side so they can be refreshed ahead of expiry
+        # and history can be synced in the background
+        await token_manager.store(user_data["id"], token_info, user_data.get("display_name"))
 
         # Redirect to frontend callback page (use 127.0.0.1 to match cookie domain)
         response = RedirectResponse(url="http://127.0.0.1:3000/auth/callback")
@@ -142,6 +151,9 @@ async def callback(
             path="/",
         )
 
+        # Signed session so identity and profile can be checked without Spotify
+        set_session_cookie(response, user_data)
+
         # Clear the state cookie
         response.delete_cookie("spotify_auth_state")
 
@@ -152,7 +164,7 @@ async def callback(
         raise
     except Exception as e:
         logger.error(f"Error in callback: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail="Authentication failed")
+        raise upstream_error(e, "Authentication failed")
 
 
 @router.post("/refresh", response_model=TokenRefreshResponse)
@@ -172,11 +184,21 @@ async def refresh_token(
 
         # Request new access token
         logger.info("Refreshing access token")
-        token_info = SpotifyService.refresh_access_token(refresh_token)
+        token_info = await AsyncSpotifyService.refresh_access_token(refresh_token)
 
         if not token_info or "access_token" not in token_info:
             raise HTTPException(status_code=400, detail="Failed to refresh token")
 
+        # Only keep the tokens for the session's user if the cookie's refresh
+        # token is theirs; otherwise it could overwrite another user's tokens
+        session = get_session(request)
+        if session is not None:
+            spotify_service = AsyncSpotifyService(access_token=token_info["access_token"])
+            if await spotify_service.get_user_id() == session.user_id:
+                await token_manager.store(session.user_id, token_info)
+            else:
+                logger.info("Refresh token cookie does not belong to the session user")
+
         # Update access token cookie
         response.set_cookie(
             key="spotify_access_token",
@@ -209,7 +231,7 @@ async def refresh_token(
         raise
     except Exception as e:
         logger.error(f"Error refreshing token: {e}")
-        raise HTTPException(status_code=500, detail="Failed to refresh token")
+        raise upstream_error(e, "Failed to refresh token")
 
 
 @router.post("/logout", response_model=LogoutResponse)
@@ -223,6 +245,7 @@ async def logout(response: Response):
         response.delete_cookie("spotify_refresh_token")
         response.delete_cookie("user_profile")
         response.delete_cookie("spotify_auth_state")
+        response.delete_cookie(SESSION_COOKIE)
 
         logger.info("User logged out successfully")
         return LogoutResponse(
@@ -236,28 +259,45 @@ async def logout(response: Response):
 
 
 @router.get("/me", response_model=UserProfile)
-async def get_current_user(request: Request):
+async def get_current_user(request: Request, response: Response):
     """
     Get current authenticated user's profile
+
+    Served from the signed session; Spotify is only asked when the cached
+    profile is stale. The access token for that comes from the token manager,
+    or from the access token cookie of older logins, which must then belong
+    to the session's user.
     """
     try:
-        # Get access token from cookie
-        access_token = request.cookies.get("spotify_access_token")
+        session = get_session(request)
+        if session is None:
+            raise HTTPException(status_code=401, detail="Not authenticated")
+        if not session.profile_stale:
+            return UserProfile(**session.profile)
 
+        token = await token_manager.get_token(session.user_id)
+        if token is not None:
+            spotify_service = AsyncSpotifyService(access_token=token.access_token)
+            return UserProfile(**await current_profile(request, response, spotify_service))
+
+        # Legacy fallback: tokens only in the cookie, not stored for the user
+        access_token = request.cookies.get("spotify_access_token")
         if not access_token:
             raise HTTPException(status_code=401, detail="Not authenticated")
 
-        # Fetch user profile from Spotify
-        spotify_service = SpotifyService(access_token=access_token)
-        user_data = spotify_service.get_current_user()
+        user_data = await AsyncSpotifyService(access_token=access_token).get_current_user()
+        if user_data.get("id") != session.user_id:
+            logger.info("Access token cookie does not belong to the session user")
+            raise HTTPException(status_code=401, detail="Not authenticated")
 
+        set_session_cookie(response, user_data)
         return UserProfile(**user_data)
 
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error fetching user profile: {e}")
-        raise HTTPException(status_code=500, detail="Failed to fetch user profile")
+        raise upstream_error(e, "Failed to fetch user profile")
 
 
 @router.get("/check")
@@ -265,11 +305,18 @@ async def check_auth(request: Request):
     """
     Check if user is authenticated
 
-    Returns authentication status
+    Authenticated means a valid session whose user has stored tokens; an
+    access token about to expire is refreshed on the way.
     """
-    access_token = request.cookies.get("spotify_access_token")
+    try:
+        session = get_session(request)
+        token = await token_manager.get_token(session.user_id) if session else None
+    except Exception as e:
+        logger.error(f"Error checking authentication: {e}")
+        raise upstream_error(e, "Failed to check authentication")
 
+    authenticated = token is not None
     return {
-        "authenticated": bool(access_token),
-        "message": "User is authenticated" if access_token else "User is not authenticated",
+        "authenticated": authenticated,
+        "message": "User is authenticated" if authenticated else "User is not authenticated",
     }
@@ -0,0 +1,150 @@
+"""
+Session - Signed session cookie carrying the user's identity and profile
+
+The OAuth callback issues a JWT signed with settings.secret_key. It holds the
+Spotify user ID and a snapshot of the profile, so identity is verified locally
+and the profile is only re-fetched from Spotify once it is stale.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import jwt
+from fastapi import Request, Response
+
+from app.config import settings
+from app.services.spotify_async import AsyncSpotifyService
+
+logger = logging.getLogger(__name__)
+
+SESSION_COOKIE = "session"
+
+# Profile fields kept in the session; everything UserProfile exposes
+PROFILE_FIELDS = (
+    "id",
+    "display_name",
+    "email",
+    "country",
+    "product",
+    "images",
+    "followers",
+    "external_urls",
+)
+
+
+@dataclass
+class Session:
+    """Verified contents of a session cookie"""
+
+    user_id: str
+    profile: dict[str, Any]
+    profile_at: int  # Unix timestamp when the profile was fetched
+
+    @property
+    def profile_stale(self) -> bool:
+        """Whether the cached profile is older than the configured max age"""
+        return time.time() - self.profile_at > settings.session_profile_max_age
+
+
+def create_session(profile: dict[str, Any]) -> str:
+    """
+    Issue a signed session token for a Spotify profile
+
+    Args:
+        profile: Spotify user profile
+
+    Returns:
+        str: Encoded JWT
+    """
+    now = int(time.time())
+    claims = {
+        "sub": profile["id"],
+        "profile": {field: profile.get(field) for field in PROFILE_FIELDS},
+        "profile_at": now,
+        "iat": now,
+        "exp": now + settings.session_max_age,
+    }
+    return jwt.encode(claims, settings.secret_key, algorithm=settings.algorithm)
+
+
+def decode_session(token: str) -> Optional[Session]:
+    """
+    Verify a session token
+
+    Args:
+        token: Encoded JWT
+
+    Returns:
+        Session or None if the token is invalid or expired
+    """
+    try:
+        claims = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+    except jwt.PyJWTError as e:
+        logger.info(f"Rejected session token: {e}")
+        return None
+
+    return Session(
+        user_id=claims["sub"],
+        profile=claims.get("profile") or {"id": claims["sub"]},
+        profile_at=claims.get("profile_at", 0),
+    )
+
+
+def get_session(request: Request) -> Optional[Session]:
+    """
+    Read and verify the session cookie of a request
+
+    Args:
+        request: FastAPI request object
+
+    Returns:
+        Session or None if there is no valid session
+    """
+    token = request.cookies.get(SESSION_COOKIE)
+    return decode_session(token) if token else None
+
+
+def set_session_cookie(response: Response, profile: dict[str, Any]) -> None:
+    """
+    Issue a session for a profile and store it in an httponly cookie
+
+    Args:
+        response: Response to set the cookie on
+        profile: Spotify user profile
+    """
+    response.set_cookie(
+        key=SESSION_COOKIE,
+        value=create_session(profile),
+        httponly=True,
+        max_age=settings.session_max_age,
+        samesite="lax",
+        secure=not settings.debug,
+        path="/",
+    )
+
+
+async def current_profile(
+    request: Request, response: Response, spotify: AsyncSpotifyService
+) -> dict[str, Any]:
+    """
+    Get the user's profile, from the session unless it is missing or stale
+
+    A fresh profile fetched from Spotify is written back to the session cookie.
+
+    Args:
+        request: FastAPI request object
+        response: Response to refresh the session cookie on
+        spotify: AsyncSpotifyService authorized as the user
+
+    Returns:
+        dict: User profile data
+    """
+    session = get_session(request)
+    if session is not None and not session.profile_stale:
+        return session.profile
+
+    profile = await spotify.get_current_user()
+    set_session_cookie(response, profile)
+    return profile
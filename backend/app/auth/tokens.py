@@ -0,0 +1,218 @@
+"""
+Token Manager - Keep stored Spotify access tokens valid ahead of expiry
+
+Access tokens are kept in the token cache in front of the users table; with a
+shared cache backend, a refresh done by one worker is seen by the others.
+Refresh tokens never enter the cache: they are read from the users table, where
+they are encrypted, only when a refresh is due. A token
+inside the refresh margin is refreshed in the background while the current one
+is still served; a token that is about to expire is refreshed before it is
+returned. Refreshes are single-flight per user, so concurrent requests cause
+one refresh. A refresh token Spotify rejects (revoked access) is forgotten, and
+the user counts as logged out until they log in again.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Optional
+
+from app.config import settings
+from app.models.user import User
+from app.services.cache import CacheBackend, create_cache
+from app.services.singleflight import SingleFlight
+from app.services.spotify_async import AsyncSpotifyService, SpotifyAPIError
+from app.services.timing import span
+from app.services.users import clear_refresh_token, get_user, save_user_tokens
+
+logger = logging.getLogger(__name__)
+
+# Tokens with less than this many seconds left are refreshed before use
+MIN_TOKEN_LIFETIME = 30
+
+# Token endpoint statuses meaning the refresh token itself is no longer valid
+# (400 invalid_grant for revoked or expired grants)
+REJECTED_REFRESH_STATUS_CODES = (400, 401)
+
+
+@dataclass
+class AccessToken:
+    """A user's current Spotify access token"""
+
+    access_token: str
+    expires_at: int  # Unix timestamp
+
+
+class TokenManager:
+    """Serves valid access tokens for stored users, refreshing them proactively"""
+
+    def __init__(self, refresh_margin: float, cache: CacheBackend):
+        """
+        Initialize token manager
+
+        Args:
+            refresh_margin: Start a background refresh this many seconds before expiry
+            cache: Access token cache keyed by user ID
+        """
+        self.refresh_margin = refresh_margin
+        self.cache = cache
+        self._flights = SingleFlight()
+        self._background: set[asyncio.Task] = set()
+        self.refreshes = 0
+
+    async def _cache(self, user_id: str, token: AccessToken) -> None:
+        """Cache an access token until it expires"""
+        await self.cache.set(user_id, asdict(token), ttl=max(token.expires_at - time.time(), 1))
+
+    async def _cached(self, user_id: str) -> Optional[AccessToken]:
+        """Get an access token from the token cache"""
+        data = await self.cache.get(user_id)
+        if data is None:
+            return None
+        return AccessToken(access_token=data["access_token"], expires_at=data["expires_at"])
+
+    async def store(
+        self, user_id: str, token_info: dict[str, Any], display_name: Optional[str] = None
+    ) -> AccessToken:
+        """
+        Save tokens from a login or refresh
+
+        Args:
+            user_id: Spotify user ID
+            token_info: Token response including access_token and expires_at; a
+                missing refresh_token keeps the stored one
+            display_name: User's display name, kept unchanged if None
+
+        Returns:
+            AccessToken: Access token now stored for the user
+        """
+        await asyncio.to_thread(save_user_tokens, user_id, token_info, display_name)
+        token = AccessToken(
+            access_token=token_info["access_token"], expires_at=token_info["expires_at"]
+        )
+        await self._cache(user_id, token)
+        return token
+
+    async def _load(self, user_id: str) -> Optional[User]:
+        """Read a user's tokens from the users table and cache the access token"""
+        user = await asyncio.to_thread(get_user, user_id)
+        if user is None:
+            await self.cache.delete(user_id)
+            return None
+
+        await self._cache(
+            user_id, AccessToken(access_token=user.access_token, expires_at=user.expires_at)
+        )
+        return user
+
+    async def get_token(self, user_id: str) -> Optional[AccessToken]:
+        """
+        Get a user's access token, refreshed if it is about to expire
+
+        Args:
+            user_id: Spotify user ID
+
+        Returns:
+            AccessToken or None if the user has no stored tokens or they can no
+            longer be refreshed
+
+        Raises:
+            SpotifyAPIError, httpx.HTTPError: If a refresh failed for another reason
+        """
+        token = await self._cached(user_id)
+        if token is None:
+            user = await self._load(user_id)
+            if user is None:
+                return None
+            token = AccessToken(access_token=user.access_token, expires_at=user.expires_at)
+
+        remaining = token.expires_at - time.time()
+        if remaining <= MIN_TOKEN_LIFETIME:
+            with span("token_refresh"):
+                return await self.refresh(user_id)
+        if remaining <= self.refresh_margin:
+            self._refresh_in_background(user_id)
+        return token
+
+    async def get_access_token(self, user_id: str) -> Optional[str]:
+        """
+        Get a valid access token for a user
+
+        Args:
+            user_id: Spotify user ID
+
+        Returns:
+            str or None if the user has no stored tokens
+        """
+        token = await self.get_token(user_id)
+        return token.access_token if token else None
+
+    async def refresh(self, user_id: str) -> Optional[AccessToken]:
+        """
+        Refresh a user's access token, sharing one refresh among concurrent callers
+
+        Args:
+            user_id: Spotify user ID
+
+        Returns:
+            AccessToken or None if the user has no stored tokens or they can no
+            longer be refreshed
+        """
+        return await self._flights.do(user_id, lambda: self._refresh(user_id))
+
+    async def _refresh(self, user_id: str) -> Optional[AccessToken]:
+        """Exchange the refresh token unless another process already did"""
+        # Reload first: another process may have rotated the tokens already
+        user = await self._load(user_id)
+        if user is None:
+            return None
+        token = AccessToken(access_token=user.access_token, expires_at=user.expires_at)
+        if token.expires_at - time.time() > self.refresh_margin:
+            return token
+        if not user.refresh_token:
+            return token if token.expires_at > time.time() else None
+
+        try:
+            token_info = await AsyncSpotifyService.refresh_access_token(user.refresh_token)
+        except SpotifyAPIError as e:
+            if e.status_code not in REJECTED_REFRESH_STATUS_CODES:
+                raise
+            logger.info(f"Refresh token of user {user_id} was rejected: {e.message}")
+            await asyncio.to_thread(clear_refresh_token, user_id)
+            return token if token.expires_at > time.time() else None
+
+        token = await self.store(user_id, token_info)
+        self.refreshes += 1
+        logger.info(f"Refreshed access token for user {user_id}")
+        return token
+
+    def _refresh_in_background(self, user_id: str) -> None:
+        """Start a refresh without waiting for it"""
+        task = asyncio.ensure_future(self.refresh(user_id))
+        self._background.add(task)
+        task.add_done_callback(self._finish_background)
+
+    def _finish_background(self, task: asyncio.Task) -> None:
+        """Log a failed background refresh; the next request retries"""
+        self._background.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Error refreshing access token: {task.exception()}")
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Get token manager statistics
+
+        Returns:
+            dict: Refreshes done and refreshes in flight in this process
+        """
+        return {
+            "refreshes": self.refreshes,
+            "in_flight": len(self._flights),
+        }
+
+
+token_manager = TokenManager(
+    refresh_margin=settings.token_refresh_margin_seconds,
+    cache=create_cache("access_token", settings.user_cache_max_entries, 3600),
+)
@@ -15,6 +15,75 @@ class Settings(BaseSettings):
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 60 * 24  # 24 hours
 
+    # Signed session cookie carrying the user ID and a cached profile
+    session_max_age: int = 60 * 60 * 24 * 30  # 30 days, matching the refresh token cookie
+    session_profile_max_age: int = 60 * 60  # Re-fetch the Spotify profile after an hour
+
+    # Spotify endpoints (override to point at a local stand-in for benchmarks)
+    spotify_api_base_url: str = "https://api.spotify.com/v1"
+    spotify_accounts_url: str = "https://accounts.spotify.com"
+
+    # Spotify HTTP Connection Pool
+    spotify_http2: bool = True  # Needs h2, installed by the httpx[http2] dependency
+    spotify_http_max_connections: int = 100
+    spotify_http_max_keepalive_connections: int = 20
+    spotify_http_keepalive_expiry: float = 30.0  # seconds
+    spotify_http_timeout: float = 10.0  # seconds
+    spotify_http_connect_timeout: float = 5.0  # seconds
+
+    # App-wide Spotify rate limiting, shared by all users
+    spotify_rate_limit_per_second: float = 10.0
+    spotify_rate_limit_burst: int = 20
+    spotify_max_retries: int = 3
+    spotify_retry_backoff: float = 0.5  # seconds, doubled per attempt with jitter
+    spotify_retry_max_backoff: float = 8.0  # seconds
+    spotify_max_retry_after: float = 30.0  # longer Retry-After waits fail fast with 429
+
+    # Maximum concurrent upstream calls when fetching batched catalog data
+    spotify_batch_concurrency: int = 4
+    audio_features_max_ids: int = 10000
+    spotify_page_concurrency: int = 8  # Pages fetched at once in "fetch all" mode
+
+    # Cache backend for the response, catalog and token caches: "memory" (per
+    # worker), "sqlite" (shared by workers on one host) or "redis" (shared by all)
+    cache_backend: str = "memory"
+    cache_sqlite_path: str = "./cache.sqlite3"  # /dev/shm/... keeps it in RAM
+    redis_url: str = "redis://127.0.0.1:6379/0"
+    redis_pool_size: int = 20
+    redis_timeout: float = 1.0  # seconds; cache errors count as misses
+    cache_key_prefix: str = "early-wrapped:"
+
+    # Per-user response cache (top tracks/artists)
+    user_cache_ttl: int = 60 * 60 * 6  # 6 hours; Spotify recomputes top items ~daily
+    user_cache_max_entries: int = 2048
+
+    # Shared catalog cache (tracks, artists, audio features)
+    catalog_cache_ttl: int = 60 * 60 * 24 * 7  # 7 days
+    catalog_cache_max_entries: int = 20000
+
+    # Background listening history sync
+    sync_worker_enabled: bool = False  # Run the sync worker inside the API process
+    sync_interval_seconds: int = 60 * 30  # Each user is polled once per interval
+    sync_worker_concurrency: int = 8
+    token_refresh_margin_seconds: int = 300  # Refresh tokens expiring within this window
+
+    # Cold start: heavy modules (numpy, pandas, spotipy) load on first use, or in
+    # the background this long after startup when warm-up is enabled
+    warm_up_imports: bool = True
+    warm_up_delay: float = 1.0  # seconds
+
+    # Response compression (brotli requires the optional brotli package)
+    compression_minimum_size: int = 1024  # bytes
+    gzip_compress_level: int = 6
+    brotli_quality: int = 4
+
+    # Prometheus metrics served at /metrics
+    metrics_enabled: bool = True
+
+    # Per-request timing breakdown
+    server_timing_header: bool = True  # Send spans in a Server-Timing response header
+    slow_request_threshold_ms: int = 1000  # Log slower requests as JSON; 0 disables
+
     # Database Configuration
     database_url: str = "sqlite:///./early_wrapped.db"
 
@@ -0,0 +1,58 @@
+"""
+Database - SQLAlchemy engine, session factory and declarative base
+"""
+
+from collections.abc import Iterator
+
+from sqlalchemy import Table, create_engine
+from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
+
+from app.config import settings
+
+connect_args = {"check_same_thread": False} if settings.database_url.startswith("sqlite") else {}
+
+engine = create_engine(settings.database_url, connect_args=connect_args)
+
+SessionLocal = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+
+class Base(DeclarativeBase):
+    """Declarative base for all ORM models"""
+
+
+def init_db() -> None:
+    """Create all tables that do not exist yet"""
+    import app.models  # noqa: F401  (registers models on Base.metadata)
+
+    Base.metadata.create_all(bind=engine)
+
+
+def get_db() -> Iterator[Session]:
+    """
+    Dependency that provides a database session
+
+    Yields:
+        Session: SQLAlchemy session, closed after the request
+    """
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def dialect_insert(table: Table):
+    """
+    Get an INSERT construct supporting ON CONFLICT for the configured database
+
+    Args:
+        table: Table to insert into
+
+    Returns:
+        Dialect-specific Insert with on_conflict_do_nothing/on_conflict_do_update
+    """
+    if engine.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(table)
@@ -1,11 +1,73 @@
+import asyncio
+import importlib
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
 from pathlib import Path
 
+from app.api import analytics as analytics_router
+from app.api import metrics as metrics_router
+from app.api.responses import APIResponse
 from app.api import user as user_router
 from app.auth import router as auth_router
 from app.config import settings
+from app.database import engine, init_db
+from app.middleware import CompressionMiddleware, MetricsMiddleware, ServerTimingMiddleware
+from app.services.cache import close_caches
+from app.services.http import close_http_client, get_http_client
+from app.services.timing import time_queries
+
+logger = logging.getLogger(__name__)
+
+# Heavy modules kept off the startup path (numpy, pandas, spotipy). They are
+# imported in the background once the app is serving, so the first analytics
+# request or login does not pay for them either.
+WARM_UP_MODULES = (
+    "app.services.analytics.plays",
+    "app.services.analytics.audio",
+    "app.services.analytics.patterns",
+    "spotipy.oauth2",
+)
+
+
+async def warm_up_imports(delay: float) -> None:
+    """
+    Import the heavy modules in a worker thread after startup
+
+    Args:
+        delay: Seconds to wait first, so the server starts accepting requests
+    """
+    await asyncio.sleep(delay)
+    for name in WARM_UP_MODULES:
+        try:
+            await asyncio.to_thread(importlib.import_module, name)
+        except Exception as e:
+            logger.error(f"Error warming up {name}: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Set up the database, shared Spotify connection pool and optional sync worker"""
+    init_db()
+    get_http_client()
+
+    background = []
+    if settings.sync_worker_enabled:
+        from app.worker import sync_worker
+
+        background.append(asyncio.create_task(sync_worker.run_forever()))
+    if settings.warm_up_imports:
+        background.append(asyncio.create_task(warm_up_imports(settings.warm_up_delay)))
+
+    yield
+
+    for task in background:
+        task.cancel()
+    await close_http_client()
+    await close_caches()
+
 
 app = FastAPI(
     title="Early Wrapped API",
@@ -13,6 +75,8 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
+    default_response_class=APIResponse,
 )
 
 # Configure CORS
@@ -32,6 +96,24 @@ app.add_middleware(
     expose_headers=["*"],
 )
 
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression_minimum_size,
+    gzip_level=settings.gzip_compress_level,
+    brotli_quality=settings.brotli_quality,
+)
+
+time_queries(engine)
+app.add_middleware(
+    ServerTimingMiddleware,
+    send_header=settings.server_timing_header,
+    slow_request_threshold_ms=settings.slow_request_threshold_ms,
+)
+
+# Outermost, so recorded latency includes compression and every other middleware
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+
 
 @app.get("/")
 async def root():
@@ -44,6 +126,7 @@ async def root():
         "endpoints": {
             "auth": "/auth",
             "user": "/api/user",
+            "analytics": "/api/analytics",
         },
     }
 
@@ -64,7 +147,6 @@ async def test_page():
 # Include routers
 app.include_router(auth_router.router, prefix="/auth", tags=["authentication"])
 app.include_router(user_router.router, prefix="/api/user", tags=["user"])
-
-# Analytics router will be added in Phase 2
-# from app.api import analytics
-# app.include_router(analytics.router, prefix="/api/analytics", tags=["analytics"])
+app.include_router(analytics_router.router, prefix="/api/analytics", tags=["analytics"])
+if settings.metrics_enabled:
+    app.include_router(metrics_router.router)
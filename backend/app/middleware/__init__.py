@@ -0,0 +1,9 @@
+"""
+ASGI middleware
+"""
+
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.timing import ServerTimingMiddleware
+
+__all__ = ["CompressionMiddleware", "MetricsMiddleware", "ServerTimingMiddleware"]
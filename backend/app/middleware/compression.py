@@ -0,0 +1,225 @@
+"""
+Compression Middleware - Negotiated brotli/gzip response compression
+
+Responses at or above a size threshold are compressed with brotli when the
+client accepts it and the optional brotli package is installed, otherwise with
+gzip. Streaming responses are compressed chunk by chunk and flushed, so NDJSON
+lines still reach the client as they are produced.
+"""
+
+import gzip
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.services.timing import span
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional encoding
+    brotli = None
+
+# Content types that are already compressed or must not be buffered
+SKIPPED_CONTENT_TYPES = ("text/event-stream", "image/", "audio/", "video/", "application/zip")
+
+# Scope key a handler answering 304 Not Modified sets to the size of the 200
+# body it stands in for, so the 304 gets the ETag and Vary the 200 would get
+NOT_MODIFIED_BODY_SIZE = "app.not_modified_body_size"
+
+
+def parse_quality_values(header: str) -> dict[str, float]:
+    """
+    Parse an Accept-style header into its values and their q weights
+
+    Values are lowercased. A value without a q parameter gets 1.0 and one with
+    a malformed q gets 0.0, so it counts as refused.
+
+    Args:
+        header: Raw header value, e.g. "gzip;q=0.8, br"
+
+    Returns:
+        dict: Weight for each listed value
+    """
+    accepted = {}
+    for part in header.lower().split(","):
+        value, *params = part.split(";")
+        value = value.strip()
+        if not value:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, raw = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(raw.strip())
+                except ValueError:
+                    quality = 0.0
+        accepted[value] = quality
+    return accepted
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick the content encoding for an Accept-Encoding header
+
+    Args:
+        accept_encoding: Raw Accept-Encoding header value
+
+    Returns:
+        str: "br" or "gzip", or None to send the response uncompressed
+    """
+    accepted = parse_quality_values(accept_encoding)
+
+    wildcard = accepted.get("*", 0.0)
+    if brotli is not None and accepted.get("br", wildcard) > 0:
+        return "br"
+    if accepted.get("gzip", wildcard) > 0:
+        return "gzip"
+    return None
+
+
+class _Compressor:
+    """Incremental compressor for one response"""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk and flush it so the client can decode it right away"""
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        """Finish the stream"""
+        if self.encoding == "br":
+            return self._brotli.finish()
+        return self._zlib.flush(zlib.Z_FINISH)
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing responses for clients that accept it"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ):
+        """
+        Initialize middleware
+
+        Args:
+            app: Wrapped ASGI application
+            minimum_size: Smallest complete body in bytes worth compressing
+            gzip_level: zlib compression level (1-9)
+            brotli_quality: Brotli quality (0-11); low values suit dynamic responses
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(self, encoding, scope, send)
+        await self.app(scope, receive, responder.send)
+
+
+def _mark_compressed(headers: MutableHeaders) -> None:
+    """Set the Vary and ETag headers of a representation that gets compressed"""
+    headers.add_vary_header("Accept-Encoding")
+    # The compressed representation needs its own validator
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["ETag"] = f"W/{etag}"
+
+
+class _CompressionResponder:
+    """Per-request send wrapper deciding whether and how to compress"""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, scope: Scope, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.scope = scope
+        self._send = send
+        self.start: Optional[Message] = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            self.passthrough = (
+                "content-encoding" in headers
+                or message["status"] in (204, 304)
+                or content_type.startswith(SKIPPED_CONTENT_TYPES)
+            )
+            if self.passthrough:
+                if (
+                    message["status"] == 304
+                    and self.scope.get(NOT_MODIFIED_BODY_SIZE, 0) >= self.middleware.minimum_size
+                ):
+                    _mark_compressed(MutableHeaders(raw=message["headers"]))
+                await self._send(message)
+            else:
+                # Held back until the first body chunk shows the response size
+                self.start = message
+            return
+
+        if self.passthrough or message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start is not None:
+            start, self.start = self.start, None
+            if not more_body and len(body) < self.middleware.minimum_size:
+                self.passthrough = True
+                await self._send(start)
+                await self._send(message)
+                return
+
+            self.compressor = _Compressor(
+                self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality
+            )
+            headers = MutableHeaders(raw=start["headers"])
+            headers["Content-Encoding"] = self.encoding
+            _mark_compressed(headers)
+
+            if not more_body:
+                with span("compress"):
+                    if self.encoding == "br":
+                        compressed = brotli.compress(body, quality=self.middleware.brotli_quality)
+                    else:
+                        compressed = gzip.compress(body, compresslevel=self.middleware.gzip_level)
+                headers["Content-Length"] = str(len(compressed))
+                await self._send(start)
+                await self._send({"type": "http.response.body", "body": compressed})
+                return
+
+            del headers["Content-Length"]
+            await self._send(start)
+
+        chunk = self.compressor.compress(body) if body else b""
+        if not more_body:
+            chunk += self.compressor.finish()
+        await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
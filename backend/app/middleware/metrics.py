@@ -0,0 +1,54 @@
+"""
+Metrics Middleware - Request counts, latency histograms and in-flight gauge
+
+Requests are labelled by route template (e.g. /api/user/tracks/{track_id})
+rather than raw path, so label cardinality stays bounded.
+"""
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.services.metrics import http_request_duration, http_requests, http_requests_in_flight
+
+# Label for requests that matched no route, e.g. 404s for arbitrary paths
+UNMATCHED_ROUTE = "unmatched"
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route request metrics"""
+
+    def __init__(self, app: ASGIApp):
+        """
+        Initialize middleware
+
+        Args:
+            app: Wrapped ASGI application
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_requests_in_flight.dec()
+            # The router stores the matched route in the scope
+            route = scope.get("route")
+            path = getattr(route, "path", UNMATCHED_ROUTE)
+            method = scope["method"]
+            http_request_duration.observe(time.perf_counter() - start, method, path)
+            http_requests.inc(method, path, str(status))
@@ -0,0 +1,84 @@
+"""
+Timing Middleware - Server-Timing header and slow-request log
+
+Each request gets a RequestTimings that spans on the request path report into.
+The breakdown is sent in a Server-Timing header, and requests slower than the
+threshold are logged as one JSON object per line on the "app.slow_requests"
+logger.
+"""
+
+import json
+import logging
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.services.timing import RequestTimings, current_timings
+
+slow_request_logger = logging.getLogger("app.slow_requests")
+
+
+class ServerTimingMiddleware:
+    """ASGI middleware collecting per-request spans"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        send_header: bool = True,
+        slow_request_threshold_ms: float = 1000,
+    ):
+        """
+        Initialize middleware
+
+        Args:
+            app: Wrapped ASGI application
+            send_header: Whether to add the Server-Timing response header
+            slow_request_threshold_ms: Log requests taking at least this long; 0 disables
+        """
+        self.app = app
+        self.send_header = send_header
+        self.slow_request_threshold = slow_request_threshold_ms / 1000
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        status = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.send_header:
+                    MutableHeaders(raw=message["headers"]).append("Server-Timing", timings.header())
+            await send(message)
+
+        token = current_timings.set(timings)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_timings.reset(token)
+            elapsed = timings.elapsed()
+            if self.slow_request_threshold and elapsed >= self.slow_request_threshold:
+                self._log_slow_request(scope, status, elapsed, timings)
+
+    @staticmethod
+    def _log_slow_request(
+        scope: Scope, status: int, elapsed: float, timings: RequestTimings
+    ) -> None:
+        """Write one structured slow-request record"""
+        route = scope.get("route")
+        record = {
+            "event": "slow_request",
+            "method": scope["method"],
+            "path": scope["path"],
+            "route": getattr(route, "path", None),
+            "status": status,
+            "duration_ms": round(elapsed * 1000, 1),
+            "spans": timings.as_dict(),
+            "timestamp": time.time(),
+        }
+        slow_request_logger.warning(json.dumps(record))
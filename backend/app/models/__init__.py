@@ -0,0 +1,18 @@
+"""
+Models module - SQLAlchemy ORM models
+"""
+
+from app.models.catalog import CatalogEntry
+from app.models.history import Play, SyncState
+from app.models.rollups import ArtistRollup, DailyRollup, TrackRollup
+from app.models.user import User
+
+__all__ = [
+    "ArtistRollup",
+    "CatalogEntry",
+    "DailyRollup",
+    "Play",
+    "SyncState",
+    "TrackRollup",
+    "User",
+]
@@ -0,0 +1,19 @@
+"""
+Catalog Models - Persistent cache of Spotify catalog entities
+"""
+
+from sqlalchemy import Float, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class CatalogEntry(Base):
+    """Cached catalog object (track, artist, audio features) shared by all users"""
+
+    __tablename__ = "catalog_cache"
+
+    kind: Mapped[str] = mapped_column(String(32), primary_key=True)
+    spotify_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    data: Mapped[str] = mapped_column(Text)  # JSON encoded API object
+    fetched_at: Mapped[float] = mapped_column(Float)  # Unix timestamp
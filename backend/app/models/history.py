@@ -0,0 +1,38 @@
+"""
+Listening History Models - Persisted plays and per-user sync cursors
+"""
+
+from typing import Optional
+
+from sqlalchemy import BigInteger, Float, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class Play(Base):
+    """A single track play from the user's recently played history"""
+
+    __tablename__ = "plays"
+    __table_args__ = (Index("ix_plays_user_played_at", "user_id", "played_at", unique=True),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    user_id: Mapped[str] = mapped_column(String(64))
+    played_at: Mapped[int] = mapped_column(BigInteger)  # Unix timestamp in milliseconds
+    track_id: Mapped[str] = mapped_column(String(64))
+    track_name: Mapped[str] = mapped_column(String(512))
+    artist_id: Mapped[Optional[str]] = mapped_column(String(64))  # Primary artist
+    artist_name: Mapped[Optional[str]] = mapped_column(String(512))
+    album_id: Mapped[Optional[str]] = mapped_column(String(64))
+    duration_ms: Mapped[int] = mapped_column(Integer)
+    context_uri: Mapped[Optional[str]] = mapped_column(String(256))
+
+
+class SyncState(Base):
+    """Per-user high-water mark for incremental recently played syncs"""
+
+    __tablename__ = "sync_state"
+
+    user_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    last_played_at: Mapped[int] = mapped_column(BigInteger, default=0)  # Unix ms cursor
+    last_synced_at: Mapped[float] = mapped_column(Float, default=0.0)  # Unix timestamp
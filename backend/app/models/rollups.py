@@ -0,0 +1,46 @@
+"""
+Rollup Models - Per-user daily aggregates maintained as plays are ingested
+
+Days are UTC days since the Unix epoch, so any date range is a contiguous
+integer range and can be answered by summing a few rows.
+"""
+
+from sqlalchemy import BigInteger, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class DailyRollup(Base):
+    """Plays and listening time per user per day"""
+
+    __tablename__ = "rollup_daily"
+
+    user_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    day: Mapped[int] = mapped_column(Integer, primary_key=True)
+    plays: Mapped[int] = mapped_column(Integer, default=0)
+    ms_played: Mapped[int] = mapped_column(BigInteger, default=0)
+
+
+class TrackRollup(Base):
+    """Plays and listening time per user per track per day"""
+
+    __tablename__ = "rollup_track_daily"
+
+    user_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    day: Mapped[int] = mapped_column(Integer, primary_key=True)
+    track_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    plays: Mapped[int] = mapped_column(Integer, default=0)
+    ms_played: Mapped[int] = mapped_column(BigInteger, default=0)
+
+
+class ArtistRollup(Base):
+    """Plays and listening time per user per primary artist per day"""
+
+    __tablename__ = "rollup_artist_daily"
+
+    user_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    day: Mapped[int] = mapped_column(Integer, primary_key=True)
+    artist_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    plays: Mapped[int] = mapped_column(Integer, default=0)
+    ms_played: Mapped[int] = mapped_column(BigInteger, default=0)
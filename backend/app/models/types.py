@@ -0,0 +1,41 @@
+"""
+Column Types - Custom SQLAlchemy column types
+"""
+
+from typing import Any, Optional
+
+from sqlalchemy import Dialect, Text
+from sqlalchemy.types import TypeDecorator
+
+from app.services.encryption import decrypt, encrypt
+
+# Prefix of every Fernet token (version byte 0x80, base64-encoded)
+FERNET_PREFIX = "gAAAAA"
+
+
+class EncryptedText(TypeDecorator):
+    """
+    Text column encrypted at rest with the application secret key
+
+    Empty strings are stored as is, so "has a value" checks still work in SQL.
+    Plain-text values written before encryption was introduced are read back
+    unchanged and are encrypted the next time they are saved.
+    """
+
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value: Optional[str], dialect: Dialect) -> Optional[str]:
+        return encrypt(value) if value else value
+
+    def process_result_value(self, value: Optional[str], dialect: Dialect) -> Any:
+        if not value or not value.startswith(FERNET_PREFIX):
+            return value
+
+        from cryptography.fernet import InvalidToken
+
+        try:
+            return decrypt(value)
+        except InvalidToken:
+            # Encrypted under a previous secret key; the user has to log in again
+            return ""
@@ -0,0 +1,24 @@
+"""
+User Models - Registered users and their Spotify tokens
+"""
+
+from typing import Optional
+
+from sqlalchemy import BigInteger, Float, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+from app.models.types import EncryptedText
+
+
+class User(Base):
+    """A user who has logged in, with tokens for background syncing"""
+
+    __tablename__ = "users"
+
+    id: Mapped[str] = mapped_column(String(64), primary_key=True)  # Spotify user ID
+    display_name: Mapped[Optional[str]] = mapped_column(String(256))
+    access_token: Mapped[str] = mapped_column(Text)
+    refresh_token: Mapped[str] = mapped_column(EncryptedText)  # Encrypted at rest
+    expires_at: Mapped[int] = mapped_column(BigInteger)  # Unix timestamp
+    created_at: Mapped[float] = mapped_column(Float)  # Unix timestamp
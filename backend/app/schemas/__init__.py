@@ -12,8 +12,10 @@ from app.schemas.auth import (
     TokenRefreshResponse,
     UserProfile,
 )
+from app.schemas.user import AudioFeaturesRequest
 
 __all__ = [
+    "AudioFeaturesRequest",
     "AuthResponse",
     "CallbackRequest",
     "LoginRequest",
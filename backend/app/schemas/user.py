@@ -0,0 +1,18 @@
+"""
+User Data Schemas - Pydantic models for user data requests
+"""
+
+from pydantic import BaseModel, Field
+
+
+class AudioFeaturesRequest(BaseModel):
+    """Schema for a bulk audio features lookup"""
+
+    track_ids: list[str] = Field(..., min_length=1, description="Spotify track IDs")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "track_ids": ["4uLU6hMCjMI75M1A2tKUQC", "7ouMYWpwJ422jRcDASZB7P"],
+            }
+        }
@@ -2,6 +2,21 @@
 Services module - Business logic and external API integrations
 """
 
+from app.services.cache import CacheBackend, TTLCache
+from app.services.catalog import CatalogCache
+from app.services.scheduler import Priority, UpstreamScheduler
+from app.services.singleflight import SingleFlight
 from app.services.spotify import SpotifyService
+from app.services.spotify_async import AsyncSpotifyService, SpotifyAPIError
 
-__all__ = ["SpotifyService"]
+__all__ = [
+    "AsyncSpotifyService",
+    "CacheBackend",
+    "CatalogCache",
+    "Priority",
+    "SingleFlight",
+    "SpotifyAPIError",
+    "SpotifyService",
+    "TTLCache",
+    "UpstreamScheduler",
+]
@@ -0,0 +1,50 @@
+"""
+Analytics module - Vectorized listening statistics over stored plays
+
+Submodules pull in numpy and pandas, so they are imported on first attribute
+access rather than with the package; the API process starts without them.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+# Public name -> submodule defining it
+_EXPORTS = {
+    "FeatureMatrix": "audio",
+    "audio_profile": "audio",
+    "classify_personality": "audio",
+    "rank_weights": "genres",
+    "top_genres": "genres",
+    "detect_sessions": "patterns",
+    "listening_patterns": "patterns",
+    "PlayArrays": "plays",
+    "load_plays": "plays",
+}
+
+if TYPE_CHECKING:
+    from app.services.analytics.audio import FeatureMatrix, audio_profile, classify_personality
+    from app.services.analytics.genres import rank_weights, top_genres
+    from app.services.analytics.patterns import detect_sessions, listening_patterns
+    from app.services.analytics.plays import PlayArrays, load_plays
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
+
+
+__all__ = [
+    "FeatureMatrix",
+    "PlayArrays",
+    "audio_profile",
+    "classify_personality",
+    "detect_sessions",
+    "listening_patterns",
+    "load_plays",
+    "rank_weights",
+    "top_genres",
+]
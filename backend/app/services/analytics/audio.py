@@ -0,0 +1,140 @@
+"""
+Audio Profile - Dense audio-feature matrix and music personality scoring
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import numpy as np
+
+# Audio features on a 0-1 scale, in matrix column order
+FEATURES = (
+    "danceability",
+    "energy",
+    "valence",
+    "acousticness",
+    "instrumentalness",
+    "speechiness",
+    "liveness",
+)
+
+# Archetype centroids in FEATURES order
+ARCHETYPES = {
+    "Party Starter": (0.80, 0.80, 0.75, 0.10, 0.05, 0.08, 0.20),
+    "Energizer": (0.55, 0.90, 0.45, 0.05, 0.15, 0.08, 0.25),
+    "Feel-Good Groover": (0.70, 0.60, 0.80, 0.30, 0.05, 0.06, 0.15),
+    "Chill Seeker": (0.55, 0.35, 0.45, 0.65, 0.20, 0.05, 0.12),
+    "Melancholic Soul": (0.45, 0.35, 0.20, 0.60, 0.10, 0.04, 0.12),
+    "Deep Focus": (0.40, 0.35, 0.30, 0.60, 0.80, 0.04, 0.10),
+    "Wordsmith": (0.75, 0.60, 0.50, 0.15, 0.01, 0.30, 0.18),
+}
+
+ARCHETYPE_NAMES = list(ARCHETYPES)
+ARCHETYPE_MATRIX = np.array(list(ARCHETYPES.values()), dtype=np.float32)
+
+
+@dataclass
+class FeatureMatrix:
+    """Audio features of many tracks as a tracks x features float32 matrix"""
+
+    track_ids: list[str]
+    values: np.ndarray  # float32, shape (len(track_ids), len(FEATURES))
+
+    def __len__(self) -> int:
+        return len(self.track_ids)
+
+    @classmethod
+    def from_features(cls, features: list[dict[str, Any]]) -> "FeatureMatrix":
+        """
+        Build a matrix from audio features objects
+
+        Args:
+            features: Audio features as returned by Spotify
+
+        Returns:
+            FeatureMatrix: One row per track; missing values become NaN
+        """
+        values = np.array(
+            [[item.get(name, np.nan) for name in FEATURES] for item in features],
+            dtype=np.float32,
+        ).reshape(len(features), len(FEATURES))
+        return cls(track_ids=[item["id"] for item in features], values=values)
+
+    def mean(self, weights: Optional[Sequence[float]] = None) -> np.ndarray:
+        """
+        Average feature vector, optionally weighted (e.g. by play count)
+
+        Args:
+            weights: One non-negative weight per track, in track order
+
+        Returns:
+            np.ndarray: float32 vector in FEATURES order
+        """
+        if weights is not None:
+            weights = np.asarray(weights, dtype=np.float32)
+        masked = np.ma.masked_invalid(self.values)
+        return np.ma.average(masked, axis=0, weights=weights).filled(np.nan).astype(np.float32)
+
+    def percentiles(self, q: tuple[float, ...] = (25, 50, 75)) -> np.ndarray:
+        """
+        Per-feature percentiles
+
+        Args:
+            q: Percentiles to compute
+
+        Returns:
+            np.ndarray: Shape (len(q), len(FEATURES))
+        """
+        return np.nanpercentile(self.values, q, axis=0)
+
+
+def classify_personality(profile: np.ndarray) -> dict[str, Any]:
+    """
+    Find the archetype nearest to an average feature vector
+
+    Args:
+        profile: Average feature vector in FEATURES order
+
+    Returns:
+        dict: Personality label and a similarity score per archetype
+    """
+    distances = np.linalg.norm(ARCHETYPE_MATRIX - np.nan_to_num(profile, nan=0.5), axis=1)
+    similarity = 1.0 / (1.0 + distances)
+    nearest = int(np.argmin(distances))
+    return {
+        "personality": ARCHETYPE_NAMES[nearest],
+        "scores": dict(zip(ARCHETYPE_NAMES, np.round(similarity.astype(np.float64), 4).tolist())),
+    }
+
+
+def audio_profile(
+    matrix: FeatureMatrix, weights: Optional[Sequence[float]] = None
+) -> dict[str, Any]:
+    """
+    Summarize a user's audio features
+
+    Values are rounded in float64, since float32 values rounded to 4 decimals
+    still serialize with float32 noise (0.6 becomes 0.6000000238418579).
+
+    Args:
+        matrix: Audio features of the user's tracks
+        weights: Optional per-track weights such as play counts, in track order
+
+    Returns:
+        dict: Averages, quartiles and music personality
+    """
+    if len(matrix) == 0:
+        return {"tracks": 0, "averages": {}, "quartiles": {}, "personality": None, "scores": {}}
+
+    averages = matrix.mean(weights)
+    quartiles = matrix.percentiles()
+    return {
+        "tracks": len(matrix),
+        "averages": dict(zip(FEATURES, np.round(averages.astype(np.float64), 4).tolist())),
+        "quartiles": {
+            name: np.round(quartiles[:, column].astype(np.float64), 4).tolist()
+            for column, name in enumerate(FEATURES)
+        },
+        **classify_personality(averages),
+    }
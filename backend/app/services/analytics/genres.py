@@ -0,0 +1,57 @@
+"""
+Genre Aggregation - Weighted top genres from a user's artists
+"""
+
+from collections import defaultdict
+from typing import Any
+
+
+def rank_weights(count: int) -> list[float]:
+    """
+    Linearly decaying weights for a ranked list, highest rank first
+
+    Args:
+        count: Number of ranked items
+
+    Returns:
+        list: Weights count, count - 1, ..., 1
+    """
+    return [float(count - rank) for rank in range(count)]
+
+
+def top_genres(
+    artists: list[dict[str, Any]], weights: list[float], limit: int = 5
+) -> list[dict[str, Any]]:
+    """
+    Aggregate artist genres into a weighted genre ranking
+
+    Each artist contributes its weight to every one of its genres.
+
+    Args:
+        artists: Spotify artist objects with a genres list
+        weights: Weight of each artist (rank or play count), parallel to artists
+        limit: Number of genres to return
+
+    Returns:
+        list: Genres with score, share of the total weight and artist count
+    """
+    scores: dict[str, float] = defaultdict(float)
+    artist_counts: dict[str, int] = defaultdict(int)
+
+    for artist, weight in zip(artists, weights):
+        for genre in artist.get("genres") or []:
+            scores[genre] += weight
+            artist_counts[genre] += 1
+
+    total = sum(weight for artist, weight in zip(artists, weights) if artist.get("genres"))
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+    return [
+        {
+            "genre": genre,
+            "score": score,
+            "share": score / total if total else 0.0,
+            "artists": artist_counts[genre],
+        }
+        for genre, score in ranked
+    ]
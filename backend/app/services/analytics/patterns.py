@@ -0,0 +1,106 @@
+"""
+Listening Patterns - Vectorized time-of-day, weekday, month and session stats
+"""
+
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from app.services.analytics.plays import PlayArrays
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+def detect_sessions(played_at: np.ndarray, duration_ms: np.ndarray, gap_ms: int) -> np.ndarray:
+    """
+    Assign each play to a listening session
+
+    A new session starts when the silence after the previous play ends exceeds
+    the gap. Boundaries are found with one vectorized comparison and numbered
+    with a cumulative sum.
+
+    Args:
+        played_at: Sorted play start times in Unix ms
+        duration_ms: Track durations in ms
+        gap_ms: Maximum silence within a session
+
+    Returns:
+        np.ndarray: Session number for each play, starting at 0
+    """
+    if len(played_at) == 0:
+        return np.empty(0, dtype=np.int64)
+
+    silence = played_at[1:] - (played_at[:-1] + duration_ms[:-1])
+    starts = np.concatenate(([False], silence > gap_ms))
+    return np.cumsum(starts)
+
+
+def session_stats(plays: PlayArrays, gap_ms: int) -> dict[str, Any]:
+    """
+    Summarize listening sessions
+
+    Args:
+        plays: Plays sorted by played_at
+        gap_ms: Maximum silence within a session
+
+    Returns:
+        dict: Session count plus average and longest session length in ms
+    """
+    if len(plays) == 0:
+        return {"count": 0, "average_length_ms": 0, "longest_length_ms": 0}
+
+    session_ids = detect_sessions(plays.played_at, plays.duration_ms, gap_ms)
+    boundaries = np.flatnonzero(np.diff(session_ids, prepend=-1))
+
+    ends = plays.played_at + plays.duration_ms
+    lengths = np.maximum.reduceat(ends, boundaries) - plays.played_at[boundaries]
+
+    return {
+        "count": int(len(boundaries)),
+        "average_length_ms": int(lengths.mean()),
+        "longest_length_ms": int(lengths.max()),
+    }
+
+
+def listening_patterns(
+    plays: PlayArrays, tz: str = "UTC", session_gap_minutes: int = 30
+) -> dict[str, Any]:
+    """
+    Compute all listening pattern stats for a user's plays
+
+    Args:
+        plays: Plays sorted by played_at
+        tz: IANA time zone used for hours, weekdays and months
+        session_gap_minutes: Maximum silence within a session
+
+    Returns:
+        dict: Totals, hourly and weekday distributions, most active month and sessions
+    """
+    local = pd.DatetimeIndex(pd.to_datetime(plays.played_at, unit="ms", utc=True)).tz_convert(tz)
+
+    by_hour = np.bincount(local.hour.to_numpy(), minlength=24)
+    by_weekday = np.bincount(local.dayofweek.to_numpy(), minlength=7)
+
+    months = local.year.to_numpy() * 12 + local.month.to_numpy() - 1
+    most_active_month = None
+    if len(months):
+        month_keys, month_counts = np.unique(months, return_counts=True)
+        busiest = int(np.argmax(month_counts))
+        year, month = divmod(int(month_keys[busiest]), 12)
+        most_active_month = {
+            "month": f"{year:04d}-{month + 1:02d}",
+            "plays": int(month_counts[busiest]),
+        }
+
+    return {
+        "total_plays": int(len(plays)),
+        "total_listening_ms": int(plays.duration_ms.sum()),
+        "unique_tracks": int(len(pd.unique(plays.track_id))),
+        "by_hour": by_hour.tolist(),
+        "peak_hour": int(np.argmax(by_hour)) if len(plays) else None,
+        "by_weekday": dict(zip(WEEKDAYS, by_weekday.tolist())),
+        "peak_weekday": WEEKDAYS[int(np.argmax(by_weekday))] if len(plays) else None,
+        "most_active_month": most_active_month,
+        "sessions": session_stats(plays, session_gap_minutes * 60 * 1000),
+    }
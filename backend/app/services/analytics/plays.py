@@ -0,0 +1,62 @@
+"""
+Play Loading - Columnar access to a user's stored listening history
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import select
+
+from app.database import SessionLocal
+from app.models.history import Play
+
+
+@dataclass
+class PlayArrays:
+    """A user's plays as parallel column arrays, sorted by played_at"""
+
+    played_at: np.ndarray  # int64 Unix ms
+    duration_ms: np.ndarray  # int64
+    track_id: np.ndarray  # object (str)
+    artist_id: np.ndarray  # object (str or None)
+
+    def __len__(self) -> int:
+        return len(self.played_at)
+
+
+def load_plays(user_id: str, start: Optional[int] = None, end: Optional[int] = None) -> PlayArrays:
+    """
+    Load a user's plays into column arrays with a single query
+
+    Args:
+        user_id: Spotify user ID
+        start: Only include plays at or after this Unix ms timestamp
+        end: Only include plays before this Unix ms timestamp
+
+    Returns:
+        PlayArrays: Plays sorted by played_at
+    """
+    query = select(Play.played_at, Play.duration_ms, Play.track_id, Play.artist_id).where(
+        Play.user_id == user_id
+    )
+    if start is not None:
+        query = query.where(Play.played_at >= start)
+    if end is not None:
+        query = query.where(Play.played_at < end)
+    query = query.order_by(Play.played_at)
+
+    with SessionLocal() as db:
+        rows = db.execute(query).all()
+
+    if not rows:
+        empty = np.empty(0, dtype=np.int64)
+        return PlayArrays(empty, empty, np.empty(0, dtype=object), np.empty(0, dtype=object))
+
+    played_at, duration_ms, track_id, artist_id = zip(*rows)
+    return PlayArrays(
+        played_at=np.fromiter(played_at, dtype=np.int64, count=len(rows)),
+        duration_ms=np.fromiter(duration_ms, dtype=np.int64, count=len(rows)),
+        track_id=np.array(track_id, dtype=object),
+        artist_id=np.array(artist_id, dtype=object),
+    )
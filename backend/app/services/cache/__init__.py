@@ -0,0 +1,87 @@
+"""
+Cache - Response, catalog and token caches behind one pluggable backend
+
+The backend is chosen with the CACHE_BACKEND setting:
+
+- memory: in-process LRU; fastest, but each worker has its own copy
+- sqlite: one SQLite file shared by the workers on a host (e.g. in /dev/shm)
+- redis: any Redis protocol server, shared by workers across hosts
+"""
+
+from typing import Optional
+
+from app.config import settings
+from app.services.cache.base import CacheBackend, cache_key
+from app.services.cache.memory import MemoryBackend, TTLCache
+from app.services.cache.redis import RedisBackend, RedisClient
+from app.services.cache.sqlite import SQLiteBackend, SQLiteStore
+
+CACHE_BACKENDS = ("memory", "sqlite", "redis")
+
+_sqlite_store: Optional[SQLiteStore] = None
+_redis_client: Optional[RedisClient] = None
+
+
+def create_cache(namespace: str, maxsize: int, ttl: float) -> CacheBackend:
+    """
+    Create a cache on the configured backend
+
+    Args:
+        namespace: Name of the cache; keeps its keys apart on shared backends
+        maxsize: Maximum entries (memory and sqlite; Redis relies on its own eviction policy)
+        ttl: Default time to live in seconds
+
+    Returns:
+        CacheBackend: Cache for this namespace
+
+    Raises:
+        ValueError: If CACHE_BACKEND is not a known backend
+    """
+    global _sqlite_store, _redis_client
+
+    backend = settings.cache_backend
+    if backend == "memory":
+        return MemoryBackend(namespace, maxsize=maxsize, ttl=ttl)
+    if backend == "sqlite":
+        if _sqlite_store is None:
+            _sqlite_store = SQLiteStore(settings.cache_sqlite_path)
+        return SQLiteBackend(_sqlite_store, namespace, maxsize=maxsize, ttl=ttl)
+    if backend == "redis":
+        if _redis_client is None:
+            _redis_client = RedisClient(
+                settings.redis_url,
+                pool_size=settings.redis_pool_size,
+                timeout=settings.redis_timeout,
+            )
+        return RedisBackend(_redis_client, namespace, ttl=ttl, prefix=settings.cache_key_prefix)
+    raise ValueError(
+        f"Unknown cache backend {backend!r}; expected one of {', '.join(CACHE_BACKENDS)}"
+    )
+
+
+async def close_caches() -> None:
+    """Close connections held by the shared backends"""
+    if _sqlite_store is not None:
+        _sqlite_store.close()
+    if _redis_client is not None:
+        await _redis_client.close()
+
+
+# Per-user responses such as top tracks/artists, keyed by kind, user_id and params
+user_cache = create_cache("user", settings.user_cache_max_entries, settings.user_cache_ttl)
+
+# Maps a hashed access token to the Spotify user ID it belongs to
+identity_cache = create_cache("identity", settings.user_cache_max_entries, 3600)
+
+__all__ = [
+    "CacheBackend",
+    "MemoryBackend",
+    "RedisBackend",
+    "SQLiteBackend",
+    "TTLCache",
+    "cache_key",
+    "close_caches",
+    "create_cache",
+    "identity_cache",
+    "user_cache",
+]
@@ -0,0 +1,184 @@
+"""
+Cache Backend - Interface shared by the in-process, SQLite and Redis caches
+
+Callers see one async key-value API with per-entry TTLs. Backend failures are
+logged and treated as misses, so a broken shared cache degrades to upstream
+calls instead of failing requests.
+"""
+
+import json
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def cache_key(*parts: Any) -> str:
+    """
+    Build a string cache key from its parts
+
+    Args:
+        parts: Key components, e.g. ("top_tracks", user_id, "short_term", 50, 0)
+
+    Returns:
+        str: Components joined with ":"
+    """
+    return ":".join(str(part) for part in parts)
+
+
+def dumps(value: Any) -> bytes:
+    """Serialize a JSON-compatible value for a shared backend"""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: bytes) -> Any:
+    """Deserialize a value written by dumps"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class CacheBackend(ABC):
+    """
+    Async cache with per-entry TTL
+
+    Subclasses implement the batch primitives; hit/miss counting and error
+    handling live here. Values must be JSON-compatible, since shared backends
+    serialize them. None is never stored, so it always means a miss.
+    """
+
+    # Backend kind, reported in stats
+    name = "cache"
+
+    def __init__(self, namespace: str, ttl: float):
+        """
+        Initialize backend
+
+        Args:
+            namespace: Name of this cache; keeps its keys apart on shared backends
+            ttl: Default time to live in seconds
+        """
+        self.namespace = namespace
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    @abstractmethod
+    async def _get_many(self, keys: list[str]) -> dict[str, Any]:
+        """Fetch the live entries among keys"""
+
+    @abstractmethod
+    async def _set_many(self, items: dict[str, Any], ttl: float) -> None:
+        """Store entries expiring after ttl seconds"""
+
+    @abstractmethod
+    async def _delete(self, key: str) -> None:
+        """Remove a key if present"""
+
+    @abstractmethod
+    async def _clear(self) -> None:
+        """Remove every entry of this cache"""
+
+    def _size(self) -> Optional[int]:
+        """Entries held, if the backend can tell cheaply"""
+        return None
+
+    def _evictions(self) -> int:
+        """Entries evicted to stay within the size bound"""
+        return 0
+
+    async def get_many(self, keys: list[str]) -> dict[str, Any]:
+        """
+        Look up several keys
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            dict: Cached values by key; missing or expired keys are omitted
+        """
+        if not keys:
+            return {}
+        try:
+            found = await self._get_many(keys)
+        except Exception as e:
+            logger.error(f"Error reading {self.namespace} cache: {e}")
+            found = {}
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a key
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None if missing or expired
+        """
+        return (await self.get_many([key])).get(key)
+
+    async def set_many(self, items: dict[str, Any], ttl: Optional[float] = None) -> None:
+        """
+        Store several values
+
+        Args:
+            items: Values by key
+            ttl: Time to live in seconds; defaults to the cache TTL
+        """
+        if not items:
+            return
+        try:
+            await self._set_many(items, self.ttl if ttl is None else ttl)
+        except Exception as e:
+            logger.error(f"Error writing {self.namespace} cache: {e}")
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store a value
+
+        Args:
+            key: Cache key
+            value: JSON-compatible value
+            ttl: Time to live in seconds; defaults to the cache TTL
+        """
+        await self.set_many({key: value}, ttl)
+
+    async def delete(self, key: str) -> None:
+        """Remove a key if present"""
+        try:
+            await self._delete(key)
+        except Exception as e:
+            logger.error(f"Error deleting from {self.namespace} cache: {e}")
+
+    async def clear(self) -> None:
+        """Remove all entries and reset counters"""
+        await self._clear()
+        self.hits = self.misses = 0
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Get cache counters for this process
+
+        Returns:
+            dict: Backend, size (None when shared), hits, misses, evictions and hit ratio
+        """
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.name,
+            "size": self._size(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self._evictions(),
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
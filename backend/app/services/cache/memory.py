@@ -0,0 +1,154 @@
+"""
+Memory Cache - Bounded in-process caches with TTL expiry and LRU eviction
+"""
+
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any, Optional
+
+from app.services.cache.base import CacheBackend
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Size-bounded cache where entries expire after a TTL
+
+    When the cache is full, the least recently used entry is evicted, so memory
+    stays capped regardless of how many distinct keys are written.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        Initialize cache
+
+        Args:
+            maxsize: Maximum number of entries kept
+            ttl: Default time to live in seconds
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get a cached value and mark it as recently used
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+
+        Returns:
+            Cached value, or default if missing or expired
+        """
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store a value, evicting least recently used entries if full
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Time to live in seconds; defaults to the cache TTL
+        """
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        """Remove a key if present"""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries and reset counters"""
+        self._data.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Get cache counters
+
+        Returns:
+            dict: Size, hits, misses, evictions and hit ratio
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class MemoryBackend(CacheBackend):
+    """
+    Per-process LRU backend
+
+    Fastest option and the default; with several workers each holds its own copy.
+    Values are kept as objects, without serialization.
+    """
+
+    name = "memory"
+
+    def __init__(self, namespace: str, maxsize: int, ttl: float):
+        """
+        Initialize backend
+
+        Args:
+            namespace: Name of this cache
+            maxsize: Maximum number of entries kept
+            ttl: Default time to live in seconds
+        """
+        super().__init__(namespace, ttl)
+        self.store = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def _get_many(self, keys: list[str]) -> dict[str, Any]:
+        found = {}
+        for key in keys:
+            value = self.store.get(key, _MISSING)
+            if value is not _MISSING:
+                found[key] = value
+        return found
+
+    async def _set_many(self, items: dict[str, Any], ttl: float) -> None:
+        for key, value in items.items():
+            self.store.set(key, value, ttl)
+
+    async def _delete(self, key: str) -> None:
+        self.store.delete(key)
+
+    async def _clear(self) -> None:
+        self.store.clear()
+
+    def _size(self) -> Optional[int]:
+        return len(self.store)
+
+    def _evictions(self) -> int:
+        return self.store.evictions
@@ -0,0 +1,236 @@
+"""
+Redis Cache - Cache shared across workers and hosts over the Redis protocol
+
+A small RESP2 client built on asyncio streams, with a bounded connection pool
+and pipelining, so no Redis package is needed. Any server speaking the Redis
+protocol works (Redis, Valkey, KeyDB, or benchmarks.fake_redis locally). When
+the server is unreachable the client fails fast for a while instead of
+stalling every request on connect timeouts.
+"""
+
+import asyncio
+import time
+from typing import Any, Optional
+from urllib.parse import unquote, urlparse
+
+from app.services.cache.base import CacheBackend, dumps, loads
+
+# Keys per SCAN step when clearing a namespace
+SCAN_COUNT = 500
+
+
+class RedisError(Exception):
+    """Error reply from the server"""
+
+
+def encode_command(*args: Any) -> bytes:
+    """
+    Encode a command as a RESP array of bulk strings
+
+    Args:
+        args: Command name and arguments; str and numbers are encoded as UTF-8 text
+
+    Returns:
+        bytes: Wire representation
+    """
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        data = arg if isinstance(arg, bytes) else str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
+
+
+async def read_reply(reader: asyncio.StreamReader) -> Any:
+    """
+    Read one RESP2 reply
+
+    Error replies are returned as RedisError instances rather than raised, so
+    every reply of a pipeline is consumed and the connection stays usable.
+    """
+    line = await reader.readline()
+    if not line.endswith(b"\r\n"):
+        raise ConnectionError("Connection closed by the Redis server")
+
+    prefix, payload = line[:1], line[1:-2]
+    if prefix == b"+":
+        return payload.decode()
+    if prefix == b"-":
+        return RedisError(payload.decode())
+    if prefix == b":":
+        return int(payload)
+    if prefix == b"$":
+        length = int(payload)
+        if length < 0:
+            return None
+        return (await reader.readexactly(length + 2))[:-2]
+    if prefix == b"*":
+        length = int(payload)
+        if length < 0:
+            return None
+        return [await read_reply(reader) for _ in range(length)]
+    raise ConnectionError(f"Unexpected reply from the Redis server: {line!r}")
+
+
+class RedisConnection:
+    """One connection sending pipelined commands"""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    async def execute_many(self, commands: list[tuple]) -> list[Any]:
+        """Send commands in one write and read their replies in order"""
+        self.writer.write(b"".join(encode_command(*command) for command in commands))
+        await self.writer.drain()
+        return [await read_reply(self.reader) for _ in commands]
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class RedisClient:
+    """Pooled Redis protocol client"""
+
+    def __init__(
+        self,
+        url: str,
+        pool_size: int = 10,
+        timeout: float = 1.0,
+        retry_interval: float = 5.0,
+    ):
+        """
+        Initialize client; connections are opened on demand
+
+        Args:
+            url: redis://[[user]:password@]host[:port][/db]
+            pool_size: Maximum concurrent connections
+            timeout: Seconds allowed for connecting and for each pipeline
+            retry_interval: Seconds to fail fast after the server was unreachable
+        """
+        parsed = urlparse(url)
+        if parsed.scheme != "redis":
+            raise ValueError(f"Unsupported Redis URL scheme: {parsed.scheme}")
+        self.host = parsed.hostname or "127.0.0.1"
+        self.port = parsed.port or 6379
+        self.username = unquote(parsed.username) if parsed.username else None
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.db = int(parsed.path.lstrip("/") or 0)
+
+        self.timeout = timeout
+        self.retry_interval = retry_interval
+        self._semaphore = asyncio.Semaphore(pool_size)
+        self._idle: list[RedisConnection] = []
+        self._down_until = 0.0
+
+    async def _connect(self) -> RedisConnection:
+        """Open and authenticate a connection"""
+        if time.monotonic() < self._down_until:
+            raise ConnectionError("Redis server unavailable, retrying later")
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port), self.timeout
+            )
+        except (OSError, asyncio.TimeoutError) as e:
+            self._down_until = time.monotonic() + self.retry_interval
+            raise ConnectionError(f"Cannot connect to Redis at {self.host}:{self.port}") from e
+
+        conn = RedisConnection(reader, writer)
+        setup = []
+        if self.password is not None:
+            auth = (self.username, self.password) if self.username else (self.password,)
+            setup.append(("AUTH", *auth))
+        if self.db:
+            setup.append(("SELECT", self.db))
+        if setup:
+            replies = await asyncio.wait_for(conn.execute_many(setup), self.timeout)
+            for reply in replies:
+                if isinstance(reply, RedisError):
+                    conn.close()
+                    raise reply
+        return conn
+
+    async def pipeline(self, commands: list[tuple]) -> list[Any]:
+        """
+        Send several commands on one connection
+
+        Args:
+            commands: Command tuples, e.g. [("SET", key, value, "PX", 1000), ("GET", key)]
+
+        Returns:
+            list: Replies in command order
+
+        Raises:
+            RedisError: If any command got an error reply
+        """
+        async with self._semaphore:
+            conn = self._idle.pop() if self._idle else await self._connect()
+            try:
+                replies = await asyncio.wait_for(conn.execute_many(commands), self.timeout)
+            except BaseException:
+                # A half-read pipeline leaves the connection out of sync
+                conn.close()
+                raise
+            self._idle.append(conn)
+
+        for reply in replies:
+            if isinstance(reply, RedisError):
+                raise reply
+        return replies
+
+    async def execute(self, *args: Any) -> Any:
+        """Send one command and return its reply"""
+        return (await self.pipeline([args]))[0]
+
+    async def close(self) -> None:
+        """Close idle connections"""
+        while self._idle:
+            conn = self._idle.pop()
+            conn.close()
+            await conn.writer.wait_closed()
+
+
+class RedisBackend(CacheBackend):
+    """Cache namespace stored as Redis keys with native expiry"""
+
+    name = "redis"
+
+    def __init__(self, client: RedisClient, namespace: str, ttl: float, prefix: str = ""):
+        """
+        Initialize backend
+
+        Args:
+            client: Shared Redis client
+            namespace: Name of this cache
+            ttl: Default time to live in seconds
+            prefix: Prepended to every key, to share a server with other apps
+        """
+        super().__init__(namespace, ttl)
+        self.client = client
+        self.key_prefix = f"{prefix}{namespace}:"
+
+    async def _get_many(self, keys: list[str]) -> dict[str, Any]:
+        values = await self.client.execute("MGET", *(self.key_prefix + key for key in keys))
+        return {key: loads(value) for key, value in zip(keys, values) if value is not None}
+
+    async def _set_many(self, items: dict[str, Any], ttl: float) -> None:
+        milliseconds = max(int(ttl * 1000), 1)
+        await self.client.pipeline(
+            [
+                ("SET", self.key_prefix + key, dumps(value), "PX", milliseconds)
+                for key, value in items.items()
+            ]
+        )
+
+    async def _delete(self, key: str) -> None:
+        await self.client.execute("DEL", self.key_prefix + key)
+
+    async def _clear(self) -> None:
+        cursor: Optional[bytes] = b"0"
+        while cursor is not None:
+            cursor, keys = await self.client.execute(
+                "SCAN", cursor, "MATCH", f"{self.key_prefix}*", "COUNT", SCAN_COUNT
+            )
+            if keys:
+                await self.client.execute("DEL", *keys)
+            if cursor == b"0":
+                cursor = None
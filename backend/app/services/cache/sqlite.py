@@ -0,0 +1,176 @@
+"""
+SQLite Cache - Cache shared by the workers on one host through a local file
+
+All workers open the same SQLite file in WAL mode, so a value fetched by one
+worker is served to the others. Putting the file on a memory-backed filesystem
+such as /dev/shm keeps it off disk entirely. Queries run in worker threads so
+the event loop never waits on file locks.
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from app.services.cache.base import CacheBackend, dumps, loads
+
+# Writes between scans for expired and excess entries
+PRUNE_EVERY = 500
+
+# Keys per SELECT, well under SQLite's bound parameter limit
+READ_BATCH_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value BLOB NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_cache_entries_expiry ON cache_entries (namespace, expires_at);
+"""
+
+
+class SQLiteStore:
+    """One SQLite file holding the entries of every cache namespace"""
+
+    def __init__(self, path: str, busy_timeout: float = 5.0):
+        """
+        Initialize store; the file and table are created on first use
+
+        Args:
+            path: Database file shared by all workers
+            busy_timeout: Seconds to wait for another worker's write lock
+        """
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+    def connection(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                self.path, timeout=self.busy_timeout, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self) -> None:
+        """Close every connection opened by the store"""
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+
+class SQLiteBackend(CacheBackend):
+    """Cache namespace stored in a SQLiteStore"""
+
+    name = "sqlite"
+
+    def __init__(self, store: SQLiteStore, namespace: str, maxsize: int, ttl: float):
+        """
+        Initialize backend
+
+        Args:
+            store: Shared SQLite store
+            namespace: Name of this cache
+            maxsize: Entries kept before the soonest-expiring are dropped
+            ttl: Default time to live in seconds
+        """
+        super().__init__(namespace, ttl)
+        self.store = store
+        self.maxsize = maxsize
+        self.evictions = 0
+        self._writes = 0
+
+    def _read(self, keys: list[str]) -> dict[str, Any]:
+        conn = self.store.connection()
+        now = time.time()
+        found = {}
+        for i in range(0, len(keys), READ_BATCH_SIZE):
+            batch = keys[i : i + READ_BATCH_SIZE]
+            rows = conn.execute(
+                f"SELECT key, value FROM cache_entries WHERE namespace = ? "
+                f"AND key IN ({','.join('?' * len(batch))}) AND expires_at > ?",
+                (self.namespace, *batch, now),
+            )
+            found.update((key, loads(value)) for key, value in rows)
+        return found
+
+    def _write(self, items: dict[str, Any], ttl: float) -> None:
+        expires_at = time.time() + ttl
+        rows = [(self.namespace, key, dumps(value), expires_at) for key, value in items.items()]
+        conn = self.store.connection()
+        # One transaction per batch; IMMEDIATE takes the write lock up front
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO cache_entries (namespace, key, value, expires_at) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        self._writes += len(items)
+        if self._writes >= PRUNE_EVERY:
+            self._writes = 0
+            self._prune(conn)
+
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        """Drop expired entries, then the soonest-expiring ones beyond maxsize"""
+        conn.execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND expires_at <= ?",
+            (self.namespace, time.time()),
+        )
+        (count,) = conn.execute(
+            "SELECT COUNT(*) FROM cache_entries WHERE namespace = ?", (self.namespace,)
+        ).fetchone()
+        excess = count - self.maxsize
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key IN ("
+                "SELECT key FROM cache_entries WHERE namespace = ? ORDER BY expires_at LIMIT ?)",
+                (self.namespace, self.namespace, excess),
+            )
+            self.evictions += excess
+
+    def _remove(self, key: Optional[str]) -> None:
+        if key is None:
+            self.store.connection().execute(
+                "DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,)
+            )
+        else:
+            self.store.connection().execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key = ?", (self.namespace, key)
+            )
+
+    async def _get_many(self, keys: list[str]) -> dict[str, Any]:
+        return await asyncio.to_thread(self._read, keys)
+
+    async def _set_many(self, items: dict[str, Any], ttl: float) -> None:
+        await asyncio.to_thread(self._write, items, ttl)
+
+    async def _delete(self, key: str) -> None:
+        await asyncio.to_thread(self._remove, key)
+
+    async def _clear(self) -> None:
+        await asyncio.to_thread(self._remove, None)
+
+    def _evictions(self) -> int:
+        return self.evictions
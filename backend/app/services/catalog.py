@@ -0,0 +1,158 @@
+"""
+Catalog Cache - Cross-user cache for Spotify catalog entities
+
+Tracks, artists and audio features are the same for every user, so they are
+cached once for the whole deployment: a fast tier on the configured cache
+backend in front of a persistent database tier that survives restarts.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Optional
+
+from sqlalchemy import select
+
+from app.config import settings
+from app.database import SessionLocal, dialect_insert
+from app.models.catalog import CatalogEntry
+from app.services.cache import CacheBackend, cache_key, create_cache
+
+logger = logging.getLogger(__name__)
+
+# IDs per SELECT, well under the bound parameter limits of SQLite and Postgres
+LOAD_BATCH_SIZE = 500
+
+
+class CatalogCache:
+    """Two-tier (cache backend + database) cache keyed by (kind, spotify_id)"""
+
+    def __init__(self, cache: CacheBackend, ttl: float):
+        """
+        Initialize catalog cache
+
+        Args:
+            cache: Fast tier
+            ttl: Seconds before a persisted entry is considered stale
+        """
+        self.cache = cache
+        self.ttl = ttl
+        self.db_hits = 0
+        self.db_misses = 0
+
+    def _load(self, kind: str, ids: list[str]) -> dict[str, Any]:
+        """Read fresh entries from the database tier"""
+        cutoff = time.time() - self.ttl
+        found = {}
+        with SessionLocal() as db:
+            for i in range(0, len(ids), LOAD_BATCH_SIZE):
+                rows = db.execute(
+                    select(CatalogEntry.spotify_id, CatalogEntry.data).where(
+                        CatalogEntry.kind == kind,
+                        CatalogEntry.spotify_id.in_(ids[i : i + LOAD_BATCH_SIZE]),
+                        CatalogEntry.fetched_at > cutoff,
+                    )
+                )
+                found.update((spotify_id, json.loads(data)) for spotify_id, data in rows)
+        return found
+
+    def _store(self, kind: str, items: dict[str, Any]) -> None:
+        """Upsert entries into the database tier"""
+        now = time.time()
+        stmt = dialect_insert(CatalogEntry.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["kind", "spotify_id"],
+            set_={"data": stmt.excluded.data, "fetched_at": stmt.excluded.fetched_at},
+        )
+        with SessionLocal() as db:
+            db.execute(
+                stmt,
+                [
+                    {"kind": kind, "spotify_id": key, "data": json.dumps(value), "fetched_at": now}
+                    for key, value in items.items()
+                ],
+            )
+            db.commit()
+
+    async def get_many(self, kind: str, ids: list[str]) -> dict[str, Any]:
+        """
+        Look up several entities, checking the fast tier first and then the database
+
+        Args:
+            kind: Entity kind (track, artist, audio_features)
+            ids: Spotify IDs to look up
+
+        Returns:
+            dict: Cached entities by Spotify ID; missing IDs are omitted
+        """
+        keys = {spotify_id: cache_key(kind, spotify_id) for spotify_id in ids}
+        cached = await self.cache.get_many(list(keys.values()))
+        found: dict[str, Any] = {}
+        missing: list[str] = []
+        for spotify_id, key in keys.items():
+            value = cached.get(key)
+            if value is None:
+                missing.append(spotify_id)
+            else:
+                found[spotify_id] = value
+
+        if missing:
+            try:
+                loaded = await asyncio.to_thread(self._load, kind, missing)
+            except Exception as e:
+                logger.error(f"Error reading catalog cache: {e}")
+                loaded = {}
+
+            self.db_hits += len(loaded)
+            self.db_misses += len(missing) - len(loaded)
+            await self.cache.set_many(
+                {cache_key(kind, spotify_id): value for spotify_id, value in loaded.items()}
+            )
+            found.update(loaded)
+
+        return found
+
+    async def get(self, kind: str, spotify_id: str) -> Optional[Any]:
+        """Look up a single entity; returns None on a miss"""
+        return (await self.get_many(kind, [spotify_id])).get(spotify_id)
+
+    async def set_many(self, kind: str, items: dict[str, Any]) -> None:
+        """
+        Store several entities in both tiers
+
+        Args:
+            kind: Entity kind (track, artist, audio_features)
+            items: Entities by Spotify ID
+        """
+        if not items:
+            return
+
+        await self.cache.set_many(
+            {cache_key(kind, spotify_id): value for spotify_id, value in items.items()}
+        )
+
+        try:
+            await asyncio.to_thread(self._store, kind, items)
+        except Exception as e:
+            # The fast tier still holds the data, so a failed write is not fatal
+            logger.error(f"Error writing catalog cache: {e}")
+
+    async def set(self, kind: str, spotify_id: str, value: Any) -> None:
+        """Store a single entity in both tiers"""
+        await self.set_many(kind, {spotify_id: value})
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Get counters for both tiers
+
+        Returns:
+            dict: Fast tier stats plus database hits and misses
+        """
+        return {**self.cache.stats(), "db_hits": self.db_hits, "db_misses": self.db_misses}
+
+
+catalog_cache = CatalogCache(
+    cache=create_cache("catalog", settings.catalog_cache_max_entries, settings.catalog_cache_ttl),
+    ttl=settings.catalog_cache_ttl,
+)
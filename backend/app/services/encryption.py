@@ -0,0 +1,63 @@
+"""
+Encryption - Symmetric encryption of secrets stored at rest
+
+Values are encrypted with Fernet (AES-128-CBC with HMAC-SHA256) under a key
+derived from settings.secret_key, so changing the secret key makes stored
+values unreadable. cryptography is imported on first use to keep it off the
+startup path.
+"""
+
+import base64
+from functools import cache
+from typing import TYPE_CHECKING
+
+from app.config import settings
+
+if TYPE_CHECKING:
+    from cryptography.fernet import Fernet
+
+# Binds the derived key to this use, so it differs from keys derived elsewhere
+KEY_INFO = b"early-wrapped:stored-secrets:v1"
+
+
+@cache
+def _fernet() -> "Fernet":
+    """Build the cipher from the application secret key"""
+    from cryptography.fernet import Fernet
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+    key = HKDF(algorithm=hashes.SHA256(), length=32, salt=None, info=KEY_INFO).derive(
+        settings.secret_key.encode()
+    )
+    return Fernet(base64.urlsafe_b64encode(key))
+
+
+def encrypt(value: str) -> str:
+    """
+    Encrypt a string
+
+    Args:
+        value: Plain text
+
+    Returns:
+        str: URL-safe Fernet token
+    """
+    return _fernet().encrypt(value.encode()).decode()
+
+
+def decrypt(token: str) -> str:
+    """
+    Decrypt a string produced by encrypt
+
+    Args:
+        token: Fernet token
+
+    Returns:
+        str: Plain text
+
+    Raises:
+        cryptography.fernet.InvalidToken: If the token is malformed or was
+            encrypted under another key
+    """
+    return _fernet().decrypt(token.encode()).decode()
@@ -0,0 +1,201 @@
+"""
+Listening History Service - Incremental sync of recently played tracks
+
+Spotify only keeps a user's last 50 plays, so each sync stores new plays in the
+plays table. A per-user high-water mark is passed as the `after` cursor, so each
+sync is one incremental call that returns only unseen plays.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import case, select
+
+from app.database import SessionLocal, dialect_insert
+from app.models.history import Play, SyncState
+from app.services.rollups import apply_rollups
+from app.services.spotify_async import AsyncSpotifyService
+
+logger = logging.getLogger(__name__)
+
+# Safety bound on cursor pages followed in a single sync
+MAX_SYNC_PAGES = 10
+
+
+def parse_played_at(value: str) -> int:
+    """
+    Convert Spotify's ISO 8601 played_at timestamp to Unix milliseconds
+
+    Args:
+        value: Timestamp such as 2024-05-01T18:30:12.345Z
+
+    Returns:
+        int: Unix timestamp in milliseconds
+    """
+    return int(datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp() * 1000)
+
+
+def play_row(user_id: str, item: dict[str, Any]) -> dict[str, Any]:
+    """
+    Flatten a recently played item into a plays table row
+
+    Args:
+        user_id: Spotify user ID
+        item: Item from the recently played endpoint
+
+    Returns:
+        dict: Column values for Play
+    """
+    track = item["track"]
+    artist = (track.get("artists") or [{}])[0]
+    context = item.get("context") or {}
+    return {
+        "user_id": user_id,
+        "played_at": parse_played_at(item["played_at"]),
+        "track_id": track["id"],
+        "track_name": track.get("name", ""),
+        "artist_id": artist.get("id"),
+        "artist_name": artist.get("name"),
+        "album_id": (track.get("album") or {}).get("id"),
+        "duration_ms": track.get("duration_ms", 0),
+        "context_uri": context.get("uri"),
+    }
+
+
+def get_cursor(user_id: str) -> int:
+    """
+    Get the user's high-water mark
+
+    Args:
+        user_id: Spotify user ID
+
+    Returns:
+        int: played_at of the newest stored play in Unix ms, or 0 if never synced
+    """
+    with SessionLocal() as db:
+        cursor = db.scalar(select(SyncState.last_played_at).where(SyncState.user_id == user_id))
+    return cursor or 0
+
+
+def store_plays(user_id: str, rows: list[dict[str, Any]]) -> int:
+    """
+    Bulk-insert plays, update rollups and advance the cursor in one transaction
+
+    Plays already stored (e.g. by a concurrent sync) are skipped by the insert
+    itself, and only the rows it returns are added to the rollups, so each play
+    is counted once.
+
+    Args:
+        user_id: Spotify user ID
+        rows: Play rows, all newer than the current cursor
+
+    Returns:
+        int: Number of plays inserted
+    """
+    now = time.time()
+    inserted: list[dict[str, Any]] = []
+
+    with SessionLocal() as db:
+        if rows:
+            stmt = (
+                dialect_insert(Play.__table__)
+                .on_conflict_do_nothing(index_elements=["user_id", "played_at"])
+                .returning(Play.played_at, Play.track_id, Play.artist_id, Play.duration_ms)
+            )
+            inserted = [dict(row) for row in db.execute(stmt, rows).mappings()]
+            apply_rollups(db, user_id, inserted)
+
+        cursor = max((row["played_at"] for row in rows), default=0)
+        state = dialect_insert(SyncState.__table__).values(
+            user_id=user_id, last_played_at=cursor, last_synced_at=now
+        )
+        state = state.on_conflict_do_update(
+            index_elements=["user_id"],
+            set_={
+                "last_synced_at": now,
+                "last_played_at": _greatest(
+                    SyncState.last_played_at, state.excluded.last_played_at
+                ),
+            },
+        )
+        db.execute(state)
+        db.commit()
+    return len(inserted)
+
+
+def _greatest(current, candidate):
+    """SQL expression for the larger of two cursor values"""
+    return case((candidate > current, candidate), else_=current)
+
+
+async def sync_recently_played(
+    spotify: AsyncSpotifyService, user_id: Optional[str] = None
+) -> dict[str, Any]:
+    """
+    Fetch plays newer than the user's high-water mark and store them
+
+    Args:
+        spotify: Spotify service authorized as the user
+        user_id: Spotify user ID; resolved from the token if omitted
+
+    Returns:
+        dict: User ID, plays fetched and inserted, and the new cursor
+    """
+    user_id = user_id or await spotify.get_user_id()
+    cursor = await asyncio.to_thread(get_cursor, user_id)
+
+    rows: list[dict[str, Any]] = []
+    after = cursor
+    for _ in range(MAX_SYNC_PAGES):
+        page = await spotify.get_recently_played(limit=50, after=after or None)
+        rows.extend(play_row(user_id, item) for item in page.get("items", []) if item.get("track"))
+
+        next_after = (page.get("cursors") or {}).get("after")
+        if not page.get("next") or not next_after or int(next_after) <= after:
+            break
+        after = int(next_after)
+
+    rows = [row for row in rows if row["played_at"] > cursor]
+    inserted = await asyncio.to_thread(store_plays, user_id, rows)
+
+    new_cursor = max([cursor, *(row["played_at"] for row in rows)])
+    logger.info(f"Synced {inserted} new plays for user {user_id}")
+    return {"user_id": user_id, "fetched": len(rows), "inserted": inserted, "cursor": new_cursor}
+
+
+def get_plays(user_id: str, limit: int = 50, before: Optional[int] = None) -> list[dict[str, Any]]:
+    """
+    Read stored plays, newest first
+
+    Args:
+        user_id: Spotify user ID
+        limit: Maximum plays to return
+        before: Only return plays before this Unix ms timestamp
+
+    Returns:
+        list: Plays as dictionaries
+    """
+    query = select(Play).where(Play.user_id == user_id)
+    if before is not None:
+        query = query.where(Play.played_at < before)
+    query = query.order_by(Play.played_at.desc()).limit(limit)
+
+    with SessionLocal() as db:
+        plays = db.scalars(query).all()
+
+    return [
+        {
+            "played_at": play.played_at,
+            "track_id": play.track_id,
+            "track_name": play.track_name,
+            "artist_id": play.artist_id,
+            "artist_name": play.artist_name,
+            "album_id": play.album_id,
+            "duration_ms": play.duration_ms,
+            "context_uri": play.context_uri,
+        }
+        for play in plays
+    ]
@@ -0,0 +1,70 @@
+"""
+HTTP Transport - Process-wide pooled httpx client shared by all Spotify calls
+"""
+
+import importlib.util
+import logging
+from typing import Optional
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def http2_available() -> bool:
+    """Check whether h2, which httpx needs for HTTP/2, is installed"""
+    return importlib.util.find_spec("h2") is not None
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """
+    Build a keep-alive connection pool configured from settings
+
+    Returns:
+        httpx.AsyncClient: Client without credentials; tokens are sent per request
+    """
+    http2 = settings.spotify_http2 and http2_available()
+    if settings.spotify_http2 and not http2:
+        logger.warning(
+            "h2 package not installed (install httpx[http2]), using HTTP/1.1 for Spotify"
+        )
+
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=settings.spotify_http_max_connections,
+            max_keepalive_connections=settings.spotify_http_max_keepalive_connections,
+            keepalive_expiry=settings.spotify_http_keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(
+            settings.spotify_http_timeout,
+            connect=settings.spotify_http_connect_timeout,
+        ),
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared HTTP client, creating it on first use
+
+    Returns:
+        httpx.AsyncClient: Shared client
+    """
+    global _client
+
+    if _client is None or _client.is_closed:
+        _client = create_http_client()
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client and its pooled connections"""
+    global _client
+
+    if _client is not None:
+        await _client.aclose()
+        _client = None
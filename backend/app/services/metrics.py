@@ -0,0 +1,276 @@
+"""
+Metrics - Low-overhead counters, gauges and histograms in Prometheus text format
+
+Instruments keep plain Python numbers keyed by label values, so recording a
+sample on the request path is a dict lookup and an addition. Values owned by
+other components (cache and scheduler counters) are read at scrape time by
+collectors instead of being mirrored on every operation.
+"""
+
+import math
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Sequence
+from typing import Optional
+
+# Latency buckets in seconds, from cache hits to slow paginated upstream calls
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = tuple[str, ...]
+Sample = tuple[str, dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    """Render a label set as {name="value",...}"""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, int) or value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class Metric(ABC):
+    """Named instrument with a fixed set of label names"""
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """
+        Initialize metric
+
+        Args:
+            name: Metric name
+            documentation: HELP text
+            labelnames: Names of the labels every sample carries
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _labels(self, values: LabelValues) -> dict[str, str]:
+        return dict(zip(self.labelnames, values))
+
+    @abstractmethod
+    def samples(self) -> Iterable[Sample]:
+        """Current samples as (name, labels, value)"""
+
+
+class Counter(Metric):
+    """Monotonically increasing count"""
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        """
+        Increment the counter for a label set
+
+        Args:
+            labels: Label values, in labelnames order
+            amount: Increment
+        """
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self) -> Iterable[Sample]:
+        for labels, value in self._values.items():
+            yield self.name, self._labels(labels), value
+
+
+class Gauge(Metric):
+    """Value that can go up and down"""
+
+    type = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) - amount
+
+    def set(self, value: float, *labels: str) -> None:
+        self._values[labels] = value
+
+    def samples(self) -> Iterable[Sample]:
+        for labels, value in self._values.items():
+            yield self.name, self._labels(labels), value
+
+
+class Histogram(Metric):
+    """Distribution of observations in fixed cumulative buckets"""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        """
+        Initialize histogram
+
+        Args:
+            name: Metric name
+            documentation: HELP text
+            labelnames: Names of the labels every sample carries
+            buckets: Upper bounds of the buckets, ascending; +Inf is implied
+        """
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket (non-cumulative) ..., +Inf count, sum]
+        self._values: dict[LabelValues, list[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        """
+        Record an observation
+
+        Args:
+            value: Observed value, e.g. seconds
+            labels: Label values, in labelnames order
+        """
+        counts = self._values.get(labels)
+        if counts is None:
+            counts = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def samples(self) -> Iterable[Sample]:
+        for labels, counts in self._values.items():
+            label_dict = self._labels(labels)
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                yield f"{self.name}_bucket", {**label_dict, "le": _format_value(bound)}, cumulative
+            yield f"{self.name}_count", label_dict, cumulative
+            yield f"{self.name}_sum", label_dict, counts[-1]
+
+
+class CollectedMetric(Metric):
+    """Metric whose samples are produced on demand by a collector"""
+
+    def __init__(self, name: str, documentation: str, type: str, samples: Iterable[Sample]):
+        super().__init__(name, documentation)
+        self.type = type
+        self._samples = samples
+
+    def samples(self) -> Iterable[Sample]:
+        return self._samples
+
+
+Collector = Callable[[], Iterable[CollectedMetric]]
+
+
+class MetricsRegistry:
+    """Holds instruments and collectors and renders them for scraping"""
+
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+        self._collectors: list[Collector] = []
+
+    def register(self, metric: Metric) -> Metric:
+        """Add an instrument; names must be unique"""
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def add_collector(self, collector: Collector) -> Collector:
+        """
+        Register a function returning metrics read from another component at scrape time
+
+        Usable as a decorator.
+        """
+        self._collectors.append(collector)
+        return collector
+
+    def render(self, metrics: Optional[Iterable[Metric]] = None) -> str:
+        """
+        Render metrics in the Prometheus text exposition format (version 0.0.4)
+
+        Args:
+            metrics: Metrics to render; defaults to every instrument and collector
+
+        Returns:
+            str: Exposition text
+        """
+        if metrics is None:
+            metrics = [*self._metrics.values()]
+            for collector in self._collectors:
+                metrics.extend(collector())
+
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+# HTTP server
+http_requests = registry.counter(
+    "http_requests_total", "HTTP requests handled", ("method", "route", "status")
+)
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency until the response completed",
+    ("method", "route"),
+)
+http_requests_in_flight = registry.gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled"
+)
+
+# Spotify Web API, labelled by AsyncSpotifyService method
+spotify_request_duration = registry.histogram(
+    "spotify_request_duration_seconds",
+    "Spotify Web API call latency including rate-limit queueing and retries",
+    ("method",),
+)
+spotify_responses = registry.counter(
+    "spotify_responses_total",
+    "Spotify Web API responses received, per attempt",
+    ("method", "status"),
+)
+spotify_request_errors = registry.counter(
+    "spotify_request_errors_total",
+    "Spotify Web API calls that failed after retries, by final status or 'transport'",
+    ("method", "status"),
+)
+spotify_requests_in_flight = registry.gauge(
+    "spotify_requests_in_flight", "Spotify Web API calls currently in progress"
+)
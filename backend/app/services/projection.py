@@ -0,0 +1,108 @@
+"""
+Projection - Slim Spotify objects down to the fields a client needs
+
+Field lists use dotted paths such as "id,name,album.name,artists.name". A path
+into a list applies to every element, so "artists.name" keeps the name of each
+artist.
+"""
+
+from typing import Any, Optional
+
+# Nested field selection: field name -> sub-selection, or None to keep the value whole
+Fields = dict[str, Optional["Fields"]]
+
+# Fields Spotify includes on tracks and albums that no client renders. Market
+# lists alone are about 180 country codes per object.
+DROPPED_FIELDS = frozenset({"available_markets"})
+
+
+def parse_fields(fields: str) -> Fields:
+    """
+    Parse a comma separated list of dotted field paths
+
+    Args:
+        fields: Field paths such as "id,name,album.images"
+
+    Returns:
+        Fields: Nested selection
+
+    Raises:
+        ValueError: If the list contains no field names
+    """
+    selection: Fields = {}
+    for path in fields.split(","):
+        names = [name.strip() for name in path.split(".")]
+        if not all(names):
+            continue
+
+        node = selection
+        for name in names[:-1]:
+            # An existing whole-value selection wins over a narrower one
+            if name in node and node[name] is None:
+                break
+            node = node.setdefault(name, {})
+        else:
+            node[names[-1]] = None
+
+    if not selection:
+        raise ValueError("No fields selected")
+    return selection
+
+
+def prefixed(prefix: str, fields: str) -> str:
+    """Nest a field list under a parent field, e.g. track fields inside a play item"""
+    return ",".join(f"{prefix}.{field}" for field in fields.split(","))
+
+
+def project(value: Any, selection: Optional[Fields]) -> Any:
+    """
+    Keep only the selected fields of an object or of every object in a list
+
+    Args:
+        value: Decoded JSON value
+        selection: Nested selection; None keeps the value unchanged
+
+    Returns:
+        Projected copy of the value
+    """
+    if selection is None:
+        return value
+    if isinstance(value, list):
+        return [project(item, selection) for item in value]
+    if isinstance(value, dict):
+        return {name: project(value[name], sub) for name, sub in selection.items() if name in value}
+    return value
+
+
+def slim(value: Any) -> Any:
+    """
+    Recursively drop fields in DROPPED_FIELDS
+
+    Applied to upstream responses before they are cached, so cache entries
+    never hold market lists.
+
+    Args:
+        value: Decoded JSON value
+
+    Returns:
+        Copy of the value without dropped fields
+    """
+    if isinstance(value, list):
+        return [slim(item) for item in value]
+    if isinstance(value, dict):
+        return {name: slim(item) for name, item in value.items() if name not in DROPPED_FIELDS}
+    return value
+
+
+# Compact views: what the dashboard renders for each kind of object
+TRACK_FIELDS = (
+    "id,name,uri,duration_ms,explicit,popularity,preview_url,external_urls,"
+    "artists.id,artists.name,album.id,album.name,album.images,album.release_date"
+)
+ARTIST_FIELDS = "id,name,uri,genres,images,popularity,followers.total,external_urls"
+PLAYLIST_FIELDS = (
+    "id,name,uri,description,images,public,collaborative,external_urls,"
+    "owner.id,owner.display_name,tracks.total"
+)
+PLAY_FIELDS = "played_at,context.type,context.uri," + prefixed("track", TRACK_FIELDS)
+SAVED_TRACK_FIELDS = "added_at," + prefixed("track", TRACK_FIELDS)
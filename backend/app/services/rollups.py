@@ -0,0 +1,198 @@
+"""
+Rollup Service - Maintain and query per-user daily aggregates
+
+Rollups are updated in the same transaction that ingests plays, so analytics
+over any date range sum a handful of rollup rows instead of scanning history.
+"""
+
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Any
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal, dialect_insert
+from app.models.rollups import ArtistRollup, DailyRollup, TrackRollup
+
+MS_PER_DAY = 24 * 60 * 60 * 1000
+EPOCH = date(1970, 1, 1)
+
+
+def day_number(played_at: int) -> int:
+    """Convert a Unix ms timestamp to a UTC day number"""
+    return played_at // MS_PER_DAY
+
+
+def day_to_date(day: int) -> date:
+    """Convert a UTC day number to a date"""
+    return EPOCH + timedelta(days=day)
+
+
+def date_to_day(value: date) -> int:
+    """Convert a date to a UTC day number"""
+    return (value - EPOCH).days
+
+
+def _increment(db: Session, model, key_columns: list[str], counts: dict[tuple, list[int]]) -> None:
+    """Upsert rollup rows, adding to existing counts"""
+    if not counts:
+        return
+
+    stmt = dialect_insert(model.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=key_columns,
+        set_={
+            "plays": model.plays + stmt.excluded.plays,
+            "ms_played": model.ms_played + stmt.excluded.ms_played,
+        },
+    )
+    db.execute(
+        stmt,
+        [
+            {**dict(zip(key_columns, key)), "plays": plays, "ms_played": ms_played}
+            for key, (plays, ms_played) in counts.items()
+        ],
+    )
+
+
+def apply_rollups(db: Session, user_id: str, rows: list[dict[str, Any]]) -> None:
+    """
+    Add newly ingested plays to the rollup tables
+
+    Must be called in the transaction that inserts the plays, and only with
+    plays that were actually inserted.
+
+    Args:
+        db: Session holding the ingest transaction
+        user_id: Spotify user ID
+        rows: Newly inserted play rows
+    """
+    daily: dict[tuple, list[int]] = defaultdict(lambda: [0, 0])
+    tracks: dict[tuple, list[int]] = defaultdict(lambda: [0, 0])
+    artists: dict[tuple, list[int]] = defaultdict(lambda: [0, 0])
+
+    for row in rows:
+        day = day_number(row["played_at"])
+        keys = [(daily, (user_id, day)), (tracks, (user_id, day, row["track_id"]))]
+        if row["artist_id"]:
+            keys.append((artists, (user_id, day, row["artist_id"])))
+
+        for counts, key in keys:
+            counts[key][0] += 1
+            counts[key][1] += row["duration_ms"]
+
+    _increment(db, DailyRollup, ["user_id", "day"], daily)
+    _increment(db, TrackRollup, ["user_id", "day", "track_id"], tracks)
+    _increment(db, ArtistRollup, ["user_id", "day", "artist_id"], artists)
+
+
+def _top(db: Session, model, id_column, user_id: str, start: int, end: int, limit: int):
+    """Sum a per-entity rollup over a day range and return the top entities"""
+    plays = func.sum(model.plays).label("plays")
+    rows = db.execute(
+        select(id_column, plays, func.sum(model.ms_played).label("ms_played"))
+        .where(model.user_id == user_id, model.day >= start, model.day < end)
+        .group_by(id_column)
+        .order_by(plays.desc())
+        .limit(limit)
+    ).all()
+    return [{"id": row[0], "plays": int(row[1]), "ms_played": int(row[2])} for row in rows]
+
+
+def artist_play_counts(user_id: str, start: date, end: date, limit: int) -> list[dict[str, Any]]:
+    """
+    Get the most played artists between two dates from rollups
+
+    Args:
+        user_id: Spotify user ID
+        start: First day included (UTC)
+        end: First day excluded (UTC)
+        limit: Maximum number of artists
+
+    Returns:
+        list: Artist IDs with plays and ms played, most played first
+    """
+    with SessionLocal() as db:
+        return _top(
+            db,
+            ArtistRollup,
+            ArtistRollup.artist_id,
+            user_id,
+            date_to_day(start),
+            date_to_day(end),
+            limit,
+        )
+
+
+def track_play_counts(user_id: str, start: date, end: date, limit: int) -> list[dict[str, Any]]:
+    """
+    Get the most played tracks between two dates from rollups
+
+    Args:
+        user_id: Spotify user ID
+        start: First day included (UTC)
+        end: First day excluded (UTC)
+        limit: Maximum number of tracks
+
+    Returns:
+        list: Track IDs with plays and ms played, most played first
+    """
+    with SessionLocal() as db:
+        return _top(
+            db,
+            TrackRollup,
+            TrackRollup.track_id,
+            user_id,
+            date_to_day(start),
+            date_to_day(end),
+            limit,
+        )
+
+
+def range_totals(user_id: str, start: date, end: date, limit: int = 10) -> dict[str, Any]:
+    """
+    Summarize listening between two dates from rollups
+
+    Args:
+        user_id: Spotify user ID
+        start: First day included (UTC)
+        end: First day excluded (UTC)
+        limit: Number of top tracks and artists to return
+
+    Returns:
+        dict: Totals, per-day series and top tracks and artists
+    """
+    start_day, end_day = date_to_day(start), date_to_day(end)
+
+    with SessionLocal() as db:
+        days = db.execute(
+            select(DailyRollup.day, DailyRollup.plays, DailyRollup.ms_played)
+            .where(
+                DailyRollup.user_id == user_id,
+                DailyRollup.day >= start_day,
+                DailyRollup.day < end_day,
+            )
+            .order_by(DailyRollup.day)
+        ).all()
+        top_tracks = _top(db, TrackRollup, TrackRollup.track_id, user_id, start_day, end_day, limit)
+        top_artists = _top(
+            db, ArtistRollup, ArtistRollup.artist_id, user_id, start_day, end_day, limit
+        )
+
+    return {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "total_plays": sum(row.plays for row in days),
+        "total_ms_played": sum(row.ms_played for row in days),
+        "daily": [
+            {
+                "date": day_to_date(row.day).isoformat(),
+                "plays": row.plays,
+                "ms_played": row.ms_played,
+            }
+            for row in days
+        ],
+        "top_tracks": top_tracks,
+        "top_artists": top_artists,
+    }
@@ -0,0 +1,235 @@
+"""
+Upstream Scheduler - Rate-limit-aware dispatch of all Spotify Web API traffic
+
+Every user shares the app's Spotify rate-limit budget, so requests pass through
+one app-wide token bucket. Interactive requests are dispatched ahead of
+background work, a 429 pauses all traffic for its Retry-After period, and
+transient failures are retried with jittered exponential backoff.
+"""
+
+import asyncio
+import heapq
+import logging
+import math
+import random
+import time
+from collections.abc import Awaitable, Callable
+from enum import IntEnum
+from typing import Any, Optional
+
+import httpx
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def _parse_retry_after(response: httpx.Response) -> float:
+    """Read Retry-After in seconds, defaulting to one second if missing or malformed"""
+    try:
+        return max(float(response.headers.get("Retry-After", 1)), 0.0)
+    except ValueError:
+        return 1.0
+
+
+class Priority(IntEnum):
+    """Dispatch priority; lower values are served first"""
+
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+class UpstreamScheduler:
+    """Token bucket with priority queueing, Retry-After handling and retries"""
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        max_retries: int,
+        backoff: float,
+        max_backoff: float,
+        max_retry_after: float,
+    ):
+        """
+        Initialize scheduler
+
+        Args:
+            rate: Requests per second allowed on average
+            burst: Bucket capacity (requests that may be sent back to back)
+            max_retries: Retries per request for 429/5xx/transport errors
+            backoff: Base delay in seconds for exponential backoff
+            max_backoff: Upper bound for a single backoff delay
+            max_retry_after: Longest Retry-After honored before giving up
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._sequence = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+        self.throttled = 0
+        self.retries = 0
+        self._delays: dict[Priority, list[float]] = {p: [0, 0.0, 0.0] for p in Priority}
+
+    def _refill(self, now: float) -> None:
+        """Add tokens accrued since the last refill"""
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _dispatch(self) -> None:
+        """Release waiters while tokens are available, then schedule the next wake-up"""
+        self._timer = None
+        now = time.monotonic()
+        self._refill(now)
+
+        while self._waiters and now >= self._paused_until and self._tokens >= 1:
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():  # Waiter was cancelled
+                continue
+            self._tokens -= 1
+            future.set_result(None)
+
+        # Drop cancelled waiters at the head so they do not keep a timer alive
+        while self._waiters and self._waiters[0][2].done():
+            heapq.heappop(self._waiters)
+
+        if self._waiters:
+            wait = max(self._paused_until - now, (1 - self._tokens) / self.rate, 0.0)
+            self._timer = asyncio.get_running_loop().call_later(wait, self._dispatch)
+
+    async def acquire(self, priority: Priority = Priority.INTERACTIVE) -> None:
+        """
+        Wait for a token, letting higher-priority waiters go first
+
+        Args:
+            priority: Dispatch priority of the request
+        """
+        enqueued = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        self._sequence += 1
+        heapq.heappush(self._waiters, (priority, self._sequence, future))
+
+        if self._timer is None:
+            self._dispatch()
+        await future
+
+        stats = self._delays[priority]
+        delay = time.monotonic() - enqueued
+        stats[0] += 1
+        stats[1] += delay
+        stats[2] = max(stats[2], delay)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Stop dispatching all requests for a period, e.g. after a 429
+
+        Args:
+            seconds: Pause length
+        """
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._waiters:
+            self._dispatch()
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with full jitter"""
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+
+    async def send(
+        self,
+        request: Callable[[], Awaitable[httpx.Response]],
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> httpx.Response:
+        """
+        Send a request through the scheduler, retrying transient failures
+
+        Args:
+            request: Zero-argument coroutine function sending the request
+            priority: Dispatch priority of the request
+
+        Returns:
+            httpx.Response: Final response; may still be an error once retries run out
+        """
+        attempt = 0
+        while True:
+            # During a long pause, fail interactive requests fast instead of queueing them
+            paused_for = self._paused_until - time.monotonic()
+            if priority == Priority.INTERACTIVE and paused_for > self.max_retry_after:
+                self.throttled += 1
+                return httpx.Response(429, headers={"Retry-After": str(math.ceil(paused_for))})
+
+            await self.acquire(priority)
+            try:
+                response = await request()
+            except httpx.TransportError as e:
+                if attempt >= self.max_retries:
+                    raise
+                logger.warning(f"Spotify request failed ({e!r}), retrying")
+            else:
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    return response
+
+                if response.status_code == 429:
+                    self.throttled += 1
+                    retry_after = _parse_retry_after(response)
+                    self.pause(retry_after)
+                    if retry_after > self.max_retry_after or attempt >= self.max_retries:
+                        return response
+                    logger.warning(f"Spotify rate limit hit, pausing for {retry_after}s")
+                    # Jitter spreads the retries of all paused requests after the wait
+                    await asyncio.sleep(random.uniform(0, self.backoff))
+                    attempt += 1
+                    self.retries += 1
+                    continue
+
+                if attempt >= self.max_retries:
+                    return response
+
+            await asyncio.sleep(self._backoff_delay(attempt))
+            attempt += 1
+            self.retries += 1
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Get scheduler counters
+
+        Returns:
+            dict: Queue length, 429 and retry counts, and queueing delay per priority
+        """
+        return {
+            "waiting": sum(1 for _, _, future in self._waiters if not future.done()),
+            "paused_for": max(self._paused_until - time.monotonic(), 0.0),
+            "throttled": self.throttled,
+            "retries": self.retries,
+            "queue_delay": {
+                priority.name.lower(): {
+                    "count": count,
+                    "avg_ms": total / count * 1000 if count else 0.0,
+                    "max_ms": peak * 1000,
+                }
+                for priority, (count, total, peak) in self._delays.items()
+            },
+        }
+
+
+scheduler = UpstreamScheduler(
+    rate=settings.spotify_rate_limit_per_second,
+    burst=settings.spotify_rate_limit_burst,
+    max_retries=settings.spotify_max_retries,
+    backoff=settings.spotify_retry_backoff,
+    max_backoff=settings.spotify_retry_max_backoff,
+    max_retry_after=settings.spotify_max_retry_after,
+)
@@ -0,0 +1,70 @@
+"""
+Single Flight - Coalesce identical concurrent calls into one upstream request
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Share one in-flight call among all concurrent callers with the same key
+
+    The first caller for a key starts the call; callers arriving while it is in
+    flight await the same task and receive its result or exception. Once the
+    call finishes the key is released, so later calls go upstream again.
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run fn once for all concurrent callers with the same key
+
+        Args:
+            key: Identity of the call
+            fn: Zero-argument coroutine function performing the call
+
+        Returns:
+            Result of the shared call
+        """
+        task = self._calls.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._release(key, done))
+        else:
+            self.coalesced += 1
+
+        # Shield so one caller being cancelled does not cancel the shared call
+        return await asyncio.shield(task)
+
+    def _release(self, key: Hashable, task: asyncio.Task) -> None:
+        """Forget a finished call and mark its exception as retrieved"""
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Get coalescing counters
+
+        Returns:
+            dict: Upstream calls started, calls coalesced and calls in flight
+        """
+        return {"calls": self.calls, "coalesced": self.coalesced, "in_flight": len(self._calls)}
+
+
+# Shared by every AsyncSpotifyService instance in the process
+spotify_flights = SingleFlight()
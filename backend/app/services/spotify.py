@@ -1,19 +1,42 @@
 """
 Spotify Service - Handles all interactions with Spotify Web API
+
+spotipy (which pulls in requests and redis) is imported on first use, so the
+API process, which only builds the authorization URL here, starts without it.
 """
 
 import logging
 from datetime import datetime, timedelta
-from typing import Any, Optional
-
-import spotipy
-from spotipy.oauth2 import SpotifyOAuth
+from functools import cache
+from typing import TYPE_CHECKING, Any, Optional
 
 from app.config import settings
 
+if TYPE_CHECKING:
+    import requests
+    from spotipy.oauth2 import SpotifyOAuth
+
 logger = logging.getLogger(__name__)
 
 
+@cache
+def _get_session() -> "requests.Session":
+    """
+    Get the keep-alive requests session shared by every SpotifyService instance,
+    sized from the connection pool settings, so connections are reused across users
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=settings.spotify_http_max_keepalive_connections,
+        pool_maxsize=settings.spotify_http_max_connections,
+    )
+    session.mount("https://", adapter)
+    return session
+
+
 class SpotifyService:
     """Service class for interacting with Spotify API"""
 
@@ -28,10 +51,16 @@ class SpotifyService:
         self.client = None
 
         if access_token:
-            self.client = spotipy.Spotify(auth=access_token)
+            import spotipy
+
+            self.client = spotipy.Spotify(
+                auth=access_token,
+                requests_session=_get_session(),
+                requests_timeout=settings.spotify_http_timeout,
+            )
 
     @staticmethod
-    def get_auth_manager(state: Optional[str] = None) -> SpotifyOAuth:
+    def get_auth_manager(state: Optional[str] = None) -> "SpotifyOAuth":
         """
         Get SpotifyOAuth manager for authentication flow
 
@@ -41,6 +70,8 @@ class SpotifyService:
         Returns:
             SpotifyOAuth: Configured OAuth manager
         """
+        from spotipy.oauth2 import SpotifyOAuth
+
         return SpotifyOAuth(
             client_id=settings.spotify_client_id,
             client_secret=settings.spotify_client_secret,
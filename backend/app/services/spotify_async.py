@@ -0,0 +1,669 @@
+"""
+Async Spotify Service - Non-blocking Spotify Web API client built on httpx
+"""
+
+import asyncio
+import functools
+import hashlib
+import logging
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextvars import ContextVar
+from typing import Any, Optional, TypeVar
+from urllib.parse import quote
+
+import httpx
+
+from app.config import settings
+from app.services.cache import cache_key, identity_cache, user_cache
+from app.services.catalog import catalog_cache
+from app.services.http import get_http_client
+from app.services.metrics import (
+    spotify_request_duration,
+    spotify_request_errors,
+    spotify_requests_in_flight,
+    spotify_responses,
+)
+from app.services.projection import slim
+from app.services.scheduler import Priority, scheduler
+from app.services.singleflight import spotify_flights
+from app.services.timing import span
+
+logger = logging.getLogger(__name__)
+
+SPOTIFY_API_BASE_URL = settings.spotify_api_base_url.rstrip("/")
+SPOTIFY_TOKEN_URL = f"{settings.spotify_accounts_url.rstrip('/')}/api/token"
+
+# Maximum IDs Spotify accepts per call on its several-items endpoints
+AUDIO_FEATURES_BATCH_SIZE = 100
+ARTISTS_BATCH_SIZE = 50
+
+# Maximum page size for paginated library endpoints
+PAGE_SIZE = 50
+
+# Statuses that reject the access token rather than the request
+TOKEN_ERROR_STATUS_CODES = (401, 403)
+
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+
+# Service method on whose behalf upstream calls are made, used as the metrics label
+spotify_method: ContextVar[str] = ContextVar("spotify_method", default="other")
+
+
+def instrumented(fn: F) -> F:
+    """
+    Label the upstream calls made by a service method with the method's name,
+    and time the call as a request span
+    """
+    span_name = f"spotify.{fn.__name__}"
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        token = spotify_method.set(fn.__name__)
+        try:
+            with span(span_name):
+                return await fn(*args, **kwargs)
+        finally:
+            spotify_method.reset(token)
+
+    return wrapper
+
+
+async def _observe(method: str, send: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+    """
+    Send an upstream request, recording its latency and outcome
+
+    Args:
+        method: Service method label
+        send: Zero-argument coroutine function returning the final response
+
+    Returns:
+        httpx.Response: Response returned by send
+    """
+    start = time.perf_counter()
+    spotify_requests_in_flight.inc()
+    try:
+        response = await send()
+    except httpx.TransportError:
+        spotify_request_errors.inc(method, "transport")
+        raise
+    finally:
+        spotify_requests_in_flight.dec()
+        spotify_request_duration.observe(time.perf_counter() - start, method)
+
+    if not response.is_success:
+        spotify_request_errors.inc(method, str(response.status_code))
+    return response
+
+
+class SpotifyAPIError(Exception):
+    """Raised when the Spotify Web API returns an error response"""
+
+    def __init__(self, status_code: int, message: str, retry_after: Optional[float] = None):
+        super().__init__(f"Spotify API error {status_code}: {message}")
+        self.status_code = status_code
+        self.message = message
+        self.retry_after = retry_after
+        # Hash of the access token a shared request was sent with
+        self.token_key: Optional[str] = None
+
+
+def _raise_for_status(response: httpx.Response) -> None:
+    """
+    Convert an error response from Spotify into a SpotifyAPIError
+
+    Args:
+        response: Response returned by Spotify
+
+    Raises:
+        SpotifyAPIError: If the response status is not successful
+    """
+    if response.is_success:
+        return
+
+    try:
+        body = response.json()
+        error = body.get("error", {})
+        message = error.get("message") if isinstance(error, dict) else body.get("error_description")
+    except ValueError:
+        message = None
+
+    retry_after = response.headers.get("Retry-After")
+    raise SpotifyAPIError(
+        status_code=response.status_code,
+        message=message or response.reason_phrase,
+        retry_after=float(retry_after) if retry_after else None,
+    )
+
+
+class AsyncSpotifyService:
+    """Asyncio-native service class for interacting with Spotify API"""
+
+    def __init__(
+        self,
+        access_token: Optional[str] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        priority: Priority = Priority.INTERACTIVE,
+        user_id: Optional[str] = None,
+    ):
+        """
+        Initialize async Spotify service with optional access token
+
+        Args:
+            access_token: User's Spotify access token
+            client: Optional httpx client; defaults to the shared connection pool
+            priority: Scheduler priority for this service's upstream requests
+            user_id: Spotify user ID owning the token, if already verified
+        """
+        self.access_token = access_token
+        self.client = client or get_http_client()
+        self.priority = priority
+        self.user_id = user_id
+
+    @staticmethod
+    async def _request_token(data: dict[str, str]) -> dict[str, Any]:
+        """
+        Call Spotify's token endpoint with client credentials
+
+        Args:
+            data: Form fields for the token request
+
+        Returns:
+            dict: Token information with an added expires_at timestamp
+        """
+        method = spotify_method.get()
+
+        async def send() -> httpx.Response:
+            response = await get_http_client().post(
+                SPOTIFY_TOKEN_URL,
+                data=data,
+                auth=(settings.spotify_client_id, settings.spotify_client_secret),
+            )
+            spotify_responses.inc(method, str(response.status_code))
+            return response
+
+        response = await _observe(method, send)
+        _raise_for_status(response)
+
+        token_info = response.json()
+        token_info["expires_at"] = int(time.time()) + token_info.get("expires_in", 3600)
+        return token_info
+
+    @staticmethod
+    @instrumented
+    async def get_access_token(code: str) -> dict[str, Any]:
+        """
+        Exchange authorization code for access token
+
+        Args:
+            code: Authorization code from Spotify callback
+
+        Returns:
+            dict: Token information including access_token, refresh_token, expires_at
+        """
+        return await AsyncSpotifyService._request_token(
+            {
+                "grant_type": "authorization_code",
+                "code": code,
+                "redirect_uri": settings.spotify_redirect_uri,
+            }
+        )
+
+    @staticmethod
+    @instrumented
+    async def refresh_access_token(refresh_token: str) -> dict[str, Any]:
+        """
+        Refresh an expired access token
+
+        Args:
+            refresh_token: Refresh token
+
+        Returns:
+            dict: New token information
+        """
+        token_info = await AsyncSpotifyService._request_token(
+            {"grant_type": "refresh_token", "refresh_token": refresh_token}
+        )
+        # Spotify only returns a refresh token when it rotates it
+        token_info.setdefault("refresh_token", refresh_token)
+        return token_info
+
+    async def _get(
+        self,
+        path: str,
+        params: Optional[dict[str, Any]] = None,
+        shared: bool = False,
+        method: Optional[str] = None,
+    ) -> Any:
+        """
+        Send an authenticated GET request to the Spotify Web API
+
+        Identical concurrent requests are coalesced into one upstream call. Per-user
+        requests are keyed by access token; shared catalog requests are keyed by
+        path and params alone so lookups from different users coalesce too. A
+        shared call runs with the first caller's token, so when Spotify rejects
+        that token the other callers retry with their own.
+
+        Args:
+            path: API path relative to the v1 base URL
+            params: Query parameters; None values are dropped
+            shared: Whether the response is user-independent catalog data
+            method: Metrics label; defaults to the calling instrumented method
+
+        Returns:
+            Decoded JSON response body
+        """
+        if not self.access_token:
+            raise ValueError("Spotify client not initialized with access token")
+
+        query = {key: value for key, value in (params or {}).items() if value is not None}
+        params_key = tuple(sorted(query.items()))
+        method = method or spotify_method.get()
+        token_key = self._token_key()
+        if not shared:
+            return await spotify_flights.do(
+                (token_key, path, params_key), lambda: self._fetch(path, query, method)
+            )
+
+        try:
+            return await spotify_flights.do(
+                (None, path, params_key), lambda: self._fetch_shared(path, query, method)
+            )
+        except SpotifyAPIError as e:
+            if e.status_code not in TOKEN_ERROR_STATUS_CODES or e.token_key == token_key:
+                raise
+            # Another caller's token was rejected; ours may still be valid
+            return await spotify_flights.do(
+                (token_key, path, params_key), lambda: self._fetch(path, query, method)
+            )
+
+    async def _fetch_shared(self, path: str, query: dict[str, Any], method: str) -> Any:
+        """Fetch catalog data, marking errors with the token that was used"""
+        try:
+            return await self._fetch(path, query, method)
+        except SpotifyAPIError as e:
+            e.token_key = self._token_key()
+            raise
+
+    async def _fetch(self, path: str, query: dict[str, Any], method: str) -> Any:
+        """Perform a GET request against the Spotify Web API via the rate-limit scheduler"""
+
+        async def attempt() -> httpx.Response:
+            response = await self.client.get(
+                f"{SPOTIFY_API_BASE_URL}{path}",
+                params=query,
+                headers={"Authorization": f"Bearer {self.access_token}"},
+            )
+            spotify_responses.inc(method, str(response.status_code))
+            return response
+
+        response = await _observe(method, lambda: scheduler.send(attempt, self.priority))
+        _raise_for_status(response)
+        # Slimmed before anything is cached or coalesced
+        return slim(response.json())
+
+    @instrumented
+    async def get_current_user(self) -> dict[str, Any]:
+        """
+        Get current user's profile information
+
+        Returns:
+            dict: User profile data
+        """
+        try:
+            user = await self._get("/me")
+        except Exception as e:
+            logger.error(f"Error fetching current user: {e}")
+            raise
+
+        await identity_cache.set(self._token_key(), user["id"])
+        return user
+
+    def _token_key(self) -> str:
+        """Hash the access token so raw tokens are never kept as cache keys"""
+        if not self.access_token:
+            raise ValueError("Spotify client not initialized with access token")
+        return hashlib.sha256(self.access_token.encode()).hexdigest()
+
+    async def get_user_id(self) -> str:
+        """
+        Get the Spotify user ID that owns the access token
+
+        Uses the ID from the user's session when one was given; otherwise the ID
+        is cached per token, so only the first call for a token costs a round
+        trip to Spotify.
+
+        Returns:
+            str: Spotify user ID
+        """
+        if self.user_id:
+            return self.user_id
+
+        user_id = await identity_cache.get(self._token_key())
+        if user_id is None:
+            user_id = (await self.get_current_user())["id"]
+        return user_id
+
+    async def _get_user_cached(self, kind: str, path: str, params: dict[str, Any]) -> Any:
+        """
+        GET a per-user resource through the user response cache
+
+        Args:
+            kind: Resource name used in the cache key
+            path: API path relative to the v1 base URL
+            params: Query parameters, also part of the cache key
+
+        Returns:
+            Decoded JSON response body
+        """
+        user_id = await self.get_user_id()
+        key = cache_key(kind, user_id, *params.values())
+
+        data = await user_cache.get(key)
+        if data is None:
+            data = await self._get(path, params)
+            await user_cache.set(key, data)
+        return data
+
+    @instrumented
+    async def get_top_tracks(
+        self, time_range: str = "medium_term", limit: int = 50, offset: int = 0
+    ) -> dict[str, Any]:
+        """
+        Get user's top tracks, served from the per-user cache when fresh
+
+        Args:
+            time_range: Time range for top tracks (short_term, medium_term, long_term)
+            limit: Number of tracks to return (max 50)
+            offset: Index of first track to return
+
+        Returns:
+            dict: Top tracks data
+        """
+        try:
+            return await self._get_user_cached(
+                "top_tracks",
+                "/me/top/tracks",
+                {"time_range": time_range, "limit": limit, "offset": offset},
+            )
+        except Exception as e:
+            logger.error(f"Error fetching top tracks: {e}")
+            raise
+
+    @instrumented
+    async def get_top_artists(
+        self, time_range: str = "medium_term", limit: int = 50, offset: int = 0
+    ) -> dict[str, Any]:
+        """
+        Get user's top artists, served from the per-user cache when fresh
+
+        Args:
+            time_range: Time range for top artists (short_term, medium_term, long_term)
+            limit: Number of artists to return (max 50)
+            offset: Index of first artist to return
+
+        Returns:
+            dict: Top artists data
+        """
+        try:
+            return await self._get_user_cached(
+                "top_artists",
+                "/me/top/artists",
+                {"time_range": time_range, "limit": limit, "offset": offset},
+            )
+        except Exception as e:
+            logger.error(f"Error fetching top artists: {e}")
+            raise
+
+    @instrumented
+    async def get_recently_played(
+        self, limit: int = 50, after: Optional[int] = None, before: Optional[int] = None
+    ) -> dict[str, Any]:
+        """
+        Get user's recently played tracks
+
+        Args:
+            limit: Number of tracks to return (max 50)
+            after: Unix timestamp in milliseconds (returns tracks played after this time)
+            before: Unix timestamp in milliseconds (returns tracks played before this time)
+
+        Returns:
+            dict: Recently played tracks data
+        """
+        try:
+            return await self._get(
+                "/me/player/recently-played",
+                {"limit": limit, "after": after, "before": before},
+            )
+        except Exception as e:
+            logger.error(f"Error fetching recently played tracks: {e}")
+            raise
+
+    async def _get_catalog_many(
+        self, kind: str, path: str, response_key: str, ids: list[str], batch_size: int
+    ) -> dict[str, Any]:
+        """
+        Fetch catalog entities by ID in concurrent batches, reading through the catalog cache
+
+        IDs are de-duplicated, cached entities are served locally, and the rest are
+        split into batches fetched concurrently up to the configured limit.
+
+        Args:
+            kind: Catalog cache kind
+            path: Several-items endpoint path
+            response_key: Key holding the item list in the response body
+            ids: Spotify IDs, may contain duplicates
+            batch_size: Maximum IDs per upstream call
+
+        Returns:
+            dict: Entities by Spotify ID; unknown IDs are omitted
+        """
+        unique_ids = list(dict.fromkeys(ids))
+        found = await catalog_cache.get_many(kind, unique_ids)
+
+        missing = [spotify_id for spotify_id in unique_ids if spotify_id not in found]
+        batches = [missing[i : i + batch_size] for i in range(0, len(missing), batch_size)]
+        semaphore = asyncio.Semaphore(settings.spotify_batch_concurrency)
+
+        async def fetch_batch(batch: list[str]) -> dict[str, Any]:
+            async with semaphore:
+                data = await self._get(path, {"ids": ",".join(batch)}, shared=True)
+            items = {item["id"]: item for item in data.get(response_key, []) if item}
+            await catalog_cache.set_many(kind, items)
+            return items
+
+        for items in await asyncio.gather(*(fetch_batch(batch) for batch in batches)):
+            found.update(items)
+
+        return found
+
+    @instrumented
+    async def get_audio_features(self, track_ids: list[str]) -> list[dict[str, Any]]:
+        """
+        Get audio features for any number of tracks
+
+        Args:
+            track_ids: List of Spotify track IDs
+
+        Returns:
+            list: Audio features in input order; unknown tracks are omitted
+        """
+        try:
+            features = await self._get_catalog_many(
+                "audio_features",
+                "/audio-features",
+                "audio_features",
+                track_ids,
+                AUDIO_FEATURES_BATCH_SIZE,
+            )
+            return [features[tid] for tid in track_ids if tid in features]
+        except Exception as e:
+            logger.error(f"Error fetching audio features: {e}")
+            raise
+
+    @instrumented
+    async def get_saved_tracks(self, limit: int = 50, offset: int = 0) -> dict[str, Any]:
+        """
+        Get user's saved tracks (liked songs)
+
+        Args:
+            limit: Number of tracks to return (max 50)
+            offset: Index of first track to return
+
+        Returns:
+            dict: Saved tracks data
+        """
+        try:
+            return await self._get("/me/tracks", {"limit": limit, "offset": offset})
+        except Exception as e:
+            logger.error(f"Error fetching saved tracks: {e}")
+            raise
+
+    @instrumented
+    async def get_user_playlists(self, limit: int = 50, offset: int = 0) -> dict[str, Any]:
+        """
+        Get user's playlists
+
+        Args:
+            limit: Number of playlists to return (max 50)
+            offset: Index of first playlist to return
+
+        Returns:
+            dict: User playlists data
+        """
+        try:
+            return await self._get("/me/playlists", {"limit": limit, "offset": offset})
+        except Exception as e:
+            logger.error(f"Error fetching user playlists: {e}")
+            raise
+
+    async def _iter_all_items(self, path: str, method: str) -> AsyncIterator[dict[str, Any]]:
+        """
+        Yield every item of a paginated endpoint, fetching pages concurrently
+
+        The first page reveals the total; the remaining offsets are fetched by a
+        bounded pool of workers and items are yielded as pages arrive, so pages
+        may come out of order. A bounded queue applies backpressure so memory
+        stays flat for large libraries.
+
+        Args:
+            path: Paginated API path accepting limit and offset
+            method: Metrics label for the page requests
+
+        Yields:
+            dict: Items from each page
+        """
+        span_name = f"spotify.{method}"
+        with span(span_name):
+            first = await self._get(path, {"limit": PAGE_SIZE, "offset": 0}, method=method)
+        for item in first.get("items", []):
+            yield item
+
+        offsets = iter(range(PAGE_SIZE, first.get("total", 0), PAGE_SIZE))
+        page_count = len(range(PAGE_SIZE, first.get("total", 0), PAGE_SIZE))
+        concurrency = min(settings.spotify_page_concurrency, page_count)
+        pages: asyncio.Queue = asyncio.Queue(maxsize=max(concurrency, 1))
+
+        async def worker() -> None:
+            try:
+                # Workers share one offset iterator, so each page is fetched once
+                for offset in offsets:
+                    with span(span_name):
+                        page = await self._get(
+                            path, {"limit": PAGE_SIZE, "offset": offset}, method=method
+                        )
+                    await pages.put(page.get("items", []))
+            except Exception as e:
+                await pages.put(e)
+
+        workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+        try:
+            for _ in range(page_count):
+                page = await pages.get()
+                if isinstance(page, Exception):
+                    raise page
+                for item in page:
+                    yield item
+        finally:
+            for task in workers:
+                task.cancel()
+
+    def iter_saved_tracks(self) -> AsyncIterator[dict[str, Any]]:
+        """
+        Iterate over all of the user's saved tracks
+
+        Returns:
+            AsyncIterator: Saved track items, fetched with concurrent pagination
+        """
+        return self._iter_all_items("/me/tracks", "iter_saved_tracks")
+
+    def iter_user_playlists(self) -> AsyncIterator[dict[str, Any]]:
+        """
+        Iterate over all of the user's playlists
+
+        Returns:
+            AsyncIterator: Playlist items, fetched with concurrent pagination
+        """
+        return self._iter_all_items("/me/playlists", "iter_user_playlists")
+
+    @instrumented
+    async def get_track(self, track_id: str) -> dict[str, Any]:
+        """
+        Get a specific track by ID, using the shared catalog cache
+
+        Args:
+            track_id: Spotify track ID
+
+        Returns:
+            dict: Track data
+        """
+        try:
+            track = await catalog_cache.get("track", track_id)
+            if track is None:
+                track = await self._get(f"/tracks/{quote(track_id, safe='')}", shared=True)
+                await catalog_cache.set("track", track_id, track)
+            return track
+        except Exception as e:
+            logger.error(f"Error fetching track: {e}")
+            raise
+
+    @instrumented
+    async def get_artist(self, artist_id: str) -> dict[str, Any]:
+        """
+        Get a specific artist by ID, using the shared catalog cache
+
+        Args:
+            artist_id: Spotify artist ID
+
+        Returns:
+            dict: Artist data
+        """
+        try:
+            artist = await catalog_cache.get("artist", artist_id)
+            if artist is None:
+                artist = await self._get(f"/artists/{quote(artist_id, safe='')}", shared=True)
+                await catalog_cache.set("artist", artist_id, artist)
+            return artist
+        except Exception as e:
+            logger.error(f"Error fetching artist: {e}")
+            raise
+
+    @instrumented
+    async def get_several_artists(self, artist_ids: list[str]) -> list[dict[str, Any]]:
+        """
+        Get any number of artists in concurrent 50-ID batches, using the catalog cache
+
+        Args:
+            artist_ids: List of Spotify artist IDs
+
+        Returns:
+            list: Artist data in input order; unknown artists are omitted
+        """
+        try:
+            artists = await self._get_catalog_many(
+                "artist", "/artists", "artists", artist_ids, ARTISTS_BATCH_SIZE
+            )
+            return [artists[aid] for aid in artist_ids if aid in artists]
+        except Exception as e:
+            logger.error(f"Error fetching artists: {e}")
+            raise
@@ -0,0 +1,133 @@
+"""
+Request Timing - Named spans collected per request for Server-Timing
+
+The timing middleware puts a RequestTimings in a context variable for each
+request; code on the request path wraps its phases in span(). Outside a request
+(e.g. the sync worker) span() does nothing, so instrumentation can stay in
+shared code.
+"""
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class RequestTimings:
+    """Durations of the named phases of one request"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        # Span name -> [total seconds, occurrences]
+        self.spans: dict[str, list[float]] = {}
+        # When the endpoint function returned, to time serialization after it
+        self.endpoint_done: Optional[float] = None
+
+    def add(self, name: str, seconds: float) -> None:
+        """
+        Add time to a span; repeated spans are summed
+
+        Args:
+            name: Span name
+            seconds: Duration to add
+        """
+        span = self.spans.get(name)
+        if span is None:
+            self.spans[name] = [seconds, 1]
+        else:
+            span[0] += seconds
+            span[1] += 1
+
+    def elapsed(self) -> float:
+        """Seconds since the request started"""
+        return time.perf_counter() - self.start
+
+    def header(self) -> str:
+        """
+        Format the spans and the elapsed time as a Server-Timing header value
+
+        Concurrent spans overlap, so their durations may add up to more than the total.
+
+        Returns:
+            str: e.g. 'auth;dur=0.4, spotify.get_top_tracks;dur=81.2, total;dur=84.0'
+        """
+        entries = []
+        for name, (seconds, count) in self.spans.items():
+            entry = f"{name};dur={seconds * 1000:.1f}"
+            if count > 1:
+                entry += f';desc="{count:g}x"'
+            entries.append(entry)
+        entries.append(f"total;dur={self.elapsed() * 1000:.1f}")
+        return ", ".join(entries)
+
+    def as_dict(self) -> dict[str, Any]:
+        """
+        Get the spans for structured logging
+
+        Returns:
+            dict: Milliseconds and occurrences per span
+        """
+        return {
+            name: {"ms": round(seconds * 1000, 1), "count": int(count)}
+            for name, (seconds, count) in self.spans.items()
+        }
+
+
+# Timings of the request being handled, if any
+current_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def record(name: str, seconds: float) -> None:
+    """
+    Add a measured duration to the current request's timings, if any
+
+    Args:
+        name: Span name
+        seconds: Duration
+    """
+    timings = current_timings.get()
+    if timings is not None:
+        timings.add(name, seconds)
+
+
+def time_queries(engine: Engine) -> None:
+    """
+    Count SQL statement execution time towards the current request's "db" span
+
+    Args:
+        engine: Engine whose statements are timed
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_timer(conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info["query_start"] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def stop_timer(conn, cursor, statement, parameters, context, executemany) -> None:
+        start = conn.info.pop("query_start", None)
+        if start is not None:
+            record("db", time.perf_counter() - start)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """
+    Time the enclosed block as a span of the current request
+
+    Args:
+        name: Span name; letters, digits, '.', '_' and '-' only
+    """
+    timings = current_timings.get()
+    if timings is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - start)
@@ -0,0 +1,86 @@
+"""
+User Store - Persist registered users and their Spotify tokens
+"""
+
+import time
+from typing import Any, Optional
+
+from sqlalchemy import select, update
+
+from app.database import SessionLocal, dialect_insert
+from app.models.user import User
+
+
+def save_user_tokens(
+    user_id: str, token_info: dict[str, Any], display_name: Optional[str] = None
+) -> None:
+    """
+    Create or update a user with fresh tokens
+
+    Args:
+        user_id: Spotify user ID
+        token_info: Token response including access_token and expires_at
+        display_name: User's display name, kept unchanged if None
+    """
+    values = {
+        "access_token": token_info["access_token"],
+        "expires_at": token_info.get("expires_at", int(time.time()) + 3600),
+    }
+    if token_info.get("refresh_token"):
+        values["refresh_token"] = token_info["refresh_token"]
+    if display_name is not None:
+        values["display_name"] = display_name
+
+    stmt = dialect_insert(User.__table__).values(
+        id=user_id,
+        display_name=display_name,
+        access_token=values["access_token"],
+        refresh_token=token_info.get("refresh_token", ""),
+        expires_at=values["expires_at"],
+        created_at=time.time(),
+    )
+    stmt = stmt.on_conflict_do_update(index_elements=["id"], set_=values)
+
+    with SessionLocal() as db:
+        db.execute(stmt)
+        db.commit()
+
+
+def clear_refresh_token(user_id: str) -> None:
+    """
+    Forget a user's refresh token, e.g. after Spotify rejected it
+
+    The user stays registered but is skipped by background syncs until the
+    next login stores a new refresh token.
+
+    Args:
+        user_id: Spotify user ID
+    """
+    with SessionLocal() as db:
+        db.execute(update(User).where(User.id == user_id).values(refresh_token=""))
+        db.commit()
+
+
+def get_user(user_id: str) -> Optional[User]:
+    """
+    Get a stored user
+
+    Args:
+        user_id: Spotify user ID
+
+    Returns:
+        User or None if the user has never logged in
+    """
+    with SessionLocal() as db:
+        return db.get(User, user_id)
+
+
+def list_user_ids() -> list[str]:
+    """
+    Get the IDs of all users with a refresh token
+
+    Returns:
+        list: Spotify user IDs in a stable order
+    """
+    with SessionLocal() as db:
+        return list(db.scalars(select(User.id).where(User.refresh_token != "").order_by(User.id)))
@@ -0,0 +1,149 @@
+"""
+Background Sync Worker - Capture listening history for all registered users
+
+Polls recently played for every stored user once per sync interval. Users are
+spread evenly across the interval so upstream load is smooth, not bursty, and
+a bounded pool of workers keeps concurrency within the rate budget. Requests
+run at background priority so interactive traffic is always served first.
+
+Run standalone with `python -m app.worker`, or in the API process by setting
+SYNC_WORKER_ENABLED=true.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Optional
+
+from app.auth.tokens import token_manager
+from app.config import settings
+from app.services.history import sync_recently_played
+from app.services.scheduler import Priority
+from app.services.spotify_async import AsyncSpotifyService
+from app.services.users import list_user_ids
+
+logger = logging.getLogger(__name__)
+
+
+class SyncWorker:
+    """Periodically syncs every user's recently played tracks"""
+
+    def __init__(self, interval: float, concurrency: int):
+        """
+        Initialize worker
+
+        Args:
+            interval: Seconds between two syncs of the same user
+            concurrency: Maximum users synced at once
+        """
+        self.interval = interval
+        self.concurrency = concurrency
+        self.last_cycle: Optional[dict[str, Any]] = None
+
+    async def sync_user(self, user_id: str) -> int:
+        """
+        Sync one user's recently played tracks
+
+        Args:
+            user_id: Spotify user ID
+
+        Returns:
+            int: Number of new plays stored
+        """
+        access_token = await token_manager.get_access_token(user_id)
+        if access_token is None:
+            return 0
+
+        spotify = AsyncSpotifyService(access_token=access_token, priority=Priority.BACKGROUND)
+        result = await sync_recently_played(spotify, user_id)
+        return result["inserted"]
+
+    async def run_cycle(self) -> dict[str, Any]:
+        """
+        Sync every user once, spread evenly over one interval
+
+        Returns:
+            dict: Cycle statistics (users, plays, failures, duration and lag)
+        """
+        user_ids = await asyncio.to_thread(list_user_ids)
+        start = time.monotonic()
+        spacing = self.interval / len(user_ids) if user_ids else 0.0
+
+        # Bounded so the producer never runs far ahead of the workers
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        stats = {"users": len(user_ids), "plays": 0, "failed": 0, "max_lag": 0.0, "total_lag": 0.0}
+
+        async def produce() -> None:
+            for index, user_id in enumerate(user_ids):
+                await queue.put((user_id, start + index * spacing))
+            for _ in range(self.concurrency):
+                await queue.put(None)
+
+        async def consume() -> None:
+            while (job := await queue.get()) is not None:
+                user_id, due = job
+                await asyncio.sleep(max(due - time.monotonic(), 0.0))
+
+                # Lag is how late the sync started compared to its slot
+                lag = time.monotonic() - due
+                stats["max_lag"] = max(stats["max_lag"], lag)
+                stats["total_lag"] += lag
+                try:
+                    stats["plays"] += await self.sync_user(user_id)
+                except Exception as e:
+                    stats["failed"] += 1
+                    logger.error(f"Error syncing user {user_id}: {e}")
+
+        await asyncio.gather(produce(), *(consume() for _ in range(self.concurrency)))
+
+        cycle = {
+            "users": stats["users"],
+            "plays": stats["plays"],
+            "failed": stats["failed"],
+            "duration": time.monotonic() - start,
+            "max_lag": stats["max_lag"],
+            "avg_lag": stats["total_lag"] / stats["users"] if stats["users"] else 0.0,
+        }
+        self.last_cycle = cycle
+        logger.info(
+            "Sync cycle finished: {users} users, {plays} new plays, {failed} failed, "
+            "{duration:.1f}s duration, {avg_lag:.2f}s avg lag, {max_lag:.2f}s max lag".format(
+                **cycle
+            )
+        )
+        return cycle
+
+    async def run_forever(self) -> None:
+        """Run sync cycles back to back, waiting out the interval if there are no users"""
+        while True:
+            cycle_start = time.monotonic()
+            try:
+                await self.run_cycle()
+            except Exception as e:
+                logger.error(f"Sync cycle failed: {e}", exc_info=True)
+            await asyncio.sleep(max(self.interval - (time.monotonic() - cycle_start), 0.0))
+
+
+sync_worker = SyncWorker(
+    interval=settings.sync_interval_seconds,
+    concurrency=settings.sync_worker_concurrency,
+)
+
+
+async def main() -> None:
+    """Standalone entry point"""
+    from app.database import init_db
+    from app.services.cache import close_caches
+    from app.services.http import close_http_client
+
+    init_db()
+    try:
+        await sync_worker.run_forever()
+    finally:
+        await close_http_client()
+        await close_caches()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    asyncio.run(main())
@@ -0,0 +1,3 @@
+"""
+Benchmarks - Standalone performance measurement scripts
+"""
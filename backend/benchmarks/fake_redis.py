@@ -0,0 +1,271 @@
+"""
+Fake Redis - Local stand-in for a Redis server
+
+Speaks enough of the Redis protocol (RESP2) for the redis cache backend:
+strings with expiry, MGET, DEL, SCAN and a few server commands. Data lives in
+one process and is lost on exit; there is no persistence, replication or
+memory limit. Use it to run several app workers against a shared cache
+without installing Redis.
+
+Run from the backend directory:
+
+    python -m benchmarks.fake_redis --port 6390
+
+Then start the app with CACHE_BACKEND=redis and REDIS_URL=redis://127.0.0.1:6390/0.
+"""
+
+import argparse
+import asyncio
+import fnmatch
+import time
+from typing import Any, Optional
+
+Reply = Any
+
+# value, expiry (monotonic time or None) and insertion sequence, which SCAN
+# cursors refer to so keys deleted mid-scan never make it skip others
+Entry = tuple[bytes, Optional[float], int]
+
+
+class Error(str):
+    """Error reply"""
+
+
+OK = "OK"
+
+
+class FakeRedis:
+    """In-memory keyspace with per-key expiry, one per database number"""
+
+    def __init__(self, password: Optional[str] = None):
+        self.password = password
+        self.databases: dict[int, dict[bytes, Entry]] = {}
+        self.commands = 0
+        self._sequence = 0
+
+    def keyspace(self, db: int) -> dict[bytes, Entry]:
+        return self.databases.setdefault(db, {})
+
+    @staticmethod
+    def _live(data: dict[bytes, Entry], key: bytes) -> Optional[Entry]:
+        """Get an entry, dropping it if expired"""
+        entry = data.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= time.monotonic():
+            del data[key]
+            return None
+        return entry
+
+    def execute(self, session: dict[str, Any], args: list[bytes]) -> Reply:
+        """
+        Run one command
+
+        Args:
+            session: Per-connection state (selected db, authenticated)
+            args: Command name and arguments
+
+        Returns:
+            Reply value: str for status, Error, int, bytes, None or list
+        """
+        self.commands += 1
+        name = args[0].decode().upper()
+        if self.password and not session["authenticated"] and name not in ("AUTH", "QUIT"):
+            return Error("NOAUTH Authentication required.")
+        handler = getattr(self, f"cmd_{name.lower()}", None)
+        if handler is None:
+            return Error(f"ERR unknown command '{name}'")
+        try:
+            return handler(session, *args[1:])
+        except (TypeError, ValueError, IndexError):
+            return Error(f"ERR wrong arguments for '{name}' command")
+
+    def cmd_ping(self, session, message: Optional[bytes] = None) -> Reply:
+        return message if message is not None else "PONG"
+
+    def cmd_quit(self, session) -> Reply:
+        return OK
+
+    def cmd_auth(self, session, *credentials: bytes) -> Reply:
+        if not self.password:
+            return Error("ERR AUTH called without any password configured")
+        if credentials[-1].decode() != self.password:
+            return Error("WRONGPASS invalid username-password pair")
+        session["authenticated"] = True
+        return OK
+
+    def cmd_select(self, session, db: bytes) -> Reply:
+        session["db"] = int(db)
+        return OK
+
+    def cmd_get(self, session, key: bytes) -> Reply:
+        entry = self._live(self.keyspace(session["db"]), key)
+        return entry[0] if entry else None
+
+    def cmd_mget(self, session, *keys: bytes) -> Reply:
+        return [self.cmd_get(session, key) for key in keys]
+
+    def cmd_set(self, session, key: bytes, value: bytes, *options: bytes) -> Reply:
+        expires_at = None
+        opts = [option.upper() for option in options]
+        for i, option in enumerate(opts):
+            if option == b"EX":
+                expires_at = time.monotonic() + int(options[i + 1])
+            elif option == b"PX":
+                expires_at = time.monotonic() + int(options[i + 1]) / 1000
+        data = self.keyspace(session["db"])
+        current = self._live(data, key)
+        if (b"NX" in opts and current) or (b"XX" in opts and not current):
+            return None
+        if current:
+            sequence = current[2]
+        else:
+            self._sequence += 1
+            sequence = self._sequence
+        data[key] = (value, expires_at, sequence)
+        return OK
+
+    def cmd_del(self, session, *keys: bytes) -> Reply:
+        data = self.keyspace(session["db"])
+        removed = 0
+        for key in keys:
+            if self._live(data, key) is not None:
+                del data[key]
+                removed += 1
+        return removed
+
+    cmd_unlink = cmd_del
+
+    def cmd_exists(self, session, *keys: bytes) -> Reply:
+        data = self.keyspace(session["db"])
+        return sum(self._live(data, key) is not None for key in keys)
+
+    def cmd_pexpire(self, session, key: bytes, milliseconds: bytes) -> Reply:
+        data = self.keyspace(session["db"])
+        entry = self._live(data, key)
+        if entry is None:
+            return 0
+        data[key] = (entry[0], time.monotonic() + int(milliseconds) / 1000, entry[2])
+        return 1
+
+    def cmd_expire(self, session, key: bytes, seconds: bytes) -> Reply:
+        return self.cmd_pexpire(session, key, int(seconds) * 1000)
+
+    def cmd_pttl(self, session, key: bytes) -> Reply:
+        entry = self._live(self.keyspace(session["db"]), key)
+        if entry is None:
+            return -2
+        if entry[1] is None:
+            return -1
+        return int((entry[1] - time.monotonic()) * 1000)
+
+    def cmd_ttl(self, session, key: bytes) -> Reply:
+        ttl = self.cmd_pttl(session, key)
+        return ttl if ttl < 0 else round(ttl / 1000)
+
+    def cmd_scan(self, session, cursor: bytes, *options: bytes) -> Reply:
+        pattern, count = "*", 10
+        for i in range(0, len(options) - 1, 2):
+            option = options[i].upper()
+            if option == b"MATCH":
+                pattern = options[i + 1].decode()
+            elif option == b"COUNT":
+                count = int(options[i + 1])
+        data = self.keyspace(session["db"])
+        start = int(cursor)
+        remaining = sorted((entry[2], key) for key, entry in data.items() if entry[2] > start)
+        step = remaining[:count]
+        matched = [
+            key
+            for _, key in step
+            if fnmatch.fnmatchcase(key.decode(), pattern) and self._live(data, key)
+        ]
+        next_cursor = b"0" if len(remaining) <= count else str(step[-1][0]).encode()
+        return [next_cursor, matched]
+
+    def cmd_dbsize(self, session) -> Reply:
+        data = self.keyspace(session["db"])
+        return sum(self._live(data, key) is not None for key in list(data))
+
+    def cmd_flushdb(self, session, *options: bytes) -> Reply:
+        self.keyspace(session["db"]).clear()
+        return OK
+
+    def cmd_flushall(self, session, *options: bytes) -> Reply:
+        self.databases.clear()
+        return OK
+
+
+async def read_command(reader: asyncio.StreamReader) -> Optional[list[bytes]]:
+    """
+    Read one command sent as a RESP array of bulk strings
+
+    Returns:
+        list: Command name and arguments, or None when the client disconnected
+    """
+    line = await reader.readline()
+    if not line:
+        return None
+    if not line.startswith(b"*"):
+        # Inline command, as typed into telnet
+        return line.split() or None
+    args = []
+    for _ in range(int(line[1:])):
+        header = await reader.readline()
+        args.append((await reader.readexactly(int(header[1:]) + 2))[:-2])
+    return args
+
+
+def encode_reply(reply: Reply) -> bytes:
+    """Encode a reply value as RESP2"""
+    if reply is None:
+        return b"$-1\r\n"
+    if isinstance(reply, Error):
+        return b"-%s\r\n" % reply.encode()
+    if isinstance(reply, str):
+        return b"+%s\r\n" % reply.encode()
+    if isinstance(reply, int):
+        return b":%d\r\n" % reply
+    if isinstance(reply, bytes):
+        return b"$%d\r\n%s\r\n" % (len(reply), reply)
+    return b"*%d\r\n" % len(reply) + b"".join(encode_reply(item) for item in reply)
+
+
+async def serve(host: str, port: int, password: Optional[str] = None) -> None:
+    """Accept connections until cancelled"""
+    server_state = FakeRedis(password)
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        session = {"db": 0, "authenticated": False}
+        try:
+            while True:
+                try:
+                    args = await read_command(reader)
+                except (ConnectionError, ValueError, asyncio.IncompleteReadError):
+                    break
+                if args is None:
+                    break
+                writer.write(encode_reply(server_state.execute(session, args)))
+                await writer.drain()
+                if args[0].upper() == b"QUIT":
+                    break
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, host, port)
+    async with server:
+        await server.serve_forever()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local stand-in for a Redis server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6390)
+    parser.add_argument("--password", default=None)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.password))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
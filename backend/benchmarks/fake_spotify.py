@@ -0,0 +1,333 @@
+"""
+Fake Spotify - Local stand-in for the Spotify Web API and accounts service
+
+Serves deterministic fixture payloads with configurable latency, jitter and
+injected 429 responses, and counts every upstream call so benchmarks can report
+how many requests the app actually sent to "Spotify".
+
+Run from the backend directory:
+
+    python -m benchmarks.fake_spotify --port 9000 --latency-ms 80 --jitter-ms 30
+
+Then start the app with SPOTIFY_API_BASE_URL=http://127.0.0.1:9000/v1 and
+SPOTIFY_ACCOUNTS_URL=http://127.0.0.1:9000. Call counts are served at /_stats
+and cleared with POST /_reset.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Optional
+
+import uvicorn
+from fastapi import APIRouter, Depends, FastAPI, Form, Query, Request, Response
+from fastapi.responses import JSONResponse
+
+from benchmarks.fixtures import (
+    fake_artist,
+    fake_audio_features,
+    fake_playlist,
+    fake_track,
+)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+@dataclass
+class FakeSpotifyConfig:
+    """Behaviour of the fake upstream"""
+
+    latency_ms: float = 50.0  # Mean added latency per request
+    jitter_ms: float = 20.0  # Uniform jitter around the mean
+    rate_limit_ratio: float = 0.0  # Fraction of requests answered with 429
+    retry_after: int = 1  # Retry-After seconds sent with injected 429s
+    library_size: int = 500  # Saved tracks per user
+    playlist_count: int = 60  # Playlists per user
+    top_total: int = 100  # Top tracks/artists per time range
+    seed: Optional[int] = None
+
+
+class RateLimitedError(Exception):
+    """Injected 429"""
+
+
+def index_of(spotify_id: str) -> int:
+    """Recover the fixture index from a fake ID, or derive a stable one"""
+    digits = spotify_id.lstrip("abcdefghijklmnopqrstuvwxyz")
+    return int(digits) if digits.isdigit() else sum(spotify_id.encode())
+
+
+def page(items: list[Any], total: int, limit: int, offset: int, path: str) -> dict[str, Any]:
+    """Paging object as Spotify returns it"""
+    base = f"https://api.spotify.com/v1{path}"
+    has_next = offset + limit < total
+    return {
+        "href": f"{base}?offset={offset}&limit={limit}",
+        "items": items,
+        "limit": limit,
+        "offset": offset,
+        "total": total,
+        "next": f"{base}?offset={offset + limit}&limit={limit}" if has_next else None,
+        "previous": f"{base}?offset={max(offset - limit, 0)}&limit={limit}" if offset else None,
+    }
+
+
+def dumps(content: Any) -> bytes:
+    """Encode a fixture payload, with orjson when installed"""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, separators=(",", ":")).encode("utf-8")
+
+
+def json_response(content: Any) -> Response:
+    """Render pre-built JSON without FastAPI's encoder so the fake stays cheap"""
+    return Response(dumps(content), media_type="application/json")
+
+
+def create_app(config: FakeSpotifyConfig) -> FastAPI:
+    """
+    Build the fake Spotify application
+
+    Args:
+        config: Latency, jitter, 429 injection and fixture sizes
+
+    Returns:
+        FastAPI: ASGI application
+    """
+    rng = random.Random(config.seed)
+    calls: Counter = Counter()
+    rate_limited: Counter = Counter()
+
+    async def simulate(request: Request) -> None:
+        """Count the call, wait out the simulated latency and maybe inject a 429"""
+        route = f"{request.method} {request.scope['route'].path}"
+        calls[route] += 1
+
+        delay = config.latency_ms + rng.uniform(-config.jitter_ms, config.jitter_ms)
+        await asyncio.sleep(max(delay, 0.0) / 1000)
+
+        if config.rate_limit_ratio and rng.random() < config.rate_limit_ratio:
+            rate_limited[route] += 1
+            raise RateLimitedError()
+
+    def user_of(request: Request) -> str:
+        """Resolve the fake user from the bearer token"""
+        token = request.headers.get("authorization", "").removeprefix("Bearer ")
+        if not token.startswith("access-"):
+            raise PermissionError()
+        return token.removeprefix("access-").rsplit("-", 1)[0]
+
+    # Deterministic pages are rendered once, so the fake's own CPU time does not
+    # show up in the app's latency
+    @lru_cache(maxsize=4096)
+    def render_top(kind: str, time_range: str, limit: int, offset: int) -> bytes:
+        shift = ["short_term", "medium_term", "long_term"].index(time_range)
+        fixture = fake_track if kind == "tracks" else fake_artist
+        end = min(offset + limit, config.top_total)
+        items = [fixture(i + shift * 7) for i in range(offset, end)]
+        return dumps(page(items, config.top_total, limit, offset, f"/me/top/{kind}"))
+
+    @lru_cache(maxsize=4096)
+    def render_saved(limit: int, offset: int) -> bytes:
+        end = min(offset + limit, config.library_size)
+        items = [
+            {"added_at": "2024-05-01T18:30:12Z", "track": fake_track(i)} for i in range(offset, end)
+        ]
+        return dumps(page(items, config.library_size, limit, offset, "/me/tracks"))
+
+    @lru_cache(maxsize=4096)
+    def render_track(index: int) -> bytes:
+        return dumps(fake_track(index))
+
+    app = FastAPI(title="Fake Spotify")
+    api = APIRouter(dependencies=[Depends(simulate)])
+
+    @app.exception_handler(RateLimitedError)
+    async def rate_limited_handler(request: Request, exc: RateLimitedError):
+        return JSONResponse(
+            status_code=429,
+            content={"error": {"status": 429, "message": "API rate limit exceeded"}},
+            headers={"Retry-After": str(config.retry_after)},
+        )
+
+    @app.exception_handler(PermissionError)
+    async def unauthorized_handler(request: Request, exc: PermissionError):
+        return JSONResponse(
+            status_code=401,
+            content={"error": {"status": 401, "message": "Invalid access token"}},
+        )
+
+    @api.post("/api/token")
+    async def token(
+        grant_type: str = Form(...),
+        code: Optional[str] = Form(None),
+        refresh_token: Optional[str] = Form(None),
+    ):
+        if grant_type == "authorization_code":
+            user = code or "user"
+        else:
+            user = (refresh_token or "refresh-user").removeprefix("refresh-")
+        return {
+            "access_token": f"access-{user}-{time.time_ns()}",
+            "token_type": "Bearer",
+            "expires_in": 3600,
+            "refresh_token": f"refresh-{user}",
+            "scope": "user-read-private user-top-read user-read-recently-played",
+        }
+
+    @api.get("/v1/me")
+    async def me(request: Request):
+        user = user_of(request)
+        return {
+            "id": user,
+            "display_name": user.title(),
+            "email": f"{user}@example.com",
+            "country": "US",
+            "product": "premium",
+            "images": [],
+            "followers": {"href": None, "total": 7},
+            "external_urls": {"spotify": f"https://open.spotify.com/user/{user}"},
+            "type": "user",
+            "uri": f"spotify:user:{user}",
+        }
+
+    @api.get("/v1/me/top/tracks")
+    async def top_tracks(
+        request: Request,
+        limit: int = Query(20),
+        offset: int = Query(0),
+        time_range: str = Query("medium_term"),
+    ):
+        user_of(request)
+        return Response(
+            render_top("tracks", time_range, limit, offset), media_type="application/json"
+        )
+
+    @api.get("/v1/me/top/artists")
+    async def top_artists(
+        request: Request,
+        limit: int = Query(20),
+        offset: int = Query(0),
+        time_range: str = Query("medium_term"),
+    ):
+        user_of(request)
+        return Response(
+            render_top("artists", time_range, limit, offset), media_type="application/json"
+        )
+
+    @api.get("/v1/me/player/recently-played")
+    async def recently_played(
+        request: Request,
+        limit: int = Query(20),
+        after: Optional[int] = Query(None),
+        before: Optional[int] = Query(None),
+    ):
+        user_of(request)
+        # One play every three minutes, ending now
+        newest = (before or int(time.time() * 1000)) - 1
+        played = [newest - i * 180_000 for i in range(limit)]
+        if after is not None:
+            played = [ts for ts in played if ts > after]
+        items = [
+            {
+                "track": fake_track(ts // 180_000 % 1000),
+                "played_at": datetime.fromtimestamp(ts / 1000, timezone.utc)
+                .isoformat(timespec="milliseconds")
+                .replace("+00:00", "Z"),
+                "context": {"type": "playlist", "uri": "spotify:playlist:playlist00000000000001"},
+            }
+            for ts in played
+        ]
+        cursors = {"after": str(played[0]), "before": str(played[-1])} if played else None
+        return json_response({"items": items, "limit": limit, "next": None, "cursors": cursors})
+
+    @api.get("/v1/me/tracks")
+    async def saved_tracks(request: Request, limit: int = Query(20), offset: int = Query(0)):
+        user_of(request)
+        return Response(render_saved(limit, offset), media_type="application/json")
+
+    @api.get("/v1/me/playlists")
+    async def playlists(request: Request, limit: int = Query(20), offset: int = Query(0)):
+        user = user_of(request)
+        end = min(offset + limit, config.playlist_count)
+        items = [fake_playlist(i, user) for i in range(offset, end)]
+        return json_response(page(items, config.playlist_count, limit, offset, "/me/playlists"))
+
+    @api.get("/v1/audio-features")
+    async def audio_features(request: Request, ids: str = Query(...)):
+        user_of(request)
+        return json_response(
+            {"audio_features": [fake_audio_features(index_of(i)) for i in ids.split(",")]}
+        )
+
+    @api.get("/v1/tracks/{spotify_id}")
+    async def track(request: Request, spotify_id: str):
+        user_of(request)
+        return Response(render_track(index_of(spotify_id)), media_type="application/json")
+
+    @api.get("/v1/artists/{spotify_id}")
+    async def artist(request: Request, spotify_id: str):
+        user_of(request)
+        return json_response(fake_artist(index_of(spotify_id)))
+
+    @api.get("/v1/artists")
+    async def several_artists(request: Request, ids: str = Query(...)):
+        user_of(request)
+        return json_response({"artists": [fake_artist(index_of(i)) for i in ids.split(",")]})
+
+    @app.get("/_stats")
+    async def stats():
+        return {
+            "total": sum(calls.values()),
+            "rate_limited": sum(rate_limited.values()),
+            "calls": dict(calls),
+            "rate_limited_calls": dict(rate_limited),
+            "config": asdict(config),
+        }
+
+    @app.post("/_reset")
+    async def reset():
+        calls.clear()
+        rate_limited.clear()
+        return {"reset": True}
+
+    app.include_router(api)
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local stand-in for the Spotify Web API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency-ms", type=float, default=FakeSpotifyConfig.latency_ms)
+    parser.add_argument("--jitter-ms", type=float, default=FakeSpotifyConfig.jitter_ms)
+    parser.add_argument(
+        "--rate-limit-ratio", type=float, default=FakeSpotifyConfig.rate_limit_ratio
+    )
+    parser.add_argument("--retry-after", type=int, default=FakeSpotifyConfig.retry_after)
+    parser.add_argument("--library-size", type=int, default=FakeSpotifyConfig.library_size)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    config = FakeSpotifyConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        rate_limit_ratio=args.rate_limit_ratio,
+        retry_after=args.retry_after,
+        library_size=args.library_size,
+        seed=args.seed,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
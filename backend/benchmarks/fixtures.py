@@ -0,0 +1,146 @@
+"""
+Fixtures - Deterministic Spotify-shaped payloads for benchmarks
+
+Objects mirror the shape and size of Spotify's full objects, including the
+market lists, so serialization and transfer costs are realistic.
+"""
+
+from typing import Any
+
+MARKETS = ["AD", "AE", "AR", "AT", "AU", "BE", "BG", "BO", "BR", "CA"] * 18
+
+ARTIST_COUNT = 40
+ALBUM_COUNT = 120
+GENRES = ["pop", "indie rock", "hip hop", "house", "jazz", "ambient", "soul", "metal"]
+
+
+def track_id(index: int) -> str:
+    return f"track{index:017d}"
+
+
+def artist_id(index: int) -> str:
+    return f"artist{index % ARTIST_COUNT:016d}"
+
+
+def simple_artist(index: int) -> dict[str, Any]:
+    """Simplified artist object as embedded in tracks and albums"""
+    spotify_id = artist_id(index)
+    return {
+        "id": spotify_id,
+        "name": f"Artist {index % ARTIST_COUNT}",
+        "type": "artist",
+        "uri": f"spotify:artist:{spotify_id}",
+        "href": f"https://api.spotify.com/v1/artists/{spotify_id}",
+        "external_urls": {"spotify": f"https://open.spotify.com/artist/{spotify_id}"},
+    }
+
+
+def fake_artist(index: int) -> dict[str, Any]:
+    """Full artist object"""
+    spotify_id = artist_id(index)
+    return {
+        **simple_artist(index),
+        "genres": [GENRES[index % len(GENRES)], GENRES[(index * 3 + 1) % len(GENRES)]],
+        "popularity": (index * 7) % 100,
+        "followers": {"href": None, "total": 1000 * (index % ARTIST_COUNT + 1)},
+        "images": [
+            {"url": f"https://i.scdn.co/image/{spotify_id}{size}", "height": size, "width": size}
+            for size in (640, 320, 160)
+        ],
+    }
+
+
+def fake_track(index: int) -> dict[str, Any]:
+    """Full track object"""
+    spotify_id = track_id(index)
+    artist = simple_artist(index)
+    album_id = f"album{index % ALBUM_COUNT:019d}"
+    return {
+        "id": spotify_id,
+        "name": f"Track number {index}",
+        "type": "track",
+        "uri": f"spotify:track:{spotify_id}",
+        "href": f"https://api.spotify.com/v1/tracks/{spotify_id}",
+        "duration_ms": 180000 + index,
+        "explicit": index % 3 == 0,
+        "popularity": index % 100,
+        "preview_url": f"https://p.scdn.co/mp3-preview/{index:040d}",
+        "track_number": index % 12 + 1,
+        "disc_number": 1,
+        "is_local": False,
+        "external_ids": {"isrc": f"USRC1{index:07d}"},
+        "external_urls": {"spotify": f"https://open.spotify.com/track/{spotify_id}"},
+        "available_markets": MARKETS,
+        "artists": [artist],
+        "album": {
+            "id": album_id,
+            "name": f"Album {index % ALBUM_COUNT}",
+            "type": "album",
+            "album_type": "album",
+            "uri": f"spotify:album:{album_id}",
+            "href": f"https://api.spotify.com/v1/albums/{album_id}",
+            "release_date": "2023-05-12",
+            "release_date_precision": "day",
+            "total_tracks": 12,
+            "available_markets": MARKETS,
+            "artists": [artist],
+            "external_urls": {"spotify": f"https://open.spotify.com/album/{album_id}"},
+            "images": [
+                {"url": f"https://i.scdn.co/image/{album_id}{size}", "height": size, "width": size}
+                for size in (640, 300, 64)
+            ],
+        },
+    }
+
+
+def fake_audio_features(index: int) -> dict[str, Any]:
+    """Audio features object"""
+    return {
+        "id": track_id(index),
+        "type": "audio_features",
+        "danceability": (index * 37 % 100) / 100,
+        "energy": (index * 53 % 100) / 100,
+        "valence": (index * 71 % 100) / 100,
+        "acousticness": (index * 13 % 100) / 100,
+        "instrumentalness": (index * 29 % 100) / 1000,
+        "speechiness": (index * 17 % 100) / 1000,
+        "liveness": (index * 43 % 100) / 500,
+        "loudness": -(index % 20) - 3.0,
+        "tempo": 80.0 + index % 100,
+        "key": index % 12,
+        "mode": index % 2,
+        "time_signature": 4,
+        "duration_ms": 180000 + index,
+    }
+
+
+def fake_playlist(index: int, owner_id: str) -> dict[str, Any]:
+    """Simplified playlist object"""
+    spotify_id = f"playlist{index:014d}"
+    return {
+        "id": spotify_id,
+        "name": f"Playlist {index}",
+        "description": f"Benchmark playlist number {index}",
+        "type": "playlist",
+        "uri": f"spotify:playlist:{spotify_id}",
+        "href": f"https://api.spotify.com/v1/playlists/{spotify_id}",
+        "public": index % 2 == 0,
+        "collaborative": False,
+        "snapshot_id": f"snapshot{index:032d}",
+        "external_urls": {"spotify": f"https://open.spotify.com/playlist/{spotify_id}"},
+        "images": [
+            {"url": f"https://mosaic.scdn.co/640/{spotify_id}", "height": 640, "width": 640}
+        ],
+        "owner": {
+            "id": owner_id,
+            "display_name": owner_id,
+            "type": "user",
+            "uri": f"spotify:user:{owner_id}",
+            "href": f"https://api.spotify.com/v1/users/{owner_id}",
+            "external_urls": {"spotify": f"https://open.spotify.com/user/{owner_id}"},
+        },
+        "tracks": {
+            "href": f"https://api.spotify.com/v1/playlists/{spotify_id}/tracks",
+            "total": 50,
+        },
+    }
@@ -0,0 +1,423 @@
+"""
+Load Benchmark - Drive the API at controlled concurrency against fake Spotify
+
+By default the harness starts benchmarks.fake_spotify and the app (uvicorn) on
+free local ports, logs virtual users in through /auth/login and /auth/callback,
+then runs each scenario at a fixed concurrency. For every scenario it reports
+p50/p95/p99 latency, throughput, response statuses and the calls the app sent
+upstream, and saves the results as JSON.
+
+Run from the backend directory:
+
+    python -m benchmarks.load --concurrency 32 --requests 500
+    python -m benchmarks.load --compare benchmarks/results/<earlier run>.json
+    python -m benchmarks.load --workers 4 --cache-backend redis
+
+With --workers the app runs several uvicorn worker processes; --cache-backend
+picks the cache they use (memory, sqlite, or redis served by
+benchmarks.fake_redis), to compare upstream calls with per-worker and shared
+caches.
+
+Use --app-url/--fake-url to benchmark servers that are already running; the app
+must then be configured with SPOTIFY_API_BASE_URL/SPOTIFY_ACCOUNTS_URL pointing
+at the fake server.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from collections.abc import Callable
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Optional
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+
+from benchmarks.fixtures import track_id
+
+RESULTS_DIR = Path(__file__).parent / "results"
+TIME_RANGES = ["short_term", "medium_term", "long_term"]
+
+# Scenario name -> request path for the i-th request
+SCENARIOS: dict[str, Callable[[int], str]] = {
+    "auth_check": lambda i: "/auth/check",
+    "auth_me": lambda i: "/auth/me",
+    "profile": lambda i: "/api/user/profile",
+    "summary": lambda i: "/api/user/summary?limit=10",
+    "top_tracks": lambda i: f"/api/user/top-tracks?limit=50&time_range={TIME_RANGES[i % 3]}",
+    "top_artists": lambda i: f"/api/user/top-artists?limit=50&time_range={TIME_RANGES[i % 3]}",
+    "recently_played": lambda i: "/api/user/recently-played?limit=50",
+    "saved_tracks": lambda i: f"/api/user/saved-tracks?limit=50&offset={50 * (i % 10)}",
+    "saved_tracks_full": lambda i: "/api/user/saved-tracks?limit=50&view=full"
+    + f"&offset={50 * (i % 10)}",
+    "playlists": lambda i: "/api/user/playlists?limit=50",
+    "track": lambda i: f"/api/user/track/{track_id(i % 300)}",
+    "audio_features": lambda i: "/api/user/audio-features?track_ids="
+    + ",".join(track_id((i * 20 + j) % 500) for j in range(20)),
+    "genres": lambda i: "/api/analytics/genres?limit=10",
+}
+
+
+def free_port() -> int:
+    """Ask the OS for an unused local port"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile of pre-sorted values"""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(q / 100 * len(sorted_values))) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def git_revision() -> Optional[str]:
+    """Current commit of the working tree, if available"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def wait_ready(url: str, timeout: float = 20.0) -> None:
+    """Poll a URL until it answers"""
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while True:
+            try:
+                await client.get(url)
+                return
+            except httpx.TransportError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f"{url} did not become ready")
+                await asyncio.sleep(0.1)
+
+
+def start_servers(
+    args: argparse.Namespace, workdir: str
+) -> tuple[str, str, list[subprocess.Popen]]:
+    """
+    Start the fake Spotify server, the fake Redis server if needed, and the app
+    as subprocesses
+
+    Returns:
+        tuple: App URL, fake Spotify URL and the started processes
+    """
+    fake_port, app_port = free_port(), free_port()
+    fake_url = f"http://127.0.0.1:{fake_port}"
+    backend_dir = Path(__file__).parent.parent
+
+    fake = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.fake_spotify",
+            "--port",
+            str(fake_port),
+            "--latency-ms",
+            str(args.latency_ms),
+            "--jitter-ms",
+            str(args.jitter_ms),
+            "--rate-limit-ratio",
+            str(args.rate_limit_ratio),
+            "--seed",
+            "1",
+        ],
+        cwd=backend_dir,
+    )
+
+    env = {
+        **os.environ,
+        "SPOTIFY_CLIENT_ID": os.environ.get("SPOTIFY_CLIENT_ID", "benchmark"),
+        "SPOTIFY_CLIENT_SECRET": os.environ.get("SPOTIFY_CLIENT_SECRET", "benchmark"),
+        "SECRET_KEY": os.environ.get("SECRET_KEY", "benchmark-secret-key"),
+        "SPOTIFY_API_BASE_URL": f"{fake_url}/v1",
+        "SPOTIFY_ACCOUNTS_URL": fake_url,
+        "DATABASE_URL": f"sqlite:///{workdir}/benchmark.db",
+        # The app-wide limiter protects real Spotify; lift it unless overridden
+        "SPOTIFY_RATE_LIMIT_PER_SECOND": "10000",
+        "SPOTIFY_RATE_LIMIT_BURST": "10000",
+        "CACHE_BACKEND": args.cache_backend,
+        "CACHE_SQLITE_PATH": f"{workdir}/cache.sqlite3",
+    }
+    processes = [fake]
+    if args.cache_backend == "redis":
+        redis_port = free_port()
+        processes.append(
+            subprocess.Popen(
+                [sys.executable, "-m", "benchmarks.fake_redis", "--port", str(redis_port)],
+                cwd=backend_dir,
+            )
+        )
+        env["REDIS_URL"] = f"redis://127.0.0.1:{redis_port}/0"
+    for assignment in args.app_env:
+        key, _, value = assignment.partition("=")
+        env[key] = value
+
+    app = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(app_port),
+            "--log-level",
+            "warning",
+            "--no-access-log",
+            "--workers",
+            str(args.workers),
+        ],
+        cwd=backend_dir,
+        env=env,
+    )
+    return f"http://127.0.0.1:{app_port}", fake_url, [*processes, app]
+
+
+async def login(app_url: str, user: str) -> httpx.AsyncClient:
+    """
+    Log a virtual user in through the OAuth endpoints
+
+    Returns:
+        httpx.AsyncClient: Client holding the user's cookies
+    """
+    client = httpx.AsyncClient(base_url=app_url, follow_redirects=False, timeout=60.0)
+    response = await client.get("/auth/login")
+    state = parse_qs(urlparse(response.headers["location"]).query)["state"][0]
+    response = await client.get("/auth/callback", params={"code": user, "state": state})
+    if response.status_code != 307:
+        raise RuntimeError(f"Login failed for {user}: {response.status_code} {response.text}")
+    return client
+
+
+async def upstream_stats(fake_url: str) -> dict[str, Any]:
+    async with httpx.AsyncClient() as client:
+        return (await client.get(f"{fake_url}/_stats")).json()
+
+
+async def run_scenario(
+    name: str,
+    build_path: Callable[[int], str],
+    clients: list[httpx.AsyncClient],
+    fake_url: str,
+    concurrency: int,
+    total: int,
+    warmup: int,
+) -> dict[str, Any]:
+    """
+    Send total requests for one scenario from concurrency workers
+
+    Returns:
+        dict: Latency percentiles, throughput, statuses and upstream calls
+    """
+    for i in range(warmup):
+        await clients[i % len(clients)].get(build_path(i))
+
+    before = await upstream_stats(fake_url)
+    counter = itertools.count()
+    latencies: list[float] = []
+    statuses: Counter = Counter()
+
+    async def worker() -> None:
+        while (i := next(counter)) < total:
+            client = clients[i % len(clients)]
+            start = time.perf_counter()
+            try:
+                response = await client.get(build_path(i))
+                statuses[str(response.status_code)] += 1
+            except httpx.HTTPError as e:
+                statuses[type(e).__name__] += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    duration = time.perf_counter() - started
+    after = await upstream_stats(fake_url)
+
+    latencies.sort()
+    upstream = after["total"] - before["total"]
+    return {
+        "scenario": name,
+        "requests": total,
+        "concurrency": concurrency,
+        "duration_s": round(duration, 3),
+        "throughput_rps": round(total / duration, 1),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50), 2),
+            "p95": round(percentile(latencies, 95), 2),
+            "p99": round(percentile(latencies, 99), 2),
+            "mean": round(statistics.fmean(latencies), 2),
+            "max": round(latencies[-1], 2),
+        },
+        "statuses": dict(statuses),
+        "upstream_calls": upstream,
+        "upstream_429": after["rate_limited"] - before["rate_limited"],
+        "upstream_calls_per_request": round(upstream / total, 3),
+    }
+
+
+def print_results(results: list[dict[str, Any]]) -> None:
+    print(
+        f"{'scenario':18} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} "
+        f"{'upstream':>9} {'up/req':>7} {'429s':>5}  statuses"
+    )
+    for r in results:
+        latency = r["latency_ms"]
+        print(
+            f"{r['scenario']:18} {r['throughput_rps']:>8.1f} {latency['p50']:>8.1f} "
+            f"{latency['p95']:>8.1f} {latency['p99']:>8.1f} {r['upstream_calls']:>9} "
+            f"{r['upstream_calls_per_request']:>7.2f} {r['upstream_429']:>5}  {r['statuses']}"
+        )
+
+
+def compare(results: list[dict[str, Any]], baseline_path: Path, threshold: float) -> bool:
+    """
+    Print changes against an earlier run
+
+    Returns:
+        bool: True if no scenario's p95 regressed by more than threshold percent
+    """
+    baseline = {r["scenario"]: r for r in json.loads(baseline_path.read_text())["results"]}
+    print(f"\nCompared with {baseline_path.name}:")
+    print(f"{'scenario':18} {'p50':>9} {'p95':>9} {'req/s':>9} {'upstream':>9}")
+
+    def change(new: float, old: float) -> float:
+        return (new - old) / old * 100 if old else 0.0
+
+    ok = True
+    for r in results:
+        old = baseline.get(r["scenario"])
+        if old is None:
+            continue
+        p95 = change(r["latency_ms"]["p95"], old["latency_ms"]["p95"])
+        flag = ""
+        if p95 > threshold:
+            ok = False
+            flag = "  REGRESSION"
+        print(
+            f"{r['scenario']:18} "
+            f"{change(r['latency_ms']['p50'], old['latency_ms']['p50']):>+8.1f}% "
+            f"{p95:>+8.1f}% "
+            f"{change(r['throughput_rps'], old['throughput_rps']):>+8.1f}% "
+            f"{r['upstream_calls'] - old['upstream_calls']:>+9}{flag}"
+        )
+    return ok
+
+
+async def run(args: argparse.Namespace) -> int:
+    processes: list[subprocess.Popen] = []
+    workdir = tempfile.mkdtemp(prefix="early-wrapped-bench-")
+    try:
+        if args.app_url:
+            app_url, fake_url = args.app_url.rstrip("/"), args.fake_url.rstrip("/")
+        else:
+            app_url, fake_url, processes = start_servers(args, workdir)
+        await wait_ready(f"{fake_url}/_stats")
+        await wait_ready(f"{app_url}/health")
+
+        login_started = time.perf_counter()
+        clients = await asyncio.gather(*(login(app_url, f"bench{i}") for i in range(args.users)))
+        print(f"Logged in {args.users} users in {time.perf_counter() - login_started:.2f}s\n")
+
+        scenarios = args.scenarios or list(SCENARIOS)
+        results = []
+        for name in scenarios:
+            results.append(
+                await run_scenario(
+                    name,
+                    SCENARIOS[name],
+                    clients,
+                    fake_url,
+                    args.concurrency,
+                    args.requests,
+                    args.warmup,
+                )
+            )
+        for client in clients:
+            await client.aclose()
+
+        print_results(results)
+
+        document = {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "config": {
+                "users": args.users,
+                "concurrency": args.concurrency,
+                "requests": args.requests,
+                "warmup": args.warmup,
+                "latency_ms": args.latency_ms,
+                "jitter_ms": args.jitter_ms,
+                "rate_limit_ratio": args.rate_limit_ratio,
+                "workers": args.workers,
+                "cache_backend": args.cache_backend,
+                "app_env": args.app_env,
+            },
+            "results": results,
+        }
+        output = args.output or RESULTS_DIR / (
+            f"{datetime.now():%Y%m%d-%H%M%S}-{document['git_revision'] or 'local'}.json"
+        )
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(document, indent=2))
+        print(f"\nSaved results to {output}")
+
+        if args.compare and not compare(results, args.compare, args.threshold):
+            return 1
+        return 0
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait(timeout=10)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load benchmark against a fake Spotify API")
+    parser.add_argument("--scenarios", nargs="*", choices=list(SCENARIOS), help="Default: all")
+    parser.add_argument("--users", type=int, default=20, help="Virtual users")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=300, help="Requests per scenario")
+    parser.add_argument("--warmup", type=int, default=0, help="Unrecorded requests per scenario")
+    parser.add_argument("--latency-ms", type=float, default=80.0, help="Fake upstream latency")
+    parser.add_argument("--jitter-ms", type=float, default=30.0)
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.0, help="Injected 429 ratio")
+    parser.add_argument("--workers", type=int, default=1, help="App worker processes")
+    parser.add_argument("--cache-backend", choices=["memory", "sqlite", "redis"], default="memory")
+    parser.add_argument(
+        "--app-env", action="append", default=[], metavar="KEY=VALUE", help="Extra app settings"
+    )
+    parser.add_argument("--app-url", help="Benchmark an already running app")
+    parser.add_argument("--fake-url", default="http://127.0.0.1:9000")
+    parser.add_argument("--output", type=Path, help="Results file (default: benchmarks/results/)")
+    parser.add_argument("--compare", type=Path, help="Earlier results file to compare against")
+    parser.add_argument(
+        "--threshold", type=float, default=20.0, help="Allowed p95 regression in percent"
+    )
+    sys.exit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Serialization Benchmark - Time response encoding on realistic Spotify payloads
+
+Compares FastAPI's default path (jsonable_encoder + stdlib JSONResponse) with
+the app's path (pydantic-core serialization + orjson APIResponse), plus the
+MessagePack representation and gzip/brotli compression.
+
+Run from the backend directory:
+
+    python -m benchmarks.serialization
+"""
+
+import gzip
+import statistics
+import time
+from collections.abc import Callable
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.api.responses import APIResponse, msgpack, orjson, response_media_type
+from app.services.projection import SAVED_TRACK_FIELDS, parse_fields, project, slim
+from benchmarks.fixtures import fake_track
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional encoding
+    brotli = None
+
+
+def payloads() -> dict[str, Any]:
+    """Response documents as the API returns them"""
+    saved = [{"added_at": "2024-05-01T18:30:12Z", "track": fake_track(i)} for i in range(1000)]
+    compact = parse_fields(SAVED_TRACK_FIELDS)
+    return {
+        "saved tracks page, raw (50)": {"success": True, "data": saved[:50]},
+        "saved tracks page, full (50)": {"success": True, "data": slim(saved[:50])},
+        "saved tracks page, compact (50)": {"success": True, "data": project(saved[:50], compact)},
+        "library, full (1000)": {"success": True, "data": slim(saved)},
+    }
+
+
+def measure(fn: Callable[[], Any], repeat: int) -> float:
+    """Median wall time of fn in milliseconds"""
+    fn()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main(repeat: int = 30) -> None:
+    adapter = TypeAdapter(Any)
+
+    def before(content: Any) -> bytes:
+        return JSONResponse(jsonable_encoder(content)).body
+
+    def after(content: Any) -> bytes:
+        return APIResponse(adapter.dump_python(adapter.validate_python(content), mode="json")).body
+
+    def as_msgpack(content: Any) -> bytes:
+        token = response_media_type.set("application/msgpack")
+        try:
+            return after(content)
+        finally:
+            response_media_type.reset(token)
+
+    installed = {"orjson": orjson, "msgpack": msgpack, "brotli": brotli}
+    print(", ".join(f"{name}: {module is not None}" for name, module in installed.items()))
+    print(f"median of {repeat} runs, milliseconds\n")
+    header = f"{'payload':34} {'bytes':>9} {'before':>8} {'after':>8} {'speedup':>8}"
+    if msgpack is not None:
+        header += f" {'msgpack':>8} {'mp bytes':>9}"
+    header += f" {'gzip':>8} {'gz bytes':>9}"
+    if brotli is not None:
+        header += f" {'br q4':>8} {'br bytes':>9}"
+    print(header)
+
+    for name, content in payloads().items():
+        body = after(content)
+        before_ms = measure(lambda: before(content), repeat)
+        after_ms = measure(lambda: after(content), repeat)
+        row = f"{name:34} {len(body):>9} {before_ms:>8.2f} {after_ms:>8.2f}"
+        row += f" {before_ms / after_ms:>7.1f}x"
+        if msgpack is not None:
+            packed = as_msgpack(content)
+            row += f" {measure(lambda: as_msgpack(content), repeat):>8.2f} {len(packed):>9}"
+        row += f" {measure(lambda: gzip.compress(body, 6), repeat):>8.2f}"
+        row += f" {len(gzip.compress(body, 6)):>9}"
+        if brotli is not None:
+            row += f" {measure(lambda: brotli.compress(body, quality=4), repeat):>8.2f}"
+            row += f" {len(brotli.compress(body, quality=4)):>9}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
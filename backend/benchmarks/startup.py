@@ -0,0 +1,162 @@
+"""
+Startup Benchmark - Import time and time to first /health answer
+
+Measures, in fresh interpreters:
+
+- how long `import app.main` takes, and which heavy modules it loads
+- how long after launching uvicorn the app first answers GET /health
+
+and checks them against a budget. The run exits with status 1 when the median
+import time or time to health exceeds its budget, or when a module that should
+load lazily (numpy, pandas, spotipy, ...) is imported at startup, so it can gate
+CI.
+
+Run from the backend directory:
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --runs 10 --import-budget-ms 1200 --health-budget-ms 2500
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from benchmarks.load import free_port
+
+BACKEND_DIR = Path(__file__).parent.parent
+
+# Default budgets; tests/test_startup.py enforces the import budget
+IMPORT_BUDGET_MS = 1200.0
+HEALTH_BUDGET_MS = 2500.0
+
+# Loaded on first use or by the background warm-up, never by `import app.main`
+LAZY_MODULES = ("numpy", "pandas", "spotipy", "requests", "redis", "jose", "passlib")
+
+IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+print(json.dumps({"ms": elapsed * 1000, "modules": sorted(sys.modules)}))
+"""
+
+
+def app_env(workdir: str) -> dict[str, str]:
+    """Environment for starting the app without real credentials"""
+    return {
+        **os.environ,
+        "SPOTIFY_CLIENT_ID": os.environ.get("SPOTIFY_CLIENT_ID", "benchmark"),
+        "SPOTIFY_CLIENT_SECRET": os.environ.get("SPOTIFY_CLIENT_SECRET", "benchmark"),
+        "SECRET_KEY": os.environ.get("SECRET_KEY", "benchmark-secret-key"),
+        "DATABASE_URL": f"sqlite:///{workdir}/startup.db",
+    }
+
+
+def measure_import(env: dict[str, str]) -> dict[str, Any]:
+    """
+    Import app.main in a fresh interpreter
+
+    Returns:
+        dict: Import time in milliseconds and the lazy modules that got loaded
+    """
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    probe = json.loads(result.stdout.strip().splitlines()[-1])
+    loaded = set(probe["modules"])
+    return {"ms": probe["ms"], "eager": [name for name in LAZY_MODULES if name in loaded]}
+
+
+def measure_health(env: dict[str, str], timeout: float = 30.0) -> float:
+    """
+    Launch uvicorn and time until GET /health first returns 200
+
+    Returns:
+        float: Milliseconds from process start to the first healthy answer
+    """
+    port = free_port()
+    url = f"http://127.0.0.1:{port}/health"
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--host",
+            "127.0.0.1",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+    try:
+        with httpx.Client(timeout=1.0) as client:
+            while time.perf_counter() - start < timeout:
+                try:
+                    if client.get(url).status_code == 200:
+                        return (time.perf_counter() - start) * 1000
+                except httpx.TransportError:
+                    pass
+                time.sleep(0.005)
+        raise RuntimeError(f"{url} did not answer within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def run(args: argparse.Namespace) -> int:
+    with tempfile.TemporaryDirectory() as workdir:
+        env = app_env(workdir)
+        imports = [measure_import(env) for _ in range(args.runs)]
+        health = [measure_health(env) for _ in range(args.runs)]
+
+    import_ms = statistics.median(probe["ms"] for probe in imports)
+    health_ms = statistics.median(health)
+    eager = sorted({name for probe in imports for name in probe["eager"]})
+
+    print(f"import app.main   median {import_ms:7.1f} ms   budget {args.import_budget_ms:7.1f} ms")
+    print(f"first /health     median {health_ms:7.1f} ms   budget {args.health_budget_ms:7.1f} ms")
+    print(f"lazy modules loaded at import: {', '.join(eager) or 'none'}")
+
+    failures = []
+    if import_ms > args.import_budget_ms:
+        failures.append("import time over budget")
+    if health_ms > args.health_budget_ms:
+        failures.append("time to /health over budget")
+    if eager:
+        failures.append(f"imported at startup: {', '.join(eager)}")
+
+    if failures:
+        print(f"\nFAILED: {'; '.join(failures)}")
+        return 1
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure API cold start against a budget")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh processes per measurement")
+    parser.add_argument("--import-budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument("--health-budget-ms", type=float, default=HEALTH_BUDGET_MS)
+    sys.exit(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
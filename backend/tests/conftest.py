@@ -0,0 +1,35 @@
+"""
+Shared test setup
+
+Settings are read from the environment when app.config is first imported, so
+the required values and a throwaway SQLite database are set before any test
+module imports the app.
+"""
+
+import os
+import tempfile
+from collections.abc import Iterator
+
+import pytest
+
+TEST_DIR = tempfile.mkdtemp(prefix="early-wrapped-tests-")
+
+os.environ.setdefault("SPOTIFY_CLIENT_ID", "test-client-id")
+os.environ.setdefault("SPOTIFY_CLIENT_SECRET", "test-client-secret")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ["DATABASE_URL"] = f"sqlite:///{TEST_DIR}/test.db"
+os.environ["CACHE_BACKEND"] = "memory"
+os.environ["WARM_UP_IMPORTS"] = "false"
+os.environ["SYNC_WORKER_ENABLED"] = "false"
+
+
+@pytest.fixture
+def database() -> Iterator[None]:
+    """Create all tables, and empty them again after the test"""
+    from app.database import Base, engine, init_db
+
+    init_db()
+    yield
+    with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(table.delete())
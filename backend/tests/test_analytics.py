@@ -0,0 +1,46 @@
+"""
+Tests for the vectorized audio profile
+"""
+
+import pytest
+
+from app.services.analytics.audio import FEATURES, FeatureMatrix, audio_profile
+
+
+def features(track_id: str, value: float) -> dict:
+    return {"id": track_id, **{name: value for name in FEATURES}}
+
+
+def test_profile_is_weighted_by_a_list_of_weights():
+    matrix = FeatureMatrix.from_features([features("a", 0.2), features("b", 0.8)])
+
+    unweighted = audio_profile(matrix)
+    weighted = audio_profile(matrix, [3, 1])
+
+    assert unweighted["averages"]["energy"] == pytest.approx(0.5)
+    assert weighted["averages"]["energy"] == pytest.approx(0.35)
+    assert weighted["tracks"] == 2
+    assert weighted["personality"] in weighted["scores"]
+
+
+def test_missing_features_are_left_out_of_the_average():
+    matrix = FeatureMatrix.from_features([features("a", 0.2), {"id": "b", "energy": 0.6}])
+
+    profile = audio_profile(matrix, [1, 1])
+
+    assert profile["averages"]["energy"] == pytest.approx(0.4)
+    assert profile["averages"]["valence"] == pytest.approx(0.2)
+
+
+def test_empty_profile():
+    assert audio_profile(FeatureMatrix.from_features([]), [])["tracks"] == 0
+
+
+def test_profile_values_are_rounded_without_float32_noise():
+    matrix = FeatureMatrix.from_features([features("a", 0.6), features("b", 0.6)])
+
+    profile = audio_profile(matrix)
+
+    assert profile["averages"]["energy"] == 0.6
+    assert profile["quartiles"]["energy"] == [0.6, 0.6, 0.6]
+    assert all(score == round(score, 4) for score in profile["scores"].values())
@@ -0,0 +1,221 @@
+"""
+Tests for the session-based /auth endpoints
+"""
+
+import asyncio
+import time
+from collections.abc import Iterator
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import user
+from app.auth import router, tokens
+from app.auth.session import SESSION_COOKIE, create_session
+from app.auth.tokens import token_manager
+from app.services.spotify_async import SpotifyAPIError
+from app.services.users import save_user_tokens
+
+PROFILE = {
+    "id": "alice",
+    "display_name": "Alice",
+    "email": "alice@example.com",
+    "country": "SE",
+    "product": "premium",
+    "images": [],
+    "followers": {"total": 3},
+    "external_urls": {"spotify": "https://open.spotify.com/user/alice"},
+}
+
+
+@pytest.fixture
+def client(database) -> Iterator[TestClient]:
+    app = FastAPI()
+    app.include_router(router.router, prefix="/auth")
+    app.include_router(user.router, prefix="/api/user")
+    with TestClient(app) as client:
+        yield client
+    asyncio.run(token_manager.cache.clear())
+
+
+def login(client: TestClient, profile: dict = PROFILE, expires_in: int = 3600) -> None:
+    """Store tokens for the user and give the client a session cookie"""
+    save_user_tokens(
+        profile["id"],
+        {
+            "access_token": f"access-{profile['id']}",
+            "refresh_token": "refresh",
+            "expires_at": int(time.time()) + expires_in,
+        },
+    )
+    client.cookies.set(SESSION_COOKIE, create_session(profile))
+
+
+def test_check_without_session_is_unauthenticated(client):
+    client.cookies.set("spotify_access_token", "cookie-token")
+
+    assert client.get("/auth/check").json()["authenticated"] is False
+
+
+def test_check_with_session_and_stored_tokens(client):
+    login(client)
+
+    assert client.get("/auth/check").json()["authenticated"] is True
+
+
+def test_check_with_session_but_no_stored_tokens(client):
+    client.cookies.set(SESSION_COOKIE, create_session({**PROFILE, "id": "nobody"}))
+
+    assert client.get("/auth/check").json()["authenticated"] is False
+
+
+def test_me_is_served_from_the_session(client):
+    login(client)
+
+    response = client.get("/auth/me")
+
+    assert response.status_code == 200
+    assert response.json()["id"] == "alice"
+    assert response.json()["display_name"] == "Alice"
+
+
+def test_me_without_session_is_rejected(client):
+    client.cookies.set("spotify_access_token", "cookie-token")
+
+    assert client.get("/auth/me").status_code == 401
+
+
+@pytest.fixture
+def stale_profile(monkeypatch) -> list[str]:
+    """Make every session profile stale and record the tokens used to re-fetch it"""
+    used = []
+
+    async def get_current_user(self) -> dict:
+        used.append(self.access_token)
+        return {**PROFILE, "display_name": "Alice Fresh", "id": self.access_token.split("-")[-1]}
+
+    monkeypatch.setattr(router.settings, "session_profile_max_age", -1)
+    monkeypatch.setattr(router.AsyncSpotifyService, "get_current_user", get_current_user)
+    return used
+
+
+def test_fresh_session_needs_no_tokens(client):
+    client.cookies.set(SESSION_COOKIE, create_session(PROFILE))
+
+    assert client.get("/auth/me").json()["display_name"] == "Alice"
+
+
+def test_stale_profile_is_refetched_with_the_stored_token(client, stale_profile):
+    login(client)
+    client.cookies.set("spotify_access_token", "cookie-mallory")
+
+    response = client.get("/auth/me")
+
+    assert response.json()["display_name"] == "Alice Fresh"
+    assert stale_profile == ["access-alice"]
+    assert SESSION_COOKIE in response.cookies
+
+
+def test_legacy_cookie_of_the_session_user_is_accepted(client, stale_profile):
+    client.cookies.set(SESSION_COOKIE, create_session(PROFILE))
+    client.cookies.set("spotify_access_token", "cookie-alice")
+
+    response = client.get("/auth/me")
+
+    assert response.status_code == 200
+    assert response.json()["display_name"] == "Alice Fresh"
+
+
+def test_legacy_cookie_of_another_user_is_rejected(client, stale_profile):
+    client.cookies.set(SESSION_COOKIE, create_session(PROFILE))
+    client.cookies.set("spotify_access_token", "cookie-mallory")
+
+    assert client.get("/auth/me").status_code == 401
+
+
+@pytest.fixture
+def refresh_error(monkeypatch) -> list[Exception]:
+    """Make refreshes fail with the exception put in the returned list"""
+    errors: list[Exception] = []
+
+    async def refresh_access_token(refresh_token: str) -> dict:
+        raise errors[0]
+
+    monkeypatch.setattr(
+        tokens.AsyncSpotifyService, "refresh_access_token", staticmethod(refresh_access_token)
+    )
+    return errors
+
+
+def test_revoked_refresh_token_is_logged_out(client, refresh_error):
+    refresh_error.append(SpotifyAPIError(400, "invalid_grant"))
+    login(client, expires_in=-10)
+
+    assert client.get("/auth/check").json()["authenticated"] is False
+    response = client.get("/api/user/top-tracks")
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Not authenticated. Please login with Spotify."
+
+
+def test_refresh_outage_is_an_upstream_error(client, refresh_error):
+    refresh_error.append(SpotifyAPIError(429, "Too many requests", retry_after=3))
+    login(client, expires_in=-10)
+
+    response = client.get("/api/user/top-tracks")
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "3"
+    assert client.get("/auth/check").status_code == 429
+
+
+def test_legacy_cookie_serves_api_requests_for_the_session_user(client, stale_profile):
+    client.cookies.set(SESSION_COOKIE, create_session(PROFILE))
+    client.cookies.set("spotify_access_token", "cookie-alice")
+
+    response = client.get("/api/user/profile")
+
+    assert response.status_code == 200
+    assert response.json()["data"]["id"] == "alice"
+
+
+def test_legacy_cookie_of_another_user_is_rejected_by_the_api(client, stale_profile):
+    client.cookies.set(SESSION_COOKIE, create_session(PROFILE))
+    client.cookies.set("spotify_access_token", "cookie-mallory")
+
+    assert client.get("/api/user/profile").status_code == 401
+
+
+@pytest.fixture
+def refreshed_to(monkeypatch, stale_profile) -> list[str]:
+    """Make refreshes return the access token put in the returned list"""
+    access_tokens: list[str] = []
+
+    async def refresh_access_token(refresh_token: str) -> dict:
+        return {"access_token": access_tokens[0], "expires_at": int(time.time()) + 3600}
+
+    monkeypatch.setattr(
+        router.AsyncSpotifyService, "refresh_access_token", staticmethod(refresh_access_token)
+    )
+    return access_tokens
+
+
+def test_refresh_stores_tokens_of_the_session_user(client, refreshed_to):
+    refreshed_to.append("new-alice")
+    login(client)
+    client.cookies.set("spotify_refresh_token", "refresh-alice")
+
+    assert client.post("/auth/refresh").status_code == 200
+    assert asyncio.run(token_manager.get_token("alice")).access_token == "new-alice"
+
+
+def test_refresh_with_another_users_cookie_keeps_the_stored_tokens(client, refreshed_to):
+    refreshed_to.append("new-mallory")
+    login(client)
+    client.cookies.set("spotify_refresh_token", "refresh-mallory")
+
+    response = client.post("/auth/refresh")
+
+    assert response.status_code == 200
+    assert response.json()["access_token"] == "new-mallory"
+    assert asyncio.run(token_manager.get_token("alice")).access_token == "access-alice"
@@ -0,0 +1,88 @@
+"""
+Tests for the in-process TTL/LRU cache
+"""
+
+import pytest
+
+from app.services.cache import memory
+from app.services.cache.memory import TTLCache
+
+
+class FakeClock:
+    """Stands in for the time module so expiry can be tested without sleeping"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    fake = FakeClock()
+    monkeypatch.setattr(memory, "time", fake)
+    return fake
+
+
+def test_get_returns_stored_value():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", {"id": 1})
+
+    assert cache.get("a") == {"id": 1}
+    assert cache.get("missing") is None
+    assert cache.get("missing", "default") == "default"
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" is now least recently used
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+    assert len(cache) == 2
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=120)
+
+    clock.now += 59
+    assert cache.get("a") == 1
+
+    clock.now += 1
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert len(cache) == 1
+
+
+def test_overwrite_renews_ttl(clock):
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("a", 1)
+    clock.now += 50
+    cache.set("a", 2)
+    clock.now += 50
+
+    assert cache.get("a") == 2
+
+
+def test_stats_count_hits_and_misses():
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("a")
+    cache.get("b")
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (2, 1, 1)
+    assert stats["hit_ratio"] == pytest.approx(2 / 3)
+
+    cache.clear()
+    assert cache.stats()["hits"] == 0
+    assert len(cache) == 0
@@ -0,0 +1,105 @@
+"""
+Round-trip tests run against every cache backend
+
+The Redis backend talks to benchmarks.fake_redis, served on a free local port
+for the duration of each test.
+"""
+
+import asyncio
+import socket
+from collections.abc import AsyncIterator
+
+import pytest
+
+from app.services.cache import CacheBackend, MemoryBackend, RedisBackend, SQLiteBackend
+from app.services.cache.redis import RedisClient
+from app.services.cache.sqlite import SQLiteStore
+from benchmarks.fake_redis import serve
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_for_server(port: int) -> None:
+    for _ in range(100):
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+        except OSError:
+            await asyncio.sleep(0.01)
+            continue
+        writer.close()
+        return
+    raise RuntimeError(f"Fake Redis did not start on port {port}")
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+async def backend(request, tmp_path) -> AsyncIterator[CacheBackend]:
+    """A cache namespace on each backend"""
+    if request.param == "memory":
+        yield MemoryBackend("test", maxsize=100, ttl=60)
+    elif request.param == "sqlite":
+        store = SQLiteStore(str(tmp_path / "cache.db"))
+        yield SQLiteBackend(store, "test", maxsize=100, ttl=60)
+        store.close()
+    else:
+        port = free_port()
+        server = asyncio.create_task(serve("127.0.0.1", port))
+        await wait_for_server(port)
+        client = RedisClient(f"redis://127.0.0.1:{port}/1")
+        yield RedisBackend(client, "test", ttl=60, prefix="tests:")
+        await client.close()
+        server.cancel()
+
+
+async def test_values_round_trip(backend):
+    value = {"id": "t1", "name": "Song", "artists": ["A", "B"], "popularity": 71, "explicit": False}
+    await backend.set("track:t1", value)
+    await backend.set("count", 3)
+
+    assert await backend.get("track:t1") == value
+    assert await backend.get("count") == 3
+    assert await backend.get("missing") is None
+
+
+async def test_get_many_omits_missing_keys(backend):
+    await backend.set_many({"a": 1, "b": [1, 2]})
+
+    assert await backend.get_many(["a", "b", "c"]) == {"a": 1, "b": [1, 2]}
+    assert (backend.hits, backend.misses) == (2, 1)
+
+
+async def test_entries_expire(backend):
+    await backend.set("short", "x", ttl=0.05)
+    await backend.set("long", "y")
+    await asyncio.sleep(0.1)
+
+    assert await backend.get("short") is None
+    assert await backend.get("long") == "y"
+
+
+async def test_delete_and_clear(backend):
+    await backend.set_many({"a": 1, "b": 2, "c": 3})
+    await backend.delete("a")
+    assert await backend.get_many(["a", "b", "c"]) == {"b": 2, "c": 3}
+
+    await backend.clear()
+    assert await backend.get_many(["a", "b", "c"]) == {}
+
+
+async def test_namespaces_are_kept_apart(backend):
+    if isinstance(backend, MemoryBackend):
+        pytest.skip("each in-process cache is its own store")
+    other = (
+        SQLiteBackend(backend.store, "other", maxsize=100, ttl=60)
+        if isinstance(backend, SQLiteBackend)
+        else RedisBackend(backend.client, "other", ttl=60, prefix="tests:")
+    )
+    await backend.set("key", "mine")
+    await other.set("key", "theirs")
+    await other.clear()
+
+    assert await backend.get("key") == "mine"
+    assert await other.get("key") is None
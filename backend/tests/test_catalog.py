@@ -0,0 +1,19 @@
+"""
+Tests for the two-tier catalog cache
+"""
+
+from app.services import catalog
+from app.services.cache import MemoryBackend
+from app.services.catalog import CatalogCache
+
+
+async def test_database_tier_reads_more_ids_than_one_batch(database):
+    cache = CatalogCache(MemoryBackend("catalog", maxsize=10, ttl=60), ttl=3600)
+    items = {f"track-{i}": {"id": f"track-{i}"} for i in range(catalog.LOAD_BATCH_SIZE * 2 + 1)}
+    await cache.set_many("track", items)
+    await cache.cache.clear()
+
+    found = await cache.get_many("track", [*items, "missing"])
+
+    assert found == items
+    assert (cache.db_hits, cache.db_misses) == (len(items), 1)
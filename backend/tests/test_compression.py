@@ -0,0 +1,103 @@
+"""
+Tests for negotiated response compression
+"""
+
+import zlib
+
+import pytest
+from starlette.responses import StreamingResponse
+
+from app.middleware import CompressionMiddleware
+from app.middleware.compression import choose_encoding, parse_quality_values
+
+
+def test_parse_quality_values_reads_q_among_other_parameters():
+    assert parse_quality_values("GZIP;q=0.5, br, text/html;level=1;q=0.2, ,x;q=oops") == {
+        "gzip": 0.5,
+        "br": 1.0,
+        "text/html": 0.2,
+        "x": 0.0,
+    }
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        ("", None),
+        ("identity", None),
+        ("gzip", "gzip"),
+        ("gzip, br", "br"),
+        ("br;q=0, gzip", "gzip"),
+        ("br;q=0.0, gzip;q=0.5", "gzip"),
+        ("gzip;q=0", None),
+        ("*", "br"),
+        ("*;q=0.5, br;q=0", "gzip"),
+        ("*;q=0", None),
+    ],
+)
+def test_choose_encoding(accept_encoding, expected):
+    assert choose_encoding(accept_encoding) == expected
+
+
+def test_choose_encoding_without_brotli_installed(monkeypatch):
+    monkeypatch.setattr("app.middleware.compression.brotli", None)
+
+    assert choose_encoding("br, gzip") == "gzip"
+    assert choose_encoding("br") is None
+
+
+async def call(app, accept_encoding: str) -> list[dict]:
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(b"accept-encoding", accept_encoding.encode())],
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    return messages
+
+
+async def test_streaming_response_is_compressed_chunk_by_chunk():
+    lines = [f'{{"n": {i}}}\n'.encode() for i in range(3)]
+
+    async def lines_app(scope, receive, send):
+        async def body():
+            for line in lines:
+                yield line
+
+        await StreamingResponse(body(), media_type="application/x-ndjson")(scope, receive, send)
+
+    messages = await call(CompressionMiddleware(lines_app, minimum_size=1024), "gzip")
+
+    start, *bodies = messages
+    headers = dict(start["headers"])
+    assert headers[b"content-encoding"] == b"gzip"
+    assert b"content-length" not in headers
+
+    # Each line decodes as soon as its chunk arrives, before the stream ends
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    for line, message in zip(lines, bodies):
+        assert message["more_body"] is True
+        assert decoder.decompress(message["body"]) == line
+    assert bodies[-1]["more_body"] is False
+    decoder.decompress(bodies[-1]["body"])
+    assert decoder.eof
+
+
+async def test_small_complete_body_is_sent_uncompressed():
+    async def small_app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"small"})
+
+    messages = await call(CompressionMiddleware(small_app, minimum_size=1024), "gzip")
+
+    assert b"content-encoding" not in dict(messages[0]["headers"])
+    assert messages[1]["body"] == b"small"
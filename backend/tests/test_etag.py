@@ -0,0 +1,113 @@
+"""
+Tests for ETag / If-None-Match conditional responses
+"""
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.etag import ETagRoute, compute_etag, etag_matches
+from app.api.responses import APIResponse
+from app.middleware import CompressionMiddleware
+
+router = APIRouter(route_class=ETagRoute)
+state = {"items": ["a", "b"]}
+
+
+@router.get("/items")
+async def list_items():
+    return {"items": state["items"]}
+
+
+@router.get("/large")
+async def large_document():
+    return {"items": [f"item-{i}" for i in range(500)]}
+
+
+@router.post("/items")
+async def add_item():
+    return {"items": state["items"]}
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(router)
+    state["items"] = ["a", "b"]
+    return TestClient(app)
+
+
+def test_etag_matches_uses_weak_comparison():
+    etag = compute_etag(b"body")
+
+    assert etag_matches(etag, etag)
+    assert etag_matches(etag, f"W/{etag}")
+    assert etag_matches(etag, f'"other", {etag}')
+    assert etag_matches(etag, "*")
+    assert not etag_matches(etag, '"other"')
+
+
+def test_get_response_carries_etag(client):
+    response = client.get("/items")
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] == compute_etag(response.content)
+    assert response.headers["Cache-Control"] == "private, no-cache"
+
+
+def test_matching_if_none_match_returns_304_without_body(client):
+    etag = client.get("/items").headers["ETag"]
+
+    response = client.get("/items", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+
+def test_changed_resource_returns_200_with_new_etag(client):
+    etag = client.get("/items").headers["ETag"]
+    state["items"] = ["a", "b", "c"]
+
+    response = client.get("/items", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json() == {"items": ["a", "b", "c"]}
+
+
+def test_non_get_requests_are_not_tagged(client):
+    response = client.post("/items", headers={"If-None-Match": "*"})
+
+    assert response.status_code == 200
+    assert "ETag" not in response.headers
+
+
+@pytest.fixture
+def compressed_client():
+    app = FastAPI(default_response_class=APIResponse)
+    app.include_router(router)
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+    state["items"] = ["a", "b"]
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("path", ["/large", "/items"])
+def test_304_matches_the_headers_of_the_200(compressed_client, path):
+    full = compressed_client.get(path, headers={"Accept-Encoding": "gzip"})
+
+    response = compressed_client.get(
+        path, headers={"Accept-Encoding": "gzip", "If-None-Match": full.headers["ETag"]}
+    )
+
+    assert response.status_code == 304
+    for name in ("ETag", "Vary", "Cache-Control"):
+        assert response.headers.get(name) == full.headers.get(name)
+
+
+def test_compressed_representation_gets_weak_etag(compressed_client):
+    response = compressed_client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["ETag"].startswith("W/")
+    assert response.headers["Vary"] == "Accept, Accept-Encoding"
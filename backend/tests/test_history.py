@@ -0,0 +1,77 @@
+"""
+Tests for play ingestion and the rollups it maintains
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from app.services.history import get_cursor, get_plays, play_row, store_plays
+from app.services.rollups import range_totals
+
+DAY = date(2024, 5, 1)
+
+
+def item(played_at: str, track_id: str, artist_id: str = "artist-1") -> dict:
+    return {
+        "played_at": played_at,
+        "track": {
+            "id": track_id,
+            "name": f"Track {track_id}",
+            "artists": [{"id": artist_id, "name": "Artist"}],
+            "album": {"id": "album-1"},
+            "duration_ms": 200_000,
+        },
+    }
+
+
+def rows(count: int, user_id: str = "alice") -> list[dict]:
+    return [
+        play_row(user_id, item(f"2024-05-01T10:{minute:02d}:00.000Z", f"track-{minute % 3}"))
+        for minute in range(count)
+    ]
+
+
+def test_plays_are_stored_with_rollups_and_cursor(database):
+    batch = rows(5)
+
+    assert store_plays("alice", batch) == 5
+    assert len(get_plays("alice")) == 5
+    assert get_cursor("alice") == max(row["played_at"] for row in batch)
+
+    totals = range_totals("alice", DAY, date(2024, 5, 2))
+    assert (totals["total_plays"], totals["total_ms_played"]) == (5, 1_000_000)
+    assert {track["id"]: track["plays"] for track in totals["top_tracks"]} == {
+        "track-0": 2,
+        "track-1": 2,
+        "track-2": 1,
+    }
+    assert totals["top_artists"] == [{"id": "artist-1", "plays": 5, "ms_played": 1_000_000}]
+
+
+def test_storing_the_same_plays_again_counts_them_once(database):
+    batch = rows(5)
+    store_plays("alice", batch[:3])
+
+    assert store_plays("alice", batch) == 2
+    assert store_plays("alice", batch) == 0
+    assert range_totals("alice", DAY, date(2024, 5, 2))["total_plays"] == 5
+
+
+def test_concurrent_syncs_of_the_same_plays_count_them_once(database):
+    batch = rows(20)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        inserted = list(pool.map(lambda _: store_plays("alice", batch), range(8)))
+
+    assert sum(inserted) == 20
+    assert len(get_plays("alice", limit=100)) == 20
+    totals = range_totals("alice", DAY, date(2024, 5, 2))
+    assert (totals["total_plays"], totals["total_ms_played"]) == (20, 4_000_000)
+    assert sum(track["plays"] for track in totals["top_tracks"]) == 20
+
+
+def test_duplicates_within_a_batch_are_stored_once(database):
+    batch = rows(2)
+
+    assert store_plays("alice", batch + batch) == 2
+    assert range_totals("alice", DAY, date(2024, 5, 2))["total_plays"] == 2
@@ -0,0 +1,65 @@
+"""
+Tests for the Prometheus metrics registry
+"""
+
+import pytest
+
+from app.services.metrics import CollectedMetric, Metric, MetricsRegistry
+
+
+def test_histogram_renders_cumulative_buckets_with_inf():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value, "/a")
+
+    assert registry.render() == (
+        "# HELP latency_seconds Latency\n"
+        "# TYPE latency_seconds histogram\n"
+        'latency_seconds_bucket{route="/a",le="0.1"} 2\n'
+        'latency_seconds_bucket{route="/a",le="1"} 3\n'
+        'latency_seconds_bucket{route="/a",le="+Inf"} 4\n'
+        'latency_seconds_count{route="/a"} 4\n'
+        'latency_seconds_sum{route="/a"} 3.65\n'
+    )
+
+
+def test_counters_gauges_and_collectors_are_rendered():
+    registry = MetricsRegistry()
+    registry.counter("requests_total", "Requests", ("status",)).inc("200", amount=2)
+    registry.gauge("in_flight", "In flight").set(1.5)
+    registry.add_collector(
+        lambda: [CollectedMetric("cache_hits", "Hits", "counter", [("cache_hits", {}, 7)])]
+    )
+
+    assert registry.render().splitlines() == [
+        "# HELP requests_total Requests",
+        "# TYPE requests_total counter",
+        'requests_total{status="200"} 2',
+        "# HELP in_flight In flight",
+        "# TYPE in_flight gauge",
+        "in_flight 1.5",
+        "# HELP cache_hits Hits",
+        "# TYPE cache_hits counter",
+        "cache_hits 7",
+    ]
+
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry()
+    registry.counter("errors_total", "Errors", ("message",)).inc('bad "quote"\\\n')
+
+    assert 'errors_total{message="bad \\"quote\\"\\\\\\n"} 1' in registry.render()
+
+
+def test_duplicate_names_are_rejected():
+    registry = MetricsRegistry()
+    registry.counter("requests_total", "Requests")
+
+    with pytest.raises(ValueError):
+        registry.gauge("requests_total", "Requests")
+
+
+def test_metric_base_class_is_abstract():
+    with pytest.raises(TypeError):
+        Metric("plain", "No samples")
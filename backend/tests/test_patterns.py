@@ -0,0 +1,102 @@
+"""
+Tests for vectorized listening pattern stats
+"""
+
+from datetime import datetime, timezone
+
+import numpy as np
+
+from app.services.analytics.patterns import detect_sessions, listening_patterns, session_stats
+from app.services.analytics.plays import PlayArrays
+
+MINUTE = 60 * 1000
+
+
+def ms(*args) -> int:
+    """Unix ms for a UTC date and time"""
+    return int(datetime(*args, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def plays(played_at: list[int], duration_ms: int = 3 * MINUTE) -> PlayArrays:
+    count = len(played_at)
+    return PlayArrays(
+        played_at=np.array(played_at, dtype=np.int64),
+        duration_ms=np.full(count, duration_ms, dtype=np.int64),
+        track_id=np.array([f"t{i % 2}" for i in range(count)], dtype=object),
+        artist_id=np.array(["a"] * count, dtype=object),
+    )
+
+
+def test_session_splits_only_when_silence_exceeds_the_gap():
+    # Silences after each 3 minute play: exactly 30 minutes, then 30 minutes and 1 ms
+    start = [0, 33 * MINUTE, 66 * MINUTE + 1]
+    durations = np.full(3, 3 * MINUTE, dtype=np.int64)
+
+    sessions = detect_sessions(np.array(start, dtype=np.int64), durations, 30 * MINUTE)
+
+    assert sessions.tolist() == [0, 0, 1]
+
+
+def test_detect_sessions_of_no_plays():
+    empty = np.empty(0, dtype=np.int64)
+
+    assert detect_sessions(empty, empty, 30 * MINUTE).tolist() == []
+
+
+def test_session_stats_measure_from_first_start_to_last_end():
+    stats = session_stats(plays([0, 5 * MINUTE, 120 * MINUTE]), 30 * MINUTE)
+
+    assert stats == {
+        "count": 2,
+        "average_length_ms": (8 * MINUTE + 3 * MINUTE) // 2,
+        "longest_length_ms": 8 * MINUTE,
+    }
+
+
+def test_session_stats_of_no_plays():
+    assert session_stats(plays([]), 30 * MINUTE) == {
+        "count": 0,
+        "average_length_ms": 0,
+        "longest_length_ms": 0,
+    }
+
+
+def test_patterns_are_bucketed_in_the_requested_time_zone():
+    # 23:30 UTC on Sunday 31 March 2024 is 01:30 on Monday 1 April in Stockholm
+    history = plays([ms(2024, 3, 31, 23, 30)])
+
+    utc = listening_patterns(history, tz="UTC")
+    stockholm = listening_patterns(history, tz="Europe/Stockholm")
+
+    assert utc["peak_hour"] == 23
+    assert utc["peak_weekday"] == "Sunday"
+    assert utc["most_active_month"] == {"month": "2024-03", "plays": 1}
+    assert stockholm["peak_hour"] == 1
+    assert stockholm["by_hour"][1] == 1
+    assert stockholm["peak_weekday"] == "Monday"
+    assert stockholm["most_active_month"] == {"month": "2024-04", "plays": 1}
+
+
+def test_most_active_month_has_the_most_plays():
+    history = plays(
+        [ms(2023, 12, 31, 12), ms(2024, 1, 2, 12), ms(2024, 1, 3, 12), ms(2024, 2, 1, 12)]
+    )
+
+    patterns = listening_patterns(history)
+
+    assert patterns["most_active_month"] == {"month": "2024-01", "plays": 2}
+    assert patterns["total_plays"] == 4
+    assert patterns["total_listening_ms"] == 4 * 3 * MINUTE
+    assert patterns["unique_tracks"] == 2
+    assert patterns["sessions"]["count"] == 4
+
+
+def test_patterns_of_no_plays():
+    patterns = listening_patterns(plays([]), tz="Europe/Stockholm")
+
+    assert patterns["total_plays"] == 0
+    assert patterns["by_hour"] == [0] * 24
+    assert patterns["peak_hour"] is None
+    assert patterns["peak_weekday"] is None
+    assert patterns["most_active_month"] is None
+    assert patterns["sessions"]["count"] == 0
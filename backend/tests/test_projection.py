@@ -0,0 +1,89 @@
+"""
+Tests for ?fields= parsing and projection of Spotify objects
+"""
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.fields import FieldSelection
+from app.services.projection import parse_fields, project, slim
+
+TRACK = {
+    "id": "t1",
+    "name": "Song",
+    "popularity": 70,
+    "available_markets": ["SE", "US"],
+    "album": {"id": "a1", "name": "Album", "images": [{"url": "https://i/1"}]},
+    "artists": [{"id": "r1", "name": "One", "uri": "u1"}, {"id": "r2", "name": "Two"}],
+}
+
+
+def test_parse_nests_dotted_paths():
+    assert parse_fields("id, name,album.name,album.images,artists.name") == {
+        "id": None,
+        "name": None,
+        "album": {"name": None, "images": None},
+        "artists": {"name": None},
+    }
+
+
+def test_parse_whole_field_wins_over_a_narrower_path():
+    assert parse_fields("album,album.name") == {"album": None}
+    assert parse_fields("album.name,album") == {"album": None}
+
+
+def test_parse_skips_empty_paths():
+    assert parse_fields("id,,name.,.x") == {"id": None}
+
+
+@pytest.mark.parametrize("fields", ["", ",", " , ", "a..b", "."])
+def test_parse_rejects_lists_without_fields(fields):
+    with pytest.raises(ValueError):
+        parse_fields(fields)
+
+
+def test_project_applies_paths_to_every_list_element():
+    assert project(TRACK, parse_fields("id,album.name,artists.name,missing")) == {
+        "id": "t1",
+        "album": {"name": "Album"},
+        "artists": [{"name": "One"}, {"name": "Two"}],
+    }
+    assert project([TRACK], parse_fields("id")) == [{"id": "t1"}]
+    assert project(TRACK, None) is TRACK
+
+
+def test_slim_drops_market_lists():
+    assert "available_markets" not in slim({"items": [TRACK]})["items"][0]
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI()
+
+    @app.get("/items")
+    async def items(selection=Depends(FieldSelection("id,name"))):
+        return project([TRACK], selection)
+
+    return TestClient(app)
+
+
+def test_compact_view_is_the_default(client):
+    assert client.get("/items").json() == [{"id": "t1", "name": "Song"}]
+
+
+def test_fields_parameter_wins_over_view(client):
+    response = client.get("/items", params={"fields": "album.name", "view": "full"})
+
+    assert response.json() == [{"album": {"name": "Album"}}]
+
+
+def test_full_view_returns_the_whole_object(client):
+    assert client.get("/items", params={"view": "full"}).json() == [TRACK]
+
+
+@pytest.mark.parametrize("params", [{"fields": ",."}, {"view": "tiny"}])
+def test_invalid_selection_is_a_400(client, params):
+    response = client.get("/items", params=params)
+
+    assert response.status_code == 400
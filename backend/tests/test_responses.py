@@ -0,0 +1,37 @@
+"""
+Tests for response media type negotiation
+"""
+
+import pytest
+
+from app.api.responses import negotiate_media_type
+
+
+@pytest.mark.parametrize(
+    "accept, expected",
+    [
+        ("", "application/json"),
+        ("*/*", "application/json"),
+        ("application/json", "application/json"),
+        ("application/msgpack", "application/msgpack"),
+        ("application/x-msgpack", "application/x-msgpack"),
+        ("application/msgpack, application/json", "application/msgpack"),
+        ("application/msgpack;q=0.9, */*;q=0.1", "application/msgpack"),
+        ("application/msgpack;q=0.5, application/json", "application/json"),
+        ("application/json;q=0.5, application/msgpack;q=0.8", "application/msgpack"),
+        ("application/msgpack;q=0", "application/json"),
+        ("application/msgpack;q=0.0", "application/json"),
+        ("application/msgpack; q=0.000", "application/json"),
+        ("application/msgpack;q=0.05", "application/msgpack"),
+        ("application/msgpack;q=bogus", "application/json"),
+        ("application/x-msgpack;q=0.2, application/msgpack;q=0.7", "application/msgpack"),
+    ],
+)
+def test_negotiate_media_type_compares_q_values(accept, expected):
+    assert negotiate_media_type(accept) == expected
+
+
+def test_msgpack_falls_back_to_json_when_not_installed(monkeypatch):
+    monkeypatch.setattr("app.api.responses.msgpack", None)
+
+    assert negotiate_media_type("application/msgpack") == "application/json"
@@ -0,0 +1,124 @@
+"""
+Tests for the rate-limit-aware upstream scheduler
+"""
+
+import asyncio
+import time
+
+import httpx
+
+from app.services.scheduler import Priority, UpstreamScheduler
+
+
+def make_scheduler(**overrides) -> UpstreamScheduler:
+    options = {
+        "rate": 1000.0,
+        "burst": 100,
+        "max_retries": 3,
+        "backoff": 0.0,
+        "max_backoff": 0.0,
+        "max_retry_after": 5.0,
+    }
+    return UpstreamScheduler(**{**options, **overrides})
+
+
+def responses(*items: httpx.Response):
+    """Request function returning the given responses in order, counting calls"""
+    queue = list(items)
+
+    async def request() -> httpx.Response:
+        request.calls += 1
+        return queue.pop(0)
+
+    request.calls = 0
+    return request
+
+
+async def test_429_pauses_for_retry_after_then_retries():
+    scheduler = make_scheduler()
+    request = responses(
+        httpx.Response(429, headers={"Retry-After": "0.2"}), httpx.Response(200, text="ok")
+    )
+
+    started = time.monotonic()
+    response = await scheduler.send(request)
+
+    assert response.status_code == 200
+    assert time.monotonic() - started >= 0.2
+    assert request.calls == 2
+    assert (scheduler.throttled, scheduler.retries) == (1, 1)
+
+
+async def test_429_pauses_other_requests_too():
+    scheduler = make_scheduler()
+    limited = responses(httpx.Response(429, headers={"Retry-After": "0.2"}), httpx.Response(200))
+    other = responses(httpx.Response(200))
+
+    first = asyncio.create_task(scheduler.send(limited))
+    await asyncio.sleep(0.05)
+    started = time.monotonic()
+    await scheduler.send(other)
+
+    assert time.monotonic() - started >= 0.1
+    assert (await first).status_code == 200
+
+
+async def test_retry_after_beyond_limit_is_returned_and_fails_fast():
+    scheduler = make_scheduler(max_retry_after=1.0)
+    request = responses(httpx.Response(429, headers={"Retry-After": "30"}))
+
+    response = await scheduler.send(request)
+    assert response.status_code == 429
+    assert request.calls == 1
+
+    # While paused, interactive requests get a synthesized 429 without going upstream
+    blocked = responses(httpx.Response(200))
+    response = await scheduler.send(blocked, Priority.INTERACTIVE)
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) > 1
+    assert blocked.calls == 0
+
+
+async def test_missing_or_malformed_retry_after_defaults_to_one_second():
+    scheduler = make_scheduler(max_retries=0)
+    request = responses(httpx.Response(429, headers={"Retry-After": "soon"}))
+
+    response = await scheduler.send(request)
+
+    assert response.status_code == 429
+    assert 0.5 < scheduler.stats()["paused_for"] <= 1.0
+
+
+async def test_server_errors_are_retried_until_max_retries():
+    scheduler = make_scheduler(max_retries=2)
+    request = responses(httpx.Response(503), httpx.Response(503), httpx.Response(503))
+
+    response = await scheduler.send(request)
+
+    assert response.status_code == 503
+    assert request.calls == 3
+    assert scheduler.retries == 2
+
+
+async def test_client_errors_are_not_retried():
+    scheduler = make_scheduler()
+    request = responses(httpx.Response(404))
+
+    assert (await scheduler.send(request)).status_code == 404
+    assert request.calls == 1
+
+
+async def test_interactive_requests_are_dispatched_before_background():
+    scheduler = make_scheduler(rate=20.0, burst=1)
+    await scheduler.acquire()  # Empty the bucket so the next two have to queue
+    order = []
+
+    async def acquire(priority: Priority) -> None:
+        await scheduler.acquire(priority)
+        order.append(priority)
+
+    background = asyncio.create_task(acquire(Priority.BACKGROUND))
+    interactive = asyncio.create_task(acquire(Priority.INTERACTIVE))
+    await asyncio.gather(background, interactive)
+
+    assert order == [Priority.INTERACTIVE, Priority.BACKGROUND]
@@ -0,0 +1,96 @@
+"""
+Tests for single-flight request coalescing
+"""
+
+import asyncio
+
+import pytest
+
+from app.services.singleflight import SingleFlight
+
+
+class Upstream:
+    """Counts calls and holds each one until released"""
+
+    def __init__(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def fetch(self, value="result"):
+        self.calls += 1
+        await self.release.wait()
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+
+async def test_concurrent_calls_with_same_key_share_one_call():
+    flights = SingleFlight()
+    upstream = Upstream()
+
+    callers = [asyncio.create_task(flights.do("key", upstream.fetch)) for _ in range(5)]
+    await asyncio.sleep(0)
+    assert len(flights) == 1
+    upstream.release.set()
+
+    assert await asyncio.gather(*callers) == ["result"] * 5
+    assert upstream.calls == 1
+    assert flights.stats() == {"calls": 1, "coalesced": 4, "in_flight": 0}
+
+
+async def test_different_keys_are_not_coalesced():
+    flights = SingleFlight()
+    upstream = Upstream()
+    upstream.release.set()
+
+    results = await asyncio.gather(
+        flights.do("a", lambda: upstream.fetch("a")),
+        flights.do("b", lambda: upstream.fetch("b")),
+    )
+
+    assert results == ["a", "b"]
+    assert upstream.calls == 2
+
+
+async def test_error_reaches_every_waiting_caller():
+    flights = SingleFlight()
+    upstream = Upstream()
+    error = RuntimeError("upstream failed")
+
+    callers = [
+        asyncio.create_task(flights.do("key", lambda: upstream.fetch(error))) for _ in range(3)
+    ]
+    await asyncio.sleep(0)
+    upstream.release.set()
+    results = await asyncio.gather(*callers, return_exceptions=True)
+
+    assert results == [error] * 3
+    assert upstream.calls == 1
+    assert len(flights) == 0
+
+
+async def test_key_is_released_after_the_call_finishes():
+    flights = SingleFlight()
+    upstream = Upstream()
+    upstream.release.set()
+
+    await flights.do("key", upstream.fetch)
+    await flights.do("key", upstream.fetch)
+
+    assert upstream.calls == 2
+
+
+async def test_cancelled_caller_does_not_cancel_shared_call():
+    flights = SingleFlight()
+    upstream = Upstream()
+
+    first = asyncio.create_task(flights.do("key", upstream.fetch))
+    second = asyncio.create_task(flights.do("key", upstream.fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+    upstream.release.set()
+
+    assert await second == "result"
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    assert upstream.calls == 1
@@ -0,0 +1,188 @@
+"""
+Tests for the async Spotify client
+"""
+
+import asyncio
+import inspect
+
+import httpx
+import pytest
+
+from app.api.user import router
+from app.services.catalog import catalog_cache
+from app.services.spotify_async import (
+    AUDIO_FEATURES_BATCH_SIZE,
+    PAGE_SIZE,
+    AsyncSpotifyService,
+    SpotifyAPIError,
+)
+
+
+def spotify_client(handler) -> httpx.AsyncClient:
+    """httpx client answering every request with handler"""
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def test_user_routes_are_async():
+    sync_routes = [
+        route.path for route in router.routes if not inspect.iscoroutinefunction(route.endpoint)
+    ]
+    assert sync_routes == []
+
+
+async def test_get_sends_bearer_token():
+    seen = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen["authorization"] = request.headers["Authorization"]
+        seen["path"] = request.url.path
+        return httpx.Response(200, json={"id": "alice"})
+
+    async with spotify_client(handler) as client:
+        service = AsyncSpotifyService(access_token="token-1", client=client)
+        assert await service._get("/me") == {"id": "alice"}
+
+    assert seen == {"authorization": "Bearer token-1", "path": "/v1/me"}
+
+
+async def test_error_response_raises_spotify_api_error():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(404, json={"error": {"status": 404, "message": "Not found"}})
+
+    async with spotify_client(handler) as client:
+        service = AsyncSpotifyService(access_token="token-2", client=client)
+        with pytest.raises(SpotifyAPIError) as excinfo:
+            await service._get("/tracks/missing")
+
+    assert excinfo.value.status_code == 404
+    assert excinfo.value.message == "Not found"
+
+
+def catalog_handler(tokens: list[str], release: asyncio.Event):
+    """Serve a track to valid tokens only, holding each request until released"""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        token = request.headers["Authorization"].removeprefix("Bearer ")
+        tokens.append(token)
+        await release.wait()
+        if token == "expired":
+            return httpx.Response(401, json={"error": {"status": 401, "message": "Expired"}})
+        return httpx.Response(200, json={"id": "t1"})
+
+    return handler
+
+
+async def test_shared_lookup_rejected_for_another_users_token_is_retried():
+    tokens, release = [], asyncio.Event()
+
+    async with spotify_client(catalog_handler(tokens, release)) as client:
+        expired = AsyncSpotifyService(access_token="expired", client=client)
+        valid = AsyncSpotifyService(access_token="valid", client=client)
+        first = asyncio.create_task(expired._get("/tracks/t1", shared=True))
+        await asyncio.sleep(0.01)
+        second = asyncio.create_task(valid._get("/tracks/t1", shared=True))
+        await asyncio.sleep(0.01)
+        release.set()
+
+        with pytest.raises(SpotifyAPIError) as excinfo:
+            await first
+        assert await second == {"id": "t1"}
+
+    assert excinfo.value.status_code == 401
+    assert tokens == ["expired", "valid"]
+
+
+async def test_shared_lookup_is_coalesced_across_users():
+    tokens, release = [], asyncio.Event()
+
+    async with spotify_client(catalog_handler(tokens, release)) as client:
+        callers = [
+            AsyncSpotifyService(access_token=token, client=client)._get("/tracks/t1", shared=True)
+            for token in ("valid", "other")
+        ]
+        gathered = asyncio.gather(*callers)
+        await asyncio.sleep(0.01)
+        release.set()
+
+        assert await gathered == [{"id": "t1"}, {"id": "t1"}]
+
+    assert tokens == ["valid"]
+
+
+@pytest.fixture
+def empty_catalog(database):
+    """Start with an empty catalog cache in both tiers"""
+    asyncio.run(catalog_cache.cache.clear())
+    yield
+    asyncio.run(catalog_cache.cache.clear())
+
+
+def audio_features_handler(batches: list[list[str]]):
+    """Serve audio features for IDs starting with "t", recording each batch of IDs"""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        ids = request.url.params["ids"].split(",")
+        batches.append(ids)
+        features = [{"id": tid, "energy": 0.5} if tid.startswith("t") else None for tid in ids]
+        return httpx.Response(200, json={"audio_features": features})
+
+    return handler
+
+
+async def test_audio_features_are_fetched_once_per_id_in_full_batches(empty_catalog):
+    unique = [f"t{i}" for i in range(AUDIO_FEATURES_BATCH_SIZE * 2 + 10)]
+    batches = []
+
+    async with spotify_client(audio_features_handler(batches)) as client:
+        service = AsyncSpotifyService(access_token="token-3", client=client)
+        await service.get_audio_features([*unique, *unique[:20]])
+
+    assert [len(batch) for batch in batches] == [100, 100, 10]
+    assert sorted(tid for batch in batches for tid in batch) == sorted(unique)
+
+
+async def test_audio_features_keep_input_order_and_duplicates(empty_catalog):
+    batches = []
+
+    async with spotify_client(audio_features_handler(batches)) as client:
+        service = AsyncSpotifyService(access_token="token-4", client=client)
+        features = await service.get_audio_features(["t2", "t1", "unknown", "t2"])
+
+    assert [item["id"] for item in features] == ["t2", "t1", "t2"]
+    assert batches == [["t2", "t1", "unknown"]]
+
+
+async def test_cached_audio_features_skip_upstream(empty_catalog):
+    batches = []
+
+    async with spotify_client(audio_features_handler(batches)) as client:
+        service = AsyncSpotifyService(access_token="token-5", client=client)
+        await service.get_audio_features(["t1", "t2"])
+        features = await service.get_audio_features(["t3", "t2", "t1"])
+
+    assert [item["id"] for item in features] == ["t3", "t2", "t1"]
+    assert batches == [["t1", "t2"], ["t3"]]
+
+
+def library_handler(total: int, offsets: list[int]):
+    """Serve a paginated library of total items, recording each requested offset"""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        offset, limit = int(request.url.params["offset"]), int(request.url.params["limit"])
+        offsets.append(offset)
+        items = [{"id": f"t{i}"} for i in range(offset, min(offset + limit, total))]
+        return httpx.Response(200, json={"items": items, "total": total})
+
+    return handler
+
+
+async def test_every_page_is_fetched_once():
+    total, offsets = PAGE_SIZE * 4 + 7, []
+
+    async with spotify_client(library_handler(total, offsets)) as client:
+        service = AsyncSpotifyService(access_token="token-6", client=client)
+        items = [item async for item in service.iter_saved_tracks()]
+
+    assert offsets[0] == 0
+    assert sorted(offsets) == list(range(0, total, PAGE_SIZE))
+    assert sorted(int(item["id"][1:]) for item in items) == list(range(total))
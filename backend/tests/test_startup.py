@@ -0,0 +1,25 @@
+"""
+Tests that importing the API stays fast and leaves heavy modules unloaded
+
+Each import runs in a fresh interpreter, as the startup benchmark does.
+"""
+
+import os
+
+from benchmarks.startup import IMPORT_BUDGET_MS, app_env, measure_import
+
+RUNS = 3
+
+# Shared CI runners are noisy, so the test allows twice the benchmark budget;
+# STARTUP_IMPORT_BUDGET_MS overrides it for slower or faster machines
+BUDGET_MS = float(os.environ.get("STARTUP_IMPORT_BUDGET_MS", IMPORT_BUDGET_MS * 2))
+
+
+def test_import_loads_no_heavy_modules_and_fits_the_budget(tmp_path):
+    env = {**app_env(str(tmp_path)), "WARM_UP_IMPORTS": "false"}
+    probes = [measure_import(env) for _ in range(RUNS)]
+
+    assert probes[0]["eager"] == [], "imported by app.main: " + ", ".join(probes[0]["eager"])
+    # The fastest run is the least disturbed by other load on the machine
+    fastest = min(probe["ms"] for probe in probes)
+    assert fastest < BUDGET_MS, f"import app.main took {fastest:.0f} ms (budget {BUDGET_MS:.0f})"
@@ -0,0 +1,69 @@
+"""
+Tests for the Server-Timing header and the slow-request log
+"""
+
+import json
+import logging
+
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.responses import NegotiatedRoute
+from app.middleware import ServerTimingMiddleware
+from app.services.timing import span
+
+router = APIRouter(route_class=NegotiatedRoute)
+
+
+@router.get("/work")
+async def work():
+    for _ in range(2):
+        with span("lookup"):
+            pass
+    return {"done": True}
+
+
+def timed_client(**options) -> TestClient:
+    app = FastAPI()
+    app.include_router(router)
+    app.add_middleware(ServerTimingMiddleware, **options)
+    return TestClient(app)
+
+
+def span_names(header: str) -> list[str]:
+    return [entry.split(";")[0] for entry in header.split(", ")]
+
+
+def test_server_timing_header_lists_spans_and_total():
+    response = timed_client().get("/work")
+
+    header = response.headers["Server-Timing"]
+    assert span_names(header) == ["lookup", "endpoint", "serialize", "total"]
+    assert "lookup;dur=" in header and ';desc="2x"' in header
+
+
+def test_server_timing_header_can_be_disabled():
+    response = timed_client(send_header=False).get("/work")
+
+    assert response.status_code == 200
+    assert "Server-Timing" not in response.headers
+
+
+def test_slow_request_is_logged_as_json(caplog):
+    with caplog.at_level(logging.WARNING, logger="app.slow_requests"):
+        timed_client(slow_request_threshold_ms=0.001).get("/work?x=1")
+
+    [record] = [json.loads(r.getMessage()) for r in caplog.records if r.name == "app.slow_requests"]
+    assert record["event"] == "slow_request"
+    assert (record["method"], record["path"], record["route"]) == ("GET", "/work", "/work")
+    assert record["status"] == 200
+    assert record["spans"]["lookup"]["count"] == 2
+    assert record["duration_ms"] >= 0
+
+
+def test_fast_request_is_not_logged(caplog):
+    with caplog.at_level(logging.WARNING, logger="app.slow_requests"):
+        timed_client(slow_request_threshold_ms=60_000).get("/work")
+        timed_client(slow_request_threshold_ms=0).get("/work")
+
+    assert not [r for r in caplog.records if r.name == "app.slow_requests"]
@@ -0,0 +1,110 @@
+"""
+Tests for the token manager and what it keeps in the token cache
+"""
+
+import time
+
+import httpx
+import pytest
+
+from app.auth import tokens
+from app.auth.tokens import TokenManager
+from app.services.cache import MemoryBackend
+from app.services.spotify_async import SpotifyAPIError
+from app.services.users import get_user, save_user_tokens
+
+
+@pytest.fixture
+def manager() -> TokenManager:
+    return TokenManager(refresh_margin=300, cache=MemoryBackend("token", maxsize=10, ttl=3600))
+
+
+def token_info(access: str, refresh: str = "", expires_in: int = 3600) -> dict:
+    info = {"access_token": access, "expires_at": int(time.time()) + expires_in}
+    if refresh:
+        info["refresh_token"] = refresh
+    return info
+
+
+async def test_cache_never_holds_the_refresh_token(database, manager):
+    await manager.store("alice", token_info("access-1", "refresh-secret"), "Alice")
+
+    assert await manager.cache.get("alice") == {
+        "access_token": "access-1",
+        "expires_at": get_user("alice").expires_at,
+    }
+
+    await manager.cache.clear()
+    assert (await manager.get_token("alice")).access_token == "access-1"
+    assert "refresh_token" not in await manager.cache.get("alice")
+
+
+async def test_expiring_token_is_refreshed_with_the_stored_refresh_token(
+    database, manager, monkeypatch
+):
+    save_user_tokens("alice", token_info("access-1", "refresh-secret", expires_in=10))
+    exchanged = []
+
+    async def refresh_access_token(refresh_token: str) -> dict:
+        exchanged.append(refresh_token)
+        return token_info("access-2")
+
+    monkeypatch.setattr(
+        tokens.AsyncSpotifyService, "refresh_access_token", staticmethod(refresh_access_token)
+    )
+
+    token = await manager.get_token("alice")
+
+    assert exchanged == ["refresh-secret"]
+    assert token.access_token == "access-2"
+    assert get_user("alice").refresh_token == "refresh-secret"
+    assert (await manager.cache.get("alice"))["access_token"] == "access-2"
+
+
+def refresh_failing_with(monkeypatch, error: Exception) -> list[str]:
+    """Make the token endpoint fail and record the refresh tokens sent to it"""
+    exchanged = []
+
+    async def refresh_access_token(refresh_token: str) -> dict:
+        exchanged.append(refresh_token)
+        raise error
+
+    monkeypatch.setattr(
+        tokens.AsyncSpotifyService, "refresh_access_token", staticmethod(refresh_access_token)
+    )
+    return exchanged
+
+
+async def test_rejected_refresh_token_means_logged_out(database, manager, monkeypatch):
+    save_user_tokens("alice", token_info("access-1", "revoked", expires_in=-10))
+    exchanged = refresh_failing_with(monkeypatch, SpotifyAPIError(400, "invalid_grant"))
+
+    assert await manager.get_token("alice") is None
+    assert get_user("alice").refresh_token == ""
+
+    # The rejected token is not sent again on every request
+    assert await manager.get_token("alice") is None
+    assert exchanged == ["revoked"]
+
+
+async def test_rejected_refresh_keeps_a_token_that_has_not_expired(database, manager, monkeypatch):
+    save_user_tokens("alice", token_info("access-1", "revoked", expires_in=10))
+    refresh_failing_with(monkeypatch, SpotifyAPIError(400, "invalid_grant"))
+
+    assert (await manager.get_token("alice")).access_token == "access-1"
+
+
+@pytest.mark.parametrize(
+    "error", [SpotifyAPIError(503, "Service unavailable"), httpx.ConnectError("refused")]
+)
+async def test_other_refresh_failures_are_raised(database, manager, monkeypatch, error):
+    save_user_tokens("alice", token_info("access-1", "refresh-secret", expires_in=-10))
+    refresh_failing_with(monkeypatch, error)
+
+    with pytest.raises(type(error)):
+        await manager.get_token("alice")
+    assert get_user("alice").refresh_token == "refresh-secret"
+
+
+async def test_unknown_user_has_no_token(database, manager):
+    assert await manager.get_token("nobody") is None
@@ -0,0 +1,142 @@
+"""
+Tests for the user API endpoints against a mocked Spotify API
+"""
+
+import asyncio
+from collections.abc import Callable, Iterator
+from typing import Optional
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import user
+from app.api.responses import APIResponse
+from app.auth.session import SESSION_COOKIE, create_session
+from app.services.cache import user_cache
+from app.services.spotify_async import PAGE_SIZE, AsyncSpotifyService
+
+Handler = Callable[[httpx.Request], httpx.Response]
+
+
+def spotify_error(status_code: int) -> httpx.Response:
+    return httpx.Response(status_code, json={"error": {"status": status_code, "message": "Failed"}})
+
+
+@pytest.fixture
+def spotify() -> Iterator[Callable[[Handler], TestClient]]:
+    """Build a test client whose Spotify calls are answered by a handler"""
+    clients = []
+
+    def make(handler: Handler) -> TestClient:
+        spotify_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        app = FastAPI(default_response_class=APIResponse)
+        app.include_router(user.router, prefix="/api/user")
+        app.dependency_overrides[user.get_spotify_service] = lambda: AsyncSpotifyService(
+            access_token="token", client=spotify_client, user_id="alice"
+        )
+        clients.append(TestClient(app))
+        return clients[-1]
+
+    yield make
+    for client in clients:
+        client.close()
+    asyncio.run(user_cache.clear())
+
+
+def saved_tracks(total: int, failing_offset: int = -1) -> Handler:
+    """Serve total saved tracks, failing the page at failing_offset"""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        offset = int(request.url.params["offset"])
+        if offset == failing_offset:
+            return spotify_error(404 if offset else 401)
+        items = [
+            {"added_at": "2024-01-01T00:00:00Z", "track": {"id": f"t{i}", "name": f"Track {i}"}}
+            for i in range(offset, min(offset + PAGE_SIZE, total))
+        ]
+        return httpx.Response(200, json={"items": items, "total": total})
+
+    return handler
+
+
+def test_all_saved_tracks_are_streamed_as_ndjson(spotify):
+    response = spotify(saved_tracks(PAGE_SIZE * 2 + 5)).get("/api/user/saved-tracks/all")
+
+    assert response.status_code == 200
+    assert response.headers["Content-Type"] == "application/x-ndjson"
+    lines = response.text.splitlines()
+    assert len(lines) == PAGE_SIZE * 2 + 5
+    assert '"error"' not in response.text
+
+
+def test_first_page_error_is_an_error_status(spotify):
+    response = spotify(saved_tracks(PAGE_SIZE * 2, failing_offset=0)).get(
+        "/api/user/saved-tracks/all"
+    )
+
+    assert response.status_code == 401
+    assert response.headers["Content-Type"] == "application/json"
+
+
+def test_error_after_streaming_started_ends_with_an_error_line(spotify):
+    response = spotify(saved_tracks(PAGE_SIZE * 3, failing_offset=PAGE_SIZE)).get(
+        "/api/user/saved-tracks/all"
+    )
+
+    assert response.status_code == 200
+    lines = response.text.splitlines()
+    assert lines[-1] == '{"error":"Failed to fetch saved tracks"}'
+    assert len(lines) > PAGE_SIZE
+
+
+PROFILE = {"id": "alice", "display_name": "Alice"}
+
+
+def summary_sections(failing: tuple[str, ...] = (), seen: Optional[list[str]] = None) -> Handler:
+    """Serve every summary section, failing requests whose path ends with one in failing"""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path.removeprefix("/v1")
+        if seen is not None:
+            seen.append(path)
+        if path.endswith(failing):
+            return spotify_error(404)
+        if path == "/me":
+            return httpx.Response(200, json=PROFILE)
+        return httpx.Response(200, json={"items": [{"id": f"{path}-1"}]})
+
+    return handler
+
+
+def test_summary_sections_that_fail_are_null_and_listed(spotify):
+    response = spotify(summary_sections(failing=("/top/artists",))).get("/api/user/summary")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["data"]["profile"]["id"] == "alice"
+    assert body["data"]["top_artists"] == {tr: None for tr in user.TIME_RANGES}
+    assert all(body["data"]["top_tracks"][tr] for tr in user.TIME_RANGES)
+    assert len(body["data"]["recently_played"]) == 1
+    assert sorted(body["errors"]) == [f"top_artists.{tr}" for tr in sorted(user.TIME_RANGES)]
+
+
+def test_summary_fails_when_every_section_fails(spotify):
+    failing = ("/me", "/top/tracks", "/top/artists", "/recently-played")
+
+    response = spotify(summary_sections(failing=failing)).get("/api/user/summary")
+
+    assert response.status_code == 500
+    assert response.json()["detail"] == "Failed to fetch summary"
+
+
+def test_summary_profile_comes_from_a_fresh_session(spotify):
+    seen = []
+    client = spotify(summary_sections(seen=seen))
+    client.cookies.set(SESSION_COOKIE, create_session({**PROFILE, "display_name": "Session"}))
+
+    response = client.get("/api/user/summary")
+
+    assert response.json()["data"]["profile"]["display_name"] == "Session"
+    assert "/me" not in seen
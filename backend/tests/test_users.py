@@ -0,0 +1,67 @@
+"""
+Tests for the user store and refresh token encryption at rest
+"""
+
+from sqlalchemy import text
+
+from app.database import engine
+from app.services import encryption
+from app.services.users import get_user, list_user_ids, save_user_tokens
+
+
+def stored_refresh_token(user_id: str) -> str:
+    """Read the raw column value, bypassing decryption"""
+    with engine.connect() as conn:
+        return conn.execute(
+            text("SELECT refresh_token FROM users WHERE id = :id"), {"id": user_id}
+        ).scalar_one()
+
+
+def tokens(access: str, refresh: str = "") -> dict:
+    info = {"access_token": access, "expires_at": 2_000_000_000}
+    if refresh:
+        info["refresh_token"] = refresh
+    return info
+
+
+def test_refresh_token_is_encrypted_at_rest(database):
+    save_user_tokens("alice", tokens("access-1", "refresh-secret"), "Alice")
+
+    raw = stored_refresh_token("alice")
+    assert "refresh-secret" not in raw
+    assert encryption.decrypt(raw) == "refresh-secret"
+    assert get_user("alice").refresh_token == "refresh-secret"
+
+
+def test_update_without_refresh_token_keeps_the_stored_one(database):
+    save_user_tokens("alice", tokens("access-1", "refresh-secret"))
+    save_user_tokens("alice", tokens("access-2"))
+
+    user = get_user("alice")
+    assert (user.access_token, user.refresh_token) == ("access-2", "refresh-secret")
+
+
+def test_plain_text_token_from_before_encryption_is_still_readable(database):
+    save_user_tokens("alice", tokens("access-1", "refresh-secret"))
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE users SET refresh_token = 'legacy-token' WHERE id = 'alice'"))
+
+    assert get_user("alice").refresh_token == "legacy-token"
+
+
+def test_token_encrypted_under_another_key_reads_as_missing(database, monkeypatch):
+    save_user_tokens("alice", tokens("access-1", "refresh-secret"))
+    monkeypatch.setattr(encryption.settings, "secret_key", "rotated-secret-key")
+    encryption._fernet.cache_clear()
+    try:
+        assert get_user("alice").refresh_token == ""
+    finally:
+        monkeypatch.undo()
+        encryption._fernet.cache_clear()
+
+
+def test_users_without_refresh_token_are_not_listed(database):
+    save_user_tokens("alice", tokens("access-1", "refresh-secret"))
+    save_user_tokens("bob", tokens("access-2"))
+
+    assert list_user_ids() == ["alice"]